@@ -1,66 +1,78 @@
 from urllib.parse import urlparse
 import os
-import git
-import tempfile
-import sys
-from flake8.api import legacy as flake8
+from typing import Dict, List, Optional, Tuple
+from utils.code_sampling import ErrorEstimate, estimate_errors, stratified_sample
+from utils.git_cache import get_git_cache, GitCacheError
+from utils import loc_counter
+from utils.lint_pool import lint_files, list_python_files
+
+# repositories with more Python lines than this are scored from a sample of
+# files totalling about this many lines (0 lints everything)
+CODE_QUALITY_SAMPLE_LOC = int(os.getenv("CODE_QUALITY_SAMPLE_LOC", "50000"))
 
 class Code:
     def __init__(self, code_url) -> None:
         self.code_url = code_url
         self.code_availability: float = 1.0 if code_url else 0.0 # availability: URL present -> 1.0, else 0.0
         self.quality: float = 0.0
+        # set when the score was extrapolated from a sample of files
+        self.quality_sampled: bool = False
+        self.quality_bounds: Optional[Tuple[float, float]] = None
 
 
-    def count_python_loc(self, root: str) -> int:
+    def count_python_loc(self, root: str, paths: Optional[List[str]] = None) -> int:
         """
-        Count total lines across all .py files under root.
+        Count total lines across the .py files flake8 checks under root
+        (or the given list of them), so errors and lines cover the same files.
         Returns the total line count.
+        Files are read as raw bytes; vendored directories are skipped.
         """
-        total = 0
-        for dirpath, _, filenames in os.walk(root):
-            for name in filenames:
-                if not name.endswith(".py"):
-                    continue
-                p = os.path.join(dirpath, name)
-                try:
-                    with open(p, "r", encoding="utf-8", errors="ignore") as f:
-                        for _ in f:
-                            total += 1
-                except Exception:
-                    # unreadable file -> skip
-                    continue
-        return total
-
-
-    def run_flake8(self, root: str) -> int:
+        return loc_counter.count_files_loc(list_python_files(root) if paths is None else paths)
+
+
+    def python_file_locs(self, root: str) -> Dict[str, int]:
         """
-        Run flake8 on root
-        Return total error/warning count.
+        Lines in each .py file flake8 checks under root, read once so the
+        total and the per-file sampling weights come from the same pass.
         """
-        style = flake8.get_style_guide(quiet=2)
+        return loc_counter.files_loc(list_python_files(root))
 
-        # Temporarily silence stdout
-        old_stdout = sys.stdout
-        sys.stdout = open(os.devnull, "w")
-        try:
-            report = style.check_files([root])
-        finally:
-            sys.stdout.close()
-            sys.stdout = old_stdout
 
-        return int(getattr(report, "total_errors", 0) or 0)
+    def run_flake8(self, root: str, paths: Optional[List[str]] = None) -> int:
+        """
+        Run flake8 on root (or the given files under it)
+        Return total error/warning count.
+        Files are linted in the shared process pool; unchanged files reuse
+        their cached result.
+        """
+        return sum(lint_files(list_python_files(root) if paths is None else paths).values())
+
+    def estimate_flake8_errors(self, root: str, loc_budget: int = CODE_QUALITY_SAMPLE_LOC,
+                               file_locs: Optional[Dict[str, int]] = None) -> ErrorEstimate:
+        """
+        Lint a stratified random sample of about loc_budget lines and
+        extrapolate the total error count, with a 95% confidence interval.
+        file_locs maps each file to its line count when already known.
+        """
+        if file_locs is None:
+            file_locs = self.python_file_locs(root)
+        sample = stratified_sample(root, file_locs, loc_budget)
+        return estimate_errors(root, file_locs, lint_files(sample))
 
     def get_quality(self) -> float:
         """
         Code quality metric:
-        - Clone the repository.
+        - Check out the repository from the shared clone cache.
         - Run static analysis (Flake8) on Python files.
         - Let LinesOfCode = total lines across all .py files.
         - Let ErrorCount = total Flake8 issues.
 
         Score = max(0, 1 - LinesOfCode / (ErrorCount * 5))
 
+        Repositories over CODE_QUALITY_SAMPLE_LOC lines are linted from a
+        sample; ErrorCount is then extrapolated, quality_sampled is set and
+        quality_bounds holds the score range for the 95% interval.
+
         Special cases:
         - If no code_url or unsupported host -> 0.0
         - If clone fails or no Python files -> 0.0
@@ -76,46 +88,57 @@ class Code:
             self.quality = 0.0
             return self.quality
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            try:
-                # shallow clone for speed
-                repo = git.Repo.clone_from(self.code_url, tmpdir, depth=1, single_branch=True)
-            except Exception:
-                self.quality = 0.5
-                return self.quality
-
-            try:
-                loc = self.count_python_loc(tmpdir)
-                if loc == 0:
-                    self.quality = 0.5  # code exists, but not python
-                    return self.quality
-
-                error_count = self.run_flake8(tmpdir)
-
-                if error_count < 50:
-                    self.quality = 0.9
-                    return self.quality
-
-                # Dynamic penalty multiplier based on project size:
-                # The penalty multiplier changes based on the total lines of code.
-                # Smaller projects are penalized more heavily for each error.
-                if loc < 500:
-                    multiplier = 2 
-                elif loc < 5000:
-                    multiplier = 10
-                elif loc < 20000:
-                    multiplier = 25
-                else:
-                    multiplier = 50
-
-                error_density = error_count / max(1, loc)
-                score = 1.0 - error_density * multiplier
-
-                self.quality = float(max(0.0, min(1.0, score)))
-                return self.quality
-
-            finally:
-                try:
-                    repo.close()
-                except Exception:
-                    pass
+        try:
+            with get_git_cache().checkout(self.code_url) as repo_dir:
+                return self._score_checkout(repo_dir)
+        except GitCacheError:
+            self.quality = 0.5
+            return self.quality
+
+    def _score_checkout(self, root: str) -> float:
+        """
+        Score a checked out repository (see get_quality).
+        """
+        # one pass over the files for the line count, the sample and flake8
+        file_locs = self.python_file_locs(root)
+        loc = sum(file_locs.values())
+        if loc == 0:
+            self.quality = 0.5  # code exists, but not python
+            return self.quality
+
+        if CODE_QUALITY_SAMPLE_LOC and loc > CODE_QUALITY_SAMPLE_LOC:
+            estimate = self.estimate_flake8_errors(root, file_locs=file_locs)
+            self.quality_sampled = True
+            # more errors -> lower score
+            self.quality_bounds = (self.score_error_count(loc, estimate.high), self.score_error_count(loc, estimate.low))
+            error_count = int(round(estimate.errors))
+        else:
+            error_count = self.run_flake8(root, list(file_locs))
+
+        self.quality = self.score_error_count(loc, error_count)
+        return self.quality
+
+    def score_error_count(self, loc: int, error_count: float) -> float:
+        """
+        Quality score for error_count flake8 issues in loc lines of Python.
+        """
+        if error_count < 50:
+            return 0.9
+
+        # Dynamic penalty multiplier based on project size:
+        # The penalty multiplier changes based on the total lines of code.
+        # Smaller projects are penalized more heavily for each error.
+        if loc < 500:
+            multiplier = 2 
+        elif loc < 5000:
+            multiplier = 10
+        elif loc < 20000:
+            multiplier = 25
+        else:
+            multiplier = 50
+
+        error_density = error_count / max(1, loc)
+        score = 1.0 - error_density * multiplier
+
+        return float(max(0.0, min(1.0, score)))
+
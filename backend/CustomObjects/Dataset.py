@@ -5,11 +5,14 @@ import math
 import re
 
 from CustomObjects.LLMQuerier import LLMQuerier
+from CustomObjects.HFMetadata import HFMetadata
 
 class Dataset:
-    def __init__(self, dataset_url, model_url) -> None:
+    def __init__(self, dataset_url, model_url, hf_metadata: Optional[HFMetadata] = None) -> None:
         self.dataset_url = dataset_url
         self.model_url = model_url
+        self.hf_metadata = hf_metadata # the evaluated model's shared metadata, if any
+        self.llm_batch = None # set by Model when LLM metrics are batched
         self.dataset_availability: float = 1.0 if dataset_url else 0.0 # availability: URL present -> 1.0, else 0.0
         self.quality: float = 0.0
 
@@ -70,28 +73,22 @@ class Dataset:
         owner, model = parts[0], parts[1]
         repo_id = f"{owner}/{model}"
 
+        hf = self.hf_metadata
+        if hf is None or hf.repo_id != repo_id:
+            hf = HFMetadata(repo_id)
         try:
-            readme_fp = HfApi().hf_hub_download(repo_id=repo_id, filename="README.md")
-            with open(readme_fp, "r", encoding="utf-8") as f:
-                text = f.read()
+            readme = hf.readme()
         except Exception:
             return None
+        if readme is None:
+            return None
+        text = readme.text
 
         # find a heading mentioning data/dataset/training data; slice until next heading
-        heading_re = re.compile(r"^(#{1,6})\s*(.+?)\s*$", re.MULTILINE)
-        matches = list(heading_re.finditer(text))
-        for i, m in enumerate(matches):
-            title = m.group(2).strip().lower()
-            if any(k in title for k in ("data", "dataset", "training data", "training set", "datasets")):
-                start = m.start()
-                # end at next heading of same/higher level
-                this_level = len(m.group(1))
-                end = len(text)
-                for j in range(i + 1, len(matches)):
-                    if len(matches[j].group(1)) <= this_level:
-                        end = matches[j].start()
-                        break
-                return text[start:end]
+        # of the same or a higher level
+        section = readme.find_section("data", "dataset", "training data", "training set", "datasets")
+        if section is not None:
+            return text[section.start:section.end]
 
         # alternative: grab a contextual chunk around a keyword if no headings found
         m = re.search(r"(training data|dataset[s]?|data set[s]?)", text, re.IGNORECASE)
@@ -108,7 +105,16 @@ class Dataset:
         Returns float in [0,1] or None.
         """
         llm_querier = LLMQuerier(endpoint="https://genai.rcac.purdue.edu/api/chat/completions", api_key=api_key)
-        prompt = (
+        response = llm_querier.query(prompt=self.quality_prompt(section_text))
+
+        if response is None:
+            return 0.0
+
+        return float(response)
+
+
+    def quality_prompt(self, section_text: str) -> str:
+        return (
             "Assess the quality of the dataset used to train this model. "
             "Provide a score between 0 (very low quality) and 1 (very high quality). "
             "Dataset quality refers to characteristics such as variety and coverage of data, "
@@ -116,13 +122,16 @@ class Dataset:
             "Provide only the numeric score as output, without any additional text or explanation.\n\n"
             f"Training-data excerpt from the model README:\n```\n{section_text}\n```"
         )
-        response = llm_querier.query(prompt=prompt)
-
-        if response is None:
-            return 0.0
-
-        return float(response)
 
+    def llm_prompt(self) -> Optional[str]:
+        """
+        Dataset-quality prompt for a batched LLM request, or None when
+        get_quality would not ask the LLM at all.
+        """
+        if self.dataset_availability == 0.0 or not self.model_url:
+            return None
+        section = self.extract_training_data_info(self.model_url)
+        return self.quality_prompt(section) if section else None
 
     def get_quality(self, api_key: str) -> float:
         """
@@ -154,7 +163,10 @@ class Dataset:
         if self.model_url:
             section = self.extract_training_data_info(self.model_url)
             if section:
-                llm_score = self.score_with_llm(section, api_key)
+                if self.llm_batch is not None:
+                    llm_score = self.llm_batch.score("dataset_quality")
+                if llm_score is None:
+                    llm_score = self.score_with_llm(section, api_key)
 
         # Combine scores
         if llm_score is not None and popularity_score is not None:
@@ -0,0 +1,316 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from utils.github_cache import GitHubCache, get_github_cache
+from utils.http_client import get_session
+
+GITHUB_API = "https://api.github.com"
+GITHUB_GRAPHQL = "https://api.github.com/graphql"
+
+# parallel requests per fetch
+GITHUB_FETCH_WORKERS = int(os.getenv("GITHUB_FETCH_WORKERS", "8"))
+# rest, graphql, or auto (GraphQL whenever a token is available; it requires one)
+GITHUB_FETCH_MODE = os.getenv("GITHUB_FETCH_MODE", "auto").strip().lower()
+# longest we sleep for a rate-limit reset before giving up on the metric
+GITHUB_RATE_LIMIT_MAX_WAIT = float(os.getenv("GITHUB_RATE_LIMIT_MAX_WAIT", "60"))
+# pull requests per GraphQL query
+GRAPHQL_BATCH = 25
+
+PR_FIELDS = """
+      number
+      reviews(states: APPROVED, first: 1) { totalCount }
+      files(first: 100%s) { nodes { path additions } pageInfo { hasNextPage endCursor } }
+"""
+
+
+class GitHubError(Exception):
+    pass
+
+
+class GitHubRateLimited(GitHubError):
+    """The rate limit is exhausted and resets later than we are willing to wait."""
+
+
+class PRDetails(NamedTuple):
+    number: int
+    approved: bool
+    files: List[Tuple[str, int]]  # (path, added lines)
+
+
+class RateLimitGate:
+    """
+    Shared view of one GitHub rate-limit bucket, fed by the X-RateLimit-*
+    headers of every response. Requests wait for the reset once the
+    bucket is empty instead of burning calls on 403s.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.remaining: Optional[int] = None
+        self.reset_at = 0.0
+
+    def acquire(self) -> None:
+        with self._lock:
+            if self.remaining is None or self.remaining > 0 or time.time() >= self.reset_at:
+                if self.remaining:
+                    self.remaining -= 1
+                return
+            wait = self.reset_at - time.time()
+        if wait > GITHUB_RATE_LIMIT_MAX_WAIT:
+            raise GitHubRateLimited(f"GitHub rate limit resets in {int(wait)}s")
+        time.sleep(max(0.0, wait))
+
+    def update(self, resp: requests.Response) -> None:
+        remaining = resp.headers.get("X-RateLimit-Remaining")
+        reset = resp.headers.get("X-RateLimit-Reset")
+        retry_after = resp.headers.get("Retry-After")
+        with self._lock:
+            if remaining is not None and reset is not None:
+                try:
+                    self.remaining, self.reset_at = int(remaining), float(reset)
+                except ValueError:
+                    pass
+            if retry_after is not None and resp.status_code in (403, 429):
+                try:
+                    self.remaining, self.reset_at = 0, time.time() + float(retry_after)
+                except ValueError:
+                    pass
+
+
+_gates: Dict[Tuple[str, str], RateLimitGate] = {}
+_gates_lock = threading.Lock()
+
+
+def get_rate_limit_gate(token: str, resource: str) -> RateLimitGate:
+    """
+    Process-wide gate per (token, resource); core and graphql are separate buckets.
+    """
+    with _gates_lock:
+        return _gates.setdefault((token, resource), RateLimitGate())
+
+
+class GitHubFetcher:
+    """
+    Pull request data for one repository, fetched concurrently on a bounded
+    thread pool (REST) or in batched GraphQL queries, pacing every call by
+    GitHub's rate-limit headers.
+    """
+
+    def __init__(self, owner: str, repo: str, token: Optional[str] = None,
+                 mode: str = GITHUB_FETCH_MODE, max_workers: int = GITHUB_FETCH_WORKERS,
+                 session: Optional[requests.Session] = None, cache: Optional[GitHubCache] = None) -> None:
+        self.owner = owner
+        self.repo = repo
+        self.token = (token if token is not None else os.getenv("GITHUB_TOKEN", "")).strip()
+        if mode == "auto":
+            mode = "graphql" if self.token else "rest"
+        self.mode = mode
+        self.max_workers = max(1, max_workers)
+        self.session = session or get_session()
+        self.base_url = f"{GITHUB_API}/repos/{owner}/{repo}"
+        self.cache = cache if cache is not None else get_github_cache()
+        self.repo_key = f"{owner}/{repo}".lower()
+        # calls sent by this fetcher, for callers working to a request budget
+        self.request_count = 0
+        self._count_lock = threading.Lock()
+        self.headers = {
+            "Accept": "application/vnd.github+json",
+            **({"Authorization": f"Bearer {self.token}"} if self.token else {}),
+        }
+
+    def request(self, method: str, url: str, resource: str = "core", **kwargs) -> requests.Response:
+        """
+        Send one API call, pacing it by the rate-limit gate. GETs are made
+        conditional on the cached ETag; a 304 (free against the rate limit)
+        is answered from the cache as a 200.
+        """
+        gate = get_rate_limit_gate(self.token, resource)
+        headers = {**self.headers, **kwargs.pop("headers", {})}
+        key = cached = None
+        if method == "GET" and self.cache is not None:
+            key = GitHubCache.response_key(self.token, url, kwargs.get("params"))
+            cached = self.cache.get_response(key)
+            if cached is not None:
+                headers["If-None-Match"] = cached.etag
+        for attempt in range(2):
+            gate.acquire()
+            with self._count_lock:
+                self.request_count += 1
+            resp = self.session.request(method, url, headers=headers, timeout=15, **kwargs)
+            gate.update(resp)
+            limited = resp.status_code == 429 or (
+                resp.status_code == 403 and (resp.headers.get("X-RateLimit-Remaining") == "0" or "Retry-After" in resp.headers)
+            )
+            if not limited or attempt:
+                break
+        if cached is not None and resp.status_code == 304:
+            return self._from_cache(url, cached)
+        etag = resp.headers.get("ETag")
+        if key is not None and resp.status_code == 200 and etag:
+            self.cache.put_response(key, etag, resp.content, resp.headers.get("link"))
+        return resp
+
+    @staticmethod
+    def _from_cache(url: str, cached) -> requests.Response:
+        resp = requests.Response()
+        resp.status_code = 200
+        resp.url = url
+        resp.encoding = "utf-8"
+        resp._content = cached.body
+        resp.headers = CaseInsensitiveDict({"link": cached.link} if cached.link else {})
+        return resp
+
+    def paginate(self, url: str, params: Optional[dict] = None, strict: bool = False) -> Iterator[list]:
+        """
+        Pages of a list endpoint; an error ends the listing, or raises if strict.
+        """
+        page = 1
+        while True:
+            resp = self.request("GET", url, params={**(params or {}), "per_page": 100, "page": page})
+            if resp.status_code >= 400:
+                if strict:
+                    raise GitHubError(f"{url} returned {resp.status_code}")
+                break
+            data = resp.json()
+            if not data:
+                break
+            yield data
+            if 'rel="next"' not in resp.headers.get("link", ""):
+                break
+            page += 1
+
+    def merged_pr_numbers(self, limit: int = 400) -> List[int]:
+        """
+        Most recently updated merged PRs, stopping after the page that reaches limit.
+        With a cache, listing stops at the first PR not updated since the
+        last sync and the PRs merged before that are taken from the cache.
+        """
+        sync = self.cache.get_sync(self.repo_key) if self.cache is not None else None
+        numbers: List[int] = []
+        newest = sync.last_updated if sync else ""
+        caught_up = False
+        listing = self.paginate(
+            f"{self.base_url}/pulls", {"state": "closed", "sort": "updated", "direction": "desc"}, strict=True
+        )
+        for page in listing:
+            for pr in page:
+                updated = pr.get("updated_at") or ""
+                newest = max(newest, updated)
+                if sync and updated and updated < sync.last_updated:
+                    caught_up = True
+                    break
+                if pr.get("merged_at"):
+                    numbers.append(pr["number"])
+            if caught_up or len(numbers) >= limit:
+                break
+        if sync and caught_up:
+            seen = set(numbers)
+            numbers += [n for n in sync.merged if n not in seen]
+            numbers = numbers[:max(limit, len(seen))]
+        if self.cache is not None and newest:
+            self.cache.put_sync(self.repo_key, numbers, newest)
+        return numbers
+
+    def _rest_details(self, number: int) -> PRDetails:
+        resp = self.request("GET", f"{self.base_url}/pulls/{number}/reviews")
+        if resp.status_code >= 400:
+            # incomplete data would be cached for good; skip the PR instead
+            raise GitHubError(f"reviews of #{number} returned {resp.status_code}")
+        # States: COMMENTED, APPROVED, CHANGES_REQUESTED, DISMISSED
+        approved = any((r.get("state") or "").upper() == "APPROVED" for r in resp.json())
+        files = [
+            (f.get("filename") or "", int(f.get("additions") or 0))
+            for page in self.paginate(f"{self.base_url}/pulls/{number}/files", strict=True)
+            for f in page
+        ]
+        return PRDetails(number, approved, files)
+
+    def graphql(self, query: str, variables: Optional[dict] = None) -> dict:
+        resp = self.request("POST", GITHUB_GRAPHQL, resource="graphql", json={"query": query, "variables": variables or {}})
+        if resp.status_code >= 400:
+            raise GitHubError(f"GraphQL request failed with {resp.status_code}")
+        body = resp.json()
+        if not body.get("data"):
+            raise GitHubError(str(body.get("errors") or "empty GraphQL response"))
+        return body["data"]
+
+    def _graphql_batch(self, numbers: Sequence[int]) -> Dict[int, PRDetails]:
+        aliases = "\n".join(f"pr{n}: pullRequest(number: {n}) {{{PR_FIELDS % ''}}}" for n in numbers)
+        query = f"query($owner: String!, $name: String!) {{ repository(owner: $owner, name: $name) {{ {aliases} }} }}"
+        repo = self.graphql(query, {"owner": self.owner, "name": self.repo}).get("repository") or {}
+        out = {}
+        for n in numbers:
+            node = repo.get(f"pr{n}")
+            if not node:
+                continue
+            files = [(f["path"], int(f.get("additions") or 0)) for f in node["files"]["nodes"]]
+            page = node["files"]["pageInfo"]
+            # rare PRs touching more than 100 files: page through the rest
+            while page["hasNextPage"]:
+                query = (
+                    "query($owner: String!, $name: String!, $n: Int!, $after: String!) "
+                    "{ repository(owner: $owner, name: $name) { pullRequest(number: $n) {"
+                    + PR_FIELDS % ", after: $after" + "} } }"
+                )
+                data = self.graphql(query, {"owner": self.owner, "name": self.repo, "n": n, "after": page["endCursor"]})
+                more = data["repository"]["pullRequest"]["files"]
+                files.extend((f["path"], int(f.get("additions") or 0)) for f in more["nodes"])
+                page = more["pageInfo"]
+            out[n] = PRDetails(n, node["reviews"]["totalCount"] > 0, files)
+        return out
+
+    def pr_details(self, numbers: Sequence[int]) -> Dict[int, PRDetails]:
+        """
+        Review state and per-file additions for each PR. PRs that could not
+        be fetched are left out. Merged PRs are cached for good, so only
+        ones not seen before are requested.
+        """
+        if self.cache is None:
+            return self._fetch_details(numbers)
+        cached = self.cache.get_pull_requests(self.repo_key, numbers)
+        out = {n: PRDetails(n, approved, files) for n, (approved, files) in cached.items()}
+        fetched = self._fetch_details([n for n in numbers if n not in cached])
+        self.cache.put_pull_requests(self.repo_key, {n: (d.approved, d.files) for n, d in fetched.items()})
+        out.update(fetched)
+        return out
+
+    def _fetch_details(self, numbers: Sequence[int]) -> Dict[int, PRDetails]:
+        if not numbers:
+            return {}
+        if self.mode == "graphql":
+            work = [list(numbers[i:i + GRAPHQL_BATCH]) for i in range(0, len(numbers), GRAPHQL_BATCH)]
+            fetch = self._graphql_batch
+        else:
+            work = list(numbers)
+            fetch = lambda n: {n: self._rest_details(n)}  # noqa: E731
+
+        def safe(item):
+            try:
+                return fetch(item)
+            except GitHubRateLimited:
+                raise
+            except Exception:
+                if self.mode != "graphql":
+                    return {}
+            # a failed GraphQL batch (e.g. a token without the scope) falls back to REST
+            out = {}
+            for n in item:
+                try:
+                    out[n] = self._rest_details(n)
+                except GitHubRateLimited:
+                    raise
+                except Exception:
+                    continue
+            return out
+
+        out: Dict[int, PRDetails] = {}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, max(1, len(work)))) as executor:
+            for result in executor.map(safe, work):
+                out.update(result)
+        return out
@@ -0,0 +1,101 @@
+import threading
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlparse
+from huggingface_hub import HfApi
+from CustomObjects.ReadmeProvider import ParsedReadme, get_readme_provider, HF_HOST
+
+
+class _Flight:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class HFMetadata:
+    """
+    Hugging Face metadata for one model repo, shared by every metric of a
+    single evaluation. Each remote call (model_info, file downloads) runs at
+    most once: concurrent callers wait on the in-flight request and all get
+    its result, or its exception.
+    """
+
+    def __init__(self, repo_id: str, api: Optional[HfApi] = None, revision: str = "main") -> None:
+        self.repo_id = repo_id
+        self.revision = revision
+        self.api = api or HfApi()
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+
+    @classmethod
+    def from_url(cls, url: str) -> Optional["HFMetadata"]:
+        """
+        Context for a huggingface.co/<owner>/<name> URL, or None if the
+        URL does not name a repo.
+        """
+        try:
+            path_parts = urlparse(url or "").path.strip('/').split('/')
+        except Exception:
+            return None
+        if len(path_parts) < 2 or not path_parts[0] or not path_parts[1]:
+            return None
+        return cls(f"{path_parts[0]}/{path_parts[1]}")
+
+    def _once(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._flights[key] = flight
+        if leader:
+            try:
+                flight.value = fn()
+            except Exception as e:
+                flight.error = e
+            finally:
+                flight.done.set()
+        else:
+            flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+
+    def model_info(self):
+        """
+        model_info with per-file sizes; also carries cardData, downloads and likes.
+        """
+        return self._once(
+            "model_info",
+            lambda: self.api.model_info(repo_id=self.repo_id, files_metadata=True),
+        )
+
+    def hf_hub_download(self, filename: str) -> str:
+        """
+        Local path of a file from the repo, downloaded once per evaluation.
+        """
+        return self._once(
+            f"file:{filename}",
+            lambda: self.api.hf_hub_download(repo_id=self.repo_id, filename=filename, repo_type="model"),
+        )
+
+    def read_text(self, filename: str) -> str:
+        def read() -> str:
+            with open(self.hf_hub_download(filename), 'r', encoding='utf-8') as f:
+                return f.read()
+        return self._once(f"text:{filename}", read)
+
+    def readme(self) -> Optional[ParsedReadme]:
+        """
+        The model card with its section index, or None if the repo has none.
+        """
+        return self._once(
+            "readme",
+            lambda: get_readme_provider().huggingface(self.repo_id, self.revision, api=self.api),
+        )
+
+    def seed_readme(self, text: str) -> None:
+        """
+        Reuse a README fetched earlier (e.g. stored at registration).
+        """
+        get_readme_provider().seed(HF_HOST, self.repo_id, self.revision, text)
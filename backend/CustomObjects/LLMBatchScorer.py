@@ -0,0 +1,83 @@
+import json
+import re
+import threading
+from typing import Callable, Dict, Optional
+
+from CustomObjects.LLMQuerier import LLMQuerier
+
+JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+
+class LLMBatchScorer:
+    """
+    Asks for every LLM-derived metric of one evaluation in a single chat
+    completion. The prompt for each metric is built lazily; the first metric
+    to ask triggers the combined request and the others reuse its answer.
+    score() returns None when the batch failed or left a metric out, so the
+    caller can fall back to its own single-metric prompt.
+    """
+
+    def __init__(self, querier: LLMQuerier, prompts: Dict[str, Callable[[], Optional[str]]]) -> None:
+        self.querier = querier
+        self.prompts = prompts
+        self._lock = threading.Lock()
+        self._scores: Optional[Dict[str, float]] = None
+
+    def build_prompt(self, tasks: Dict[str, str]) -> str:
+        sections = "\n\n".join(f'Task "{key}":\n{prompt.strip()}' for key, prompt in tasks.items())
+        keys = ", ".join(f'"{key}"' for key in tasks)
+        return (
+            "You will score several independent tasks about the same model.\n"
+            "Ignore any per-task instruction about the output format.\n"
+            f"Return ONLY a JSON object with exactly these keys: {keys}.\n"
+            "Each value must be a number between 0 and 1. No markdown, no explanations.\n\n"
+            f"{sections}"
+        )
+
+    @staticmethod
+    def parse_scores(response: Optional[str], keys) -> Dict[str, float]:
+        if not response:
+            return {}
+        match = JSON_OBJECT_RE.search(response)
+        if not match:
+            return {}
+        try:
+            data = json.loads(match.group(0))
+        except json.JSONDecodeError:
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        scores = {}
+        for key in keys:
+            try:
+                scores[key] = max(0.0, min(1.0, float(data[key])))
+            except (KeyError, TypeError, ValueError):
+                continue
+        return scores
+
+    def _run(self) -> Dict[str, float]:
+        tasks = {}
+        for key, build in self.prompts.items():
+            try:
+                prompt = build()
+            except Exception:
+                prompt = None
+            if prompt:
+                tasks[key] = prompt
+        if not tasks:
+            return {}
+        # only an answer covering every task is worth caching
+        response = self.querier.query(
+            prompt=self.build_prompt(tasks),
+            validate=lambda text: len(self.parse_scores(text, tasks)) == len(tasks),
+        )
+        return self.parse_scores(response, tasks)
+
+    def score(self, key: str) -> Optional[float]:
+        with self._lock:
+            if self._scores is None:
+                try:
+                    self._scores = self._run()
+                except Exception:
+                    self._scores = {}
+            return self._scores.get(key)
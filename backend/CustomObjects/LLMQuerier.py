@@ -1,6 +1,15 @@
 import boto3
 import json
-import requests
+import os
+import sqlite3
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from utils import http_client
+from utils.llm_cache import get_llm_cache
+from utils.llm_guard import get_endpoint_guard, get_llm_executor, get_llm_semaphore, LLM_HEDGE_ENABLED
+
+# completions can legitimately take a while; only bound the wait
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "120"))
 
 class LLMQuerier:
     def __init__(self, endpoint, api_key=None):
@@ -9,12 +18,29 @@ class LLMQuerier:
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json"
         }
+        self.guard = get_endpoint_guard(endpoint)
 
 
-    def query(self, prompt, model="llama4:latest"):
+    def _attempt(self, payload, timeout):
+        """
+        One HTTP call; runs on the LLM executor holding a semaphore permit.
+        Returns (response, seconds taken).
+        """
+        start = time.monotonic()
+        try:
+            response = http_client.post(self.endpoint, headers=self.headers, json=payload, timeout=timeout)
+            return response, time.monotonic() - start
+        finally:
+            get_llm_semaphore().release()
+
+
+    def query(self, prompt, model="llama4:latest", deadline=None, validate=None):
         """
         Query the LLM with a prompt
-        Return the response.
+        Return the response, or None (which callers score as 0) when the
+        endpoint fails, misses the deadline or its circuit breaker is open.
+        If given, validate(response) must be true for a response to be
+        cached or served from the cache; the response is returned either way.
         """
         payload = {
             "model": model,
@@ -26,11 +52,70 @@ class LLMQuerier:
             ],
             "stream": False
         }
-        try:
-            response = requests.post(self.endpoint, headers=self.headers, json=payload)
-            if response.status_code == 200:
-                data = json.loads(response.content)
-                return data['choices'][0]['message']['content'].strip()
-        except Exception as e:
-            print(f"An error occurred: {e}")
-            return None
\ No newline at end of file
+        cache = get_llm_cache()
+        if cache is not None:
+            try:
+                cached = cache.get(model, prompt)
+            except (sqlite3.Error, OSError) as e:
+                # a locked or broken cache is just a miss
+                print(f"LLM cache read failed: {e}")
+                cached = None
+            if cached is not None and (validate is None or validate(cached)):
+                return cached
+
+        breaker = self.guard.breaker
+        if not breaker.allow():
+            return None
+
+        give_up_at = time.monotonic() + (deadline if deadline is not None else LLM_TIMEOUT_SECONDS)
+        semaphore = get_llm_semaphore()
+        if not semaphore.acquire(timeout=max(0.0, give_up_at - time.monotonic())):
+            # local saturation says nothing about the endpoint's health
+            breaker.cancel()
+            return None
+
+        executor = get_llm_executor()
+        pending = {executor.submit(self._attempt, payload, max(0.001, give_up_at - time.monotonic()))}
+        hedge_delay = self.guard.latency.hedge_delay() if LLM_HEDGE_ENABLED else None
+        hedge_at = time.monotonic() + hedge_delay if hedge_delay is not None else None
+
+        while pending:
+            now = time.monotonic()
+            if now >= give_up_at:
+                break
+            wake = give_up_at if hedge_at is None else min(give_up_at, hedge_at)
+            done, pending = wait(pending, timeout=max(0.0, wake - now), return_when=FIRST_COMPLETED)
+
+            for future in done:
+                try:
+                    response, elapsed = future.result()
+                except Exception as e:
+                    print(f"An error occurred: {e}")
+                    continue
+                if response.status_code == 429 or response.status_code >= 500:
+                    continue
+                breaker.record_success()
+                if response.status_code != 200:
+                    return None
+                self.guard.latency.record(elapsed)
+                try:
+                    data = json.loads(response.content)
+                    content = data['choices'][0]['message']['content'].strip()
+                except Exception as e:
+                    print(f"An error occurred: {e}")
+                    return None
+                if cache is not None and (validate is None or validate(content)):
+                    try:
+                        cache.put(model, prompt, content)
+                    except (sqlite3.Error, OSError) as e:
+                        print(f"LLM cache write failed: {e}")
+                return content
+
+            if hedge_at is not None and pending and time.monotonic() >= hedge_at:
+                hedge_at = None
+                # only hedge with a spare permit; never queue behind other prompts
+                if semaphore.acquire(blocking=False):
+                    pending.add(executor.submit(self._attempt, payload, max(0.001, give_up_at - time.monotonic())))
+
+        breaker.record_failure()
+        return None
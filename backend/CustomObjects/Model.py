@@ -1,22 +1,62 @@
-import concurrent.futures
 import math
-from typing import Dict, Any, Tuple, Callable, Optional
+from typing import Dict, Any, List, Tuple, Callable, Optional
 from CustomObjects.Dataset import Dataset
 from CustomObjects.Code import Code
 from CustomObjects.LLMQuerier import LLMQuerier
+from CustomObjects.LLMBatchScorer import LLMBatchScorer
+from CustomObjects.HFMetadata import HFMetadata
+from CustomObjects.GitHubFetcher import GitHubFetcher, GitHubError
+from utils.commit_history import get_commit_history_cache
+from utils.treescore import canonical_repo_id, get_treescore_engine
+from utils.metric_executor import get_metric_executor
+from utils.reviewedness_sampling import estimate_reviewedness, use_sampling
 from collections import Counter
+from functools import partial
 from datetime import datetime, timedelta
 import re
-from huggingface_hub import HfApi, list_repo_commits
 from urllib.parse import urlparse
 import time
 import os
 import subprocess
 import tempfile
-import requests
 import networkx as nx
 import json
 
+LLM_ENDPOINT = "https://genai.rcac.purdue.edu/api/chat/completions"
+# ask for all LLM-derived metrics in one completion, per-metric prompts as fallback
+LLM_BATCH_SCORING = os.getenv("LLM_BATCH_SCORING", "true").strip().lower() in ("1", "true", "yes")
+
+
+# reviewedness specific helpers to decide whether a file counts as code instead of weights
+CODE_EXTS = {
+    ".py", ".ipynb", ".js", ".ts", ".jsx", ".tsx",
+    ".java", ".c", ".cc", ".cpp", ".h", ".hpp",
+    ".go", ".rs", ".rb", ".swift", ".kt", ".m", ".mm",
+    ".sh", ".ps1", ".r", ".jl",
+    ".yml", ".yaml", ".json", ".toml", ".ini", ".cfg", ".mk",
+    ".sql", ".pl"
+}
+NON_CODE_OR_WEIGHT_EXTS = {
+    ".bin", ".safetensors", ".pt", ".pth", ".onnx",
+    ".h5", ".ckpt", ".tflite", ".pb", ".weights",
+    ".tar", ".gz", ".zip", ".xz", ".7z", ".rar",
+    ".parquet", ".feather", ".arrow", ".npz", ".npy",
+    ".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff", ".webp",
+    ".pdf", ".docx", ".pptx", ".xls", ".xlsx",
+    ".ipynb_checkpoints",
+}
+
+
+def is_code_file(fname: str) -> bool:
+    f = fname.lower()
+    if any(seg in f for seg in ("/weights/", "/checkpoints/", "/artifacts/", "/models/")):
+        return False
+    ext = "." + f.rsplit(".", 1)[-1] if "." in f else ""
+    if ext in NON_CODE_OR_WEIGHT_EXTS:
+        return False
+    # treat files with a known code/config extension as code
+    return ext in CODE_EXTS
+
 
 class Model:
     url: str
@@ -42,24 +82,36 @@ class Model:
     code_quality_latency: int
     net_score_latency: int
 
-    def __init__(self, model_url: str, dataset_url: str, code_url: str) -> None:
+    def __init__(self, model_url: str, dataset_url: str, code_url: str, readme_text: Optional[str] = None,
+                 stored_ratings: Optional[Callable[[List[str]], Dict[str, dict]]] = None) -> None:
         self.url = model_url
+        # looks up ratings already in the registry by repo id, so treescore can skip rating those parents
+        self.stored_ratings = stored_ratings
         self.dataset_url = dataset_url
         self.code_url = code_url
         self.name = self.get_name()
+        # one shared Hugging Face metadata fetch for all metrics of this evaluation
+        self.hf_metadata = HFMetadata.from_url(model_url)
+        if readme_text and self.hf_metadata is not None:
+            # README stored at registration; saves refetching it for rating
+            self.hf_metadata.seed_readme(readme_text)
         self.category = ''
         self.size_score = {}
         self.license_score = 0.0
         self.ramp_up_time = 0.0
         self.bus_factor = 0.0
-        self.dataset = Dataset(dataset_url, model_url) #Contains dataset quality and availability scores
+        self.dataset = Dataset(dataset_url, model_url, hf_metadata=self.hf_metadata) #Contains dataset quality and availability scores
         self.code = Code(code_url) #Contains code quality and availability scores
         self.performance_claims = 0.0
         self.dataset_and_code_score = 0.0
         self.reproducibility = 0.0
         self.reviewedness = 0.0
+        # set when reviewedness was estimated from a sample of merged PRs
+        self.reviewedness_sampled = False
+        self.reviewedness_bounds: Optional[Tuple[float, float]] = None
         self.treescore = 0.0
         self.net_score = 0.0
+        self.llm_batch: Optional[LLMBatchScorer] = None
 
         self.size_score_latency = 0
         self.license_latency = 0
@@ -132,15 +184,11 @@ class Model:
         scores: Dict[str, float] = {}
 
         try:
-            # Parse the URL to get the repository ID
-            path_parts = urlparse(self.url).path.strip('/').split('/')
-            if len(path_parts) < 2:
+            if self.hf_metadata is None:
                 return {}
-            repo_id = f"{path_parts[0]}/{path_parts[1]}"
 
-            # Use the HfApi to get model info, which includes file sizes
-            api = HfApi()
-            model_info = api.model_info(repo_id=repo_id, files_metadata=True)
+            # Shared model info, which includes file sizes
+            model_info = self.hf_metadata.model_info()
 
             # Sum the size of all files in the repository
             total_size = sum(file.size for file in model_info.siblings if file.size is not None)
@@ -171,17 +219,12 @@ class Model:
             A float representing the license score (1.0 for compatible licenses, 0.0 otherwise).
         """
         compatible_licenses = ['mit', 'bsd', 'lgpl', 'apache-2.0']
-        # Use the HfApi to fetch only the README file
-        api = HfApi()
-
-        # Parse the URL to get the repository ID
-        path_parts = urlparse(self.url).path.strip('/').split('/')
-        if len(path_parts) < 2:
+        hf = self.hf_metadata
+        if hf is None:
             return 0.0
-        repo_id = f"{path_parts[0]}/{path_parts[1]}"
 
         try:
-            model_info = api.model_info(repo_id)
+            model_info = hf.model_info()
             if model_info.cardData and "license" in model_info.cardData and model_info.cardData["license"].lower() in compatible_licenses:
                 return 1.0
             else:
@@ -191,13 +234,7 @@ class Model:
 
         # 1. First, try to find and check a dedicated LICENSE file.
         try:
-            license_filepath = api.hf_hub_download(
-                repo_id=repo_id,
-                filename="LICENSE",
-                repo_type="model" # Explicitly state repo type
-            )
-            with open(license_filepath, 'r', encoding='utf-8') as f:
-                license_content = f.read().lower()
+            license_content = hf.read_text("LICENSE").lower()
 
             for lic in compatible_licenses:
                 if lic in license_content:
@@ -208,24 +245,17 @@ class Model:
             pass
 
         # 2. If no LICENSE file, fall back to checking the README for a License section.
-        readme_filepath = api.hf_hub_download(repo_id=repo_id, filename="README.md")
-        with open(readme_filepath, 'r', encoding='utf-8') as f:
-            readme_content = f.read()
-
-        # Find the 'License' section in the fetched content
-        match = re.search(r'^#+\s*license\s*$', readme_content, re.IGNORECASE | re.MULTILINE)
-
-        if not match:
+        readme = hf.readme()
+        if readme is None:
             return 0.0
 
-        start_index = match.end()
-        next_heading_match = re.search(r'^#+', readme_content[start_index:], re.MULTILINE)
+        # Find the 'License' section in the shared section index
+        section = readme.find_section("license", exact=True)
+        if section is None:
+            return 0.0
 
-        if next_heading_match:
-            end_index = start_index + next_heading_match.start()
-            license_text = readme_content[start_index:end_index].lower()
-        else:
-            license_text = readme_content[start_index:].lower()
+        # the section runs until the next heading of any level
+        license_text = readme.text[section.body_start:section.next_heading].lower()
 
         for lic in compatible_licenses:
             if lic in license_text:
@@ -240,13 +270,9 @@ class Model:
             A float representing the popularity score (1.0 for high popularity, 0.0 for low popularity).
         """
         try:
-            path_parts = urlparse(self.url).path.strip('/').split('/')
-            if len(path_parts) < 2:
+            if self.hf_metadata is None:
                 return 0.0
-            repo_id = f"{path_parts[0]}/{path_parts[1]}"
-
-            api = HfApi()
-            model_info = api.model_info(repo_id=repo_id)
+            model_info = self.hf_metadata.model_info()
 
             downloads = model_info.downloads or 0
             likes = model_info.likes or 0
@@ -280,17 +306,11 @@ class Model:
         """
         popularity_score = self.get_popularity_score()
 
-        llm_querier = LLMQuerier(endpoint="https://genai.rcac.purdue.edu/api/chat/completions", api_key=api_key)
-        prompt = (
-            f"Assess the ramp-up time for using the model located at \"{self.url}\". Provide a score between 0 (very difficult) and 1 (very easy). "
-            "Ramp up time refers to the time required for a new user to become productive with the model."
-            "Calculate ramp-up time based on factors such as documentation quality and clarity, community support, and complexity of the model."
-            "If the README or documentation contains only headers without meaningful text return a low score."
-            "Provide only the numeric score as output, without any additional text or explanation."
-        )
-        response = llm_querier.query(prompt=prompt)
-
-        llm_score = float(response) if response else 0.0
+        llm_score = self.llm_batch.score("ramp_up_time") if self.llm_batch else None
+        if llm_score is None:
+            llm_querier = LLMQuerier(endpoint=LLM_ENDPOINT, api_key=api_key)
+            response = llm_querier.query(prompt=self._ramp_up_prompt())
+            llm_score = float(response) if response else 0.0
 
         # If we couldn't determine popularity (popularity_score == 0.0),
         # prefer the LLM-only score. This makes the metric usable when HF
@@ -303,6 +323,15 @@ class Model:
 
         return float(final_score)
 
+    def _ramp_up_prompt(self) -> str:
+        return (
+            f"Assess the ramp-up time for using the model located at \"{self.url}\". Provide a score between 0 (very difficult) and 1 (very easy). "
+            "Ramp up time refers to the time required for a new user to become productive with the model."
+            "Calculate ramp-up time based on factors such as documentation quality and clarity, community support, and complexity of the model."
+            "If the README or documentation contains only headers without meaningful text return a low score."
+            "Provide only the numeric score as output, without any additional text or explanation."
+        )
+
     def get_bus_factor(self) -> float:
         """
         Calculates the bus factor for a given Git repository.
@@ -322,20 +351,21 @@ class Model:
         repo_id = f"{path_parts[0]}/{path_parts[1]}"
 
         try:
-            # Instantiate the API client and fetch commits
-            # api = HfApi()
-            commits = list_repo_commits(repo_id=repo_id)
-
             # Define the time window (last 365 days)
             years = 2.5
             year_limit = datetime.now().astimezone() - timedelta(days=365*years)
 
-            # Filter commits from the last year and get author names
-            recent_authors = []
-            for commit in commits:
-                if commit.created_at > year_limit:
-                    for author in commit.authors:
-                        recent_authors.append(author)
+            # the model_info fetched for other metrics tells us whether the
+            # cached history is still current, without asking for commits
+            head_sha = None
+            if self.hf_metadata is not None:
+                try:
+                    head_sha = self.hf_metadata.model_info().sha
+                except Exception:
+                    head_sha = None
+
+            # Author names of commits in the window, from the incremental history cache
+            recent_authors = get_commit_history_cache().recent_authors(repo_id, year_limit, head_sha=head_sha)
 
             if not recent_authors:
                 return 0.5
@@ -380,18 +410,15 @@ class Model:
             A float score between 0.0 and 1.0. Returns 0.0 if the repository
             cannot be cloned or has no recent commits.
         """
+        batch_score = self.llm_batch.score("performance_claims") if self.llm_batch else None
+        if batch_score is not None:
+            return batch_score
+
         llm_querier = LLMQuerier(
-            endpoint="https://genai.rcac.purdue.edu/api/chat/completions",
+            endpoint=LLM_ENDPOINT,
             api_key=api_key,
         )
-        prompt = (
-            f"Assess the performance documentation for the model located at {self.url}."
-            "Provide a score between 0 (no documentation) and 1 (clear, detailed documentation)."
-            "Performance documentation refers to evaluation results, benchmarks, or metrics reported in the README."
-            "Evaluation results will be in the form of tables, or charts under sections like 'Evaluation', 'Results', 'Benchmarks', or similar."
-            "Provide only the numeric score as output, without any additional text or explanation."
-        )
-        response = llm_querier.query(prompt=prompt)
+        response = llm_querier.query(prompt=self._performance_claims_prompt())
 
         if response is None:
             return 0.0
@@ -401,6 +428,15 @@ class Model:
         except Exception:
             return 0.0
         
+    def _performance_claims_prompt(self) -> str:
+        return (
+            f"Assess the performance documentation for the model located at {self.url}."
+            "Provide a score between 0 (no documentation) and 1 (clear, detailed documentation)."
+            "Performance documentation refers to evaluation results, benchmarks, or metrics reported in the README."
+            "Evaluation results will be in the form of tables, or charts under sections like 'Evaluation', 'Results', 'Benchmarks', or similar."
+            "Provide only the numeric score as output, without any additional text or explanation."
+        )
+
     def get_reproducibility(self) -> float: 
         """
         Calculates the reproducibility score for the model based on 
@@ -417,22 +453,17 @@ class Model:
         """
 
         self.reproducibility_score = 0.0
-        api = HfApi()
-
-        # parse the URL to get the repository ID
-        path_parts = urlparse(self.url).path.strip('/').split('/')
-        if len(path_parts) < 2:
+        if self.hf_metadata is None:
             return 0.0
-        repo_id = f"{path_parts[0]}/{path_parts[1]}"
 
         try:
             # extract model README
-            readme_path = api.hf_hub_download(repo_id=repo_id, filename="README.md")
-            with open(readme_path, "r", encoding="utf-8") as f:
-                readme_text = f.read()
+            readme = self.hf_metadata.readme()
+            if readme is None:
+                return 0.0
 
             # try to locate demo code in model card
-            all_blocks = re.findall(r"```python(.*?)```", readme_text, re.DOTALL)
+            all_blocks = readme.code_blocks("python")
             if not all_blocks:
                 return 0.0
 
@@ -501,6 +532,10 @@ class Model:
         Definition: fraction of all *code* (not weights) that was
         introduced via pull requests which had a code review. If there is no
         linked GitHub repository, return -1.0.
+
+        Repositories with many merged PRs are estimated from a random sample
+        (see utils/reviewedness_sampling.py); reviewedness_sampled and
+        reviewedness_bounds (95% interval) are set in that case.
         """
         code_url = getattr(self, "code_url", None) or ""
         parsed = urlparse(code_url)
@@ -514,104 +549,45 @@ class Model:
         except Exception:
             return -1.0
         
-        session = requests.Session()
-        token = os.getenv("GITHUB_TOKEN", "").strip()
-        headers = {
-            "Accept": "application/vnd.github+json",
-            **({"Authorization": f"Bearer {token}"} if token else {}),
-        }
-
-        # reviewedness specific helpers to decide whether a file counts as code instead of weights
-        code_exts = {
-            ".py", ".ipynb", ".js", ".ts", ".jsx", ".tsx",
-            ".java", ".c", ".cc", ".cpp", ".h", ".hpp",
-            ".go", ".rs", ".rb", ".swift", ".kt", ".m", ".mm",
-            ".sh", ".ps1", ".r", ".jl",
-            ".yml", ".yaml", ".json", ".toml", ".ini", ".cfg", ".mk",
-            ".sql", ".pl"
-        }
-        non_code_or_weight_exts = {
-            ".bin", ".safetensors", ".pt", ".pth", ".onnx",
-            ".h5", ".ckpt", ".tflite", ".pb", ".weights",
-            ".tar", ".gz", ".zip", ".xz", ".7z", ".rar",
-            ".parquet", ".feather", ".arrow", ".npz", ".npy",
-            ".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff", ".webp",
-            ".pdf", ".docx", ".pptx", ".xls", ".xlsx",
-            ".ipynb_checkpoints",
-        }
-
-        def is_code_file(fname: str) -> bool:
-            f = fname.lower()
-            if any(seg in f for seg in ("/weights/", "/checkpoints/", "/artifacts/", "/models/")):
-                return False
-            ext = "." + f.rsplit(".", 1)[-1] if "." in f else ""
-            if ext in non_code_or_weight_exts:
-                return False
-            # treat files with a known code/config extension as code
-            return ext in code_exts
-        
-        def get_paginated(url: str, params: dict):
-            page = 1
-            while True:
-                p = {**params, "per_page": 100, "page": page}
-                resp = session.get(url, headers=headers, params=p, timeout=15)
-                if resp.status_code >= 400:
-                    break
-                data = resp.json()
-                if not data:
-                    break
-                yield data
-                if "link" not in resp.headers or 'rel="next"' not in resp.headers["link"]:
-                    break
-                page += 1
-
-        base_url = f"https://api.github.com/repos/{owner}/{repo}"
-        merged_pr_numbers = []
+        fetcher = GitHubFetcher(owner, repo)
         try:
-            for page in get_paginated(f"{base_url}/pulls", {"state": "closed", "sort": "updated", "direction": "desc"}):
-                for pr in page:
-                    # pr['merged_at'] present means it was merged
-                    if pr.get("merged_at"):
-                        merged_pr_numbers.append(pr["number"])
-                    # Stop after a reasonable cap to keep runtime bounded
-                if len(merged_pr_numbers) >= 400:
-                    break
+            merged_pr_numbers = fetcher.merged_pr_numbers(limit=400)
         except Exception:
             return 0.0
         
         if not merged_pr_numbers: # nothing introduced via reviewed PRs
             return 0.0
-    
+
+        def code_additions(pr) -> Tuple[int, int]:
+            # additions field counts added lines in that file within the PR
+            added = sum(additions for fname, additions in pr.files if is_code_file(fname))
+            return added, added if pr.approved else 0
+
+        try:
+            if use_sampling(len(merged_pr_numbers)):
+                estimate = estimate_reviewedness(
+                    merged_pr_numbers,
+                    fetcher.pr_details,
+                    code_additions,
+                    lambda: fetcher.request_count,
+                    seed_text=f"{owner}/{repo}",
+                )
+                self.reviewedness_sampled = True
+                self.reviewedness_bounds = (estimate.low, estimate.high)
+                return max(0.0, min(1.0, estimate.value))
+            details = fetcher.pr_details(merged_pr_numbers)
+        except GitHubError:
+            return 0.0
+
         total_code_additions = 0
         reviewed_code_additions = 0
 
-        # for each merged PR, check reviews and count code additions
-        for pr_number in merged_pr_numbers:
-            try:
-                # look for approved review
-                rev_ok = False
-                rev_resp = session.get(f"{base_url}/pulls/{pr_number}/reviews", headers=headers, timeout=15)
-                if rev_resp.status_code < 400:
-                    for r in rev_resp.json():
-                        # States: COMMENTED, APPROVED, CHANGES_REQUESTED, DISMISSED
-                        if (r.get("state") or "").upper() == "APPROVED":
-                            rev_ok = True
-                            break
-                # add up additions for code files
-                pr_files_additions = 0
-                for page in get_paginated(f"{base_url}/pulls/{pr_number}/files", {}):
-                    for f in page:
-                        fname = f.get("filename") or ""
-                        if is_code_file(fname):
-                            # additions field counts added lines in that file within the PR
-                            pr_files_additions += int(f.get("additions") or 0)
-                total_code_additions += pr_files_additions
-                if rev_ok:
-                    reviewed_code_additions += pr_files_additions    
-
-            except Exception:
-                continue
-        
+        # for each merged PR, count code additions and whether it was approved
+        for pr in details.values():
+            added, reviewed = code_additions(pr)
+            total_code_additions += added
+            reviewed_code_additions += reviewed
+
         if total_code_additions <= 0:
             return 0.0
         
@@ -637,27 +613,30 @@ class Model:
             if not parents:
                 return 0.0
 
-            parents = parents[:5]
+            # Only score real HF repos, skip architecture tags
+            parents = [p for p in parents[:5] if self._looks_like_hf_repo(p)]
 
             api_key = os.getenv("API_KEY", "")
 
-            scores: list[float] = []
-            for parent_repo in parents:
-                # Only score real HF repos, skip architecture tags
-                if not self._looks_like_hf_repo(parent_repo):
-                    continue
-
-                parent_url = self._to_hf_url(parent_repo)
-
+            stored: Dict[str, dict] = {}
+            if self.stored_ratings is not None and parents:
                 try:
-                    # Compute child's net score but disable its own TreeScore to avoid recursion
-                    parent_model = Model(parent_url, dataset_url="", code_url="")
-                    parent_model.get_treescore = lambda: 0.0  # type: ignore[attr-defined]
-                    s = float(parent_model.compute_net_score(api_key=api_key))
-                    if 0.0 <= s <= 1.0:
-                        scores.append(s)
+                    stored = self.stored_ratings(parents)
                 except Exception:
-                    continue
+                    stored = {}
+
+            # registry ratings first, then scores memoized or in flight for other requests
+            engine = get_treescore_engine()
+            scores: list[float] = []
+            for parent_repo in parents:
+                rating = stored.get(canonical_repo_id(parent_repo) or "") or {}
+                s = engine.parent_score(
+                    parent_repo,
+                    lambda repo=parent_repo: self._parent_net_score(repo, api_key),
+                    stored=rating.get("net_score"),
+                )
+                if s is not None:
+                    scores.append(s)
 
             if not scores:
                 return 0.0
@@ -667,6 +646,12 @@ class Model:
             return 0.0
     
     # Treescore helper functions
+    def _parent_net_score(self, parent_repo: str, api_key: str) -> float:
+        # Compute the parent's net score but disable its own TreeScore to avoid recursion
+        parent_model = Model(self._to_hf_url(parent_repo), dataset_url="", code_url="")
+        parent_model.get_treescore = lambda: 0.0  # type: ignore[attr-defined]
+        return float(parent_model.compute_net_score(api_key=api_key))
+
     def _clip01(self, x: float) -> float:
         try:
             return max(0.0, min(1.0, float(x)))
@@ -730,17 +715,12 @@ class Model:
 
     def get_lineage_graph(self) -> Optional[nx.DiGraph]:
         self.lineage_graph = None
-        api = HfApi()
-
-        parts = urlparse(self.url).path.strip("/").split("/")
-        if len(parts) < 2:
+        if self.hf_metadata is None:
             return None
-        repo_id = f"{parts[0]}/{parts[1]}"
+        repo_id = self.hf_metadata.repo_id
 
         try:
-            cfg_path = api.hf_hub_download(repo_id=repo_id, filename="config.json")
-            with open(cfg_path, "r", encoding="utf-8") as f:
-                cfg = json.load(f)
+            cfg = json.loads(self.hf_metadata.read_text("config.json"))
         except Exception:
             return None
 
@@ -784,30 +764,43 @@ class Model:
         Returns:
             A float score between 0.0 and 1.0 representing the net score.
         """
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            future_size = executor.submit(self.time_metric, self.get_size)
-            future_license = executor.submit(self.time_metric, self.get_license)
-            future_ramp_up_time = executor.submit(self.time_metric, self.get_ramp_up_time, api_key=api_key)
-            future_bus_factor = executor.submit(self.time_metric, self.get_bus_factor)
-            future_performance_claims = executor.submit(self.time_metric, self.get_performance_claims, api_key=api_key)
-            future_dataset_quality = executor.submit(self.time_metric, self.dataset.get_quality, api_key=api_key)
-            future_code_quality = executor.submit(self.time_metric, self.code.get_quality)
-            future_dataset_and_code_score = executor.submit(self.time_metric, self.get_dataset_and_code_score)
-            future_reproducibility = executor.submit(self.time_metric, self.get_reproducibility)
-            future_reviewedness = executor.submit(self.time_metric, self.get_reviewedness)
-            future_treescore = executor.submit(self.time_metric, self.get_treescore)
-
-            self.size_score, self.size_score_latency = future_size.result()
-            self.license_score, self.license_latency = future_license.result()
-            self.ramp_up_time, self.ramp_up_time_latency = future_ramp_up_time.result()
-            self.bus_factor, self.bus_factor_latency = future_bus_factor.result()
-            self.performance_claims, self.performance_claims_latency = future_performance_claims.result()
-            self.dataset.quality, self.dataset_quality_latency = future_dataset_quality.result()
-            self.code.quality, self.code_quality_latency = future_code_quality.result()
-            self.dataset_and_code_score, self.dataset_and_code_score_latency = future_dataset_and_code_score.result()
-            self.reproducibility, self.reproducibility_latency = future_reproducibility.result()
-            self.reviewedness, self.reviewedness_latency = future_reviewedness.result()
-            self.treescore, self.treescore_latency = future_treescore.result()
+        if LLM_BATCH_SCORING:
+            self.llm_batch = LLMBatchScorer(
+                LLMQuerier(endpoint=LLM_ENDPOINT, api_key=api_key),
+                {
+                    "ramp_up_time": self._ramp_up_prompt,
+                    "performance_claims": self._performance_claims_prompt,
+                    "dataset_quality": self.dataset.llm_prompt,
+                },
+            )
+            self.dataset.llm_batch = self.llm_batch
+
+        # shared, bounded pool; parents rated by treescore queue on it like any other evaluation
+        (
+            (self.size_score, self.size_score_latency),
+            (self.license_score, self.license_latency),
+            (self.ramp_up_time, self.ramp_up_time_latency),
+            (self.bus_factor, self.bus_factor_latency),
+            (self.performance_claims, self.performance_claims_latency),
+            (self.dataset.quality, self.dataset_quality_latency),
+            (self.code.quality, self.code_quality_latency),
+            (self.dataset_and_code_score, self.dataset_and_code_score_latency),
+            (self.reproducibility, self.reproducibility_latency),
+            (self.reviewedness, self.reviewedness_latency),
+            (self.treescore, self.treescore_latency),
+        ) = get_metric_executor().run_all([
+            partial(self.time_metric, self.get_size),
+            partial(self.time_metric, self.get_license),
+            partial(self.time_metric, self.get_ramp_up_time, api_key=api_key),
+            partial(self.time_metric, self.get_bus_factor),
+            partial(self.time_metric, self.get_performance_claims, api_key=api_key),
+            partial(self.time_metric, self.dataset.get_quality, api_key=api_key),
+            partial(self.time_metric, self.code.get_quality),
+            partial(self.time_metric, self.get_dataset_and_code_score),
+            partial(self.time_metric, self.get_reproducibility),
+            partial(self.time_metric, self.get_reviewedness),
+            partial(self.time_metric, self.get_treescore),
+        ])
 
         if self.reviewedness is None or float(self.reviewedness) < 0.0:
             self.reviewedness = 0.0
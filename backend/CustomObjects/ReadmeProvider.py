@@ -0,0 +1,203 @@
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from huggingface_hub import HfApi
+from huggingface_hub.utils import EntryNotFoundError
+from utils import http_client
+
+README_CACHE_ENTRIES = int(os.getenv("README_CACHE_ENTRIES", "256"))
+# README at a branch name can move; pinned revisions (commit shas) never do
+README_CACHE_TTL_SECONDS = float(os.getenv("README_CACHE_TTL_SECONDS", "600"))
+
+README_NAMES = ("readme.md", "readme.txt", "readme")
+HF_HOST = "huggingface.co"
+GITHUB_HOST = "github.com"
+
+HEADING_RE = re.compile(r"^(#+)[ \t]*(.*?)[ \t]*$", re.MULTILINE)
+
+
+class ReadmeSection(NamedTuple):
+    level: int
+    title: str  # lowercased heading text
+    start: int  # offset of the heading line
+    body_start: int  # offset just past the heading line
+    end: int  # next heading of the same or a higher level
+    next_heading: int  # next heading of any level
+
+
+class ParsedReadme:
+    """
+    README text plus an index of its markdown headings, built once and
+    shared by every metric that looks at the model card.
+    """
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self._sections: Optional[List[ReadmeSection]] = None
+        self._code_blocks: Dict[str, List[str]] = {}
+
+    @property
+    def sections(self) -> List[ReadmeSection]:
+        if self._sections is None:
+            matches = list(HEADING_RE.finditer(self.text))
+            sections = []
+            for i, m in enumerate(matches):
+                level = len(m.group(1))
+                end = len(self.text)
+                for later in matches[i + 1:]:
+                    if len(later.group(1)) <= level:
+                        end = later.start()
+                        break
+                next_heading = matches[i + 1].start() if i + 1 < len(matches) else len(self.text)
+                sections.append(ReadmeSection(level, m.group(2).strip().lower(), m.start(), m.end(), end, next_heading))
+            self._sections = sections
+        return self._sections
+
+    def find_section(self, *keywords: str, exact: bool = False) -> Optional[ReadmeSection]:
+        """
+        First section whose title equals (exact) or contains one of the keywords.
+        """
+        for section in self.sections:
+            if not section.title:
+                continue
+            if exact and section.title in keywords:
+                return section
+            if not exact and any(k in section.title for k in keywords):
+                return section
+        return None
+
+    def code_blocks(self, language: str = "python") -> List[str]:
+        if language not in self._code_blocks:
+            self._code_blocks[language] = re.findall(rf"```{re.escape(language)}(.*?)```", self.text, re.DOTALL)
+        return self._code_blocks[language]
+
+
+class _Pending:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Optional[ParsedReadme] = None
+        self.error: Optional[BaseException] = None
+
+
+class ReadmeProvider:
+    """
+    Process-wide README cache keyed by (host, repo, revision). Concurrent
+    requests for the same README share one fetch; a missing README is
+    cached too so it is not re-requested by every metric.
+    """
+
+    def __init__(self, max_entries: int = README_CACHE_ENTRIES, ttl: float = README_CACHE_TTL_SECONDS) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, str, str], Tuple[float, Optional[ParsedReadme]]]" = OrderedDict()
+        self._pending: Dict[Tuple[str, str, str], _Pending] = {}
+
+    def _fresh(self, key: Tuple[str, str, str], stored_at: float) -> bool:
+        pinned = re.fullmatch(r"[0-9a-f]{40}", key[2]) is not None
+        return pinned or time.monotonic() - stored_at < self.ttl
+
+    def seed(self, host: str, repo_id: str, revision: str, text: str) -> None:
+        """
+        Prime the cache with a README obtained elsewhere (e.g. the copy
+        stored at registration) unless a fresh entry is already present.
+        Empty text says nothing about the repo, so it is not cached.
+        """
+        if not text:
+            return
+        key = (host, repo_id, revision)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is None or not self._fresh(key, cached[0]):
+                self._store_locked(key, ParsedReadme(text))
+
+    def _store_locked(self, key: Tuple[str, str, str], parsed: Optional[ParsedReadme]) -> None:
+        self._entries[key] = (time.monotonic(), parsed)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, host: str, repo_id: str, revision: str,
+            fetch: Callable[[], Optional[str]]) -> Optional[ParsedReadme]:
+        """
+        Cached README for the repo at revision, calling fetch() on a miss.
+        fetch returns the text, or None if the repo has no README; if it
+        raises, the leader and every waiter on that fetch get the exception
+        and nothing is cached.
+        """
+        key = (host, repo_id, revision)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and self._fresh(key, cached[0]):
+                self._entries.move_to_end(key)
+                return cached[1]
+            pending = self._pending.get(key)
+            leader = pending is None
+            if leader:
+                pending = _Pending()
+                self._pending[key] = pending
+        if not leader:
+            pending.done.wait()
+            if pending.error is not None:
+                raise pending.error
+            return pending.value
+
+        try:
+            text = fetch()
+            pending.value = ParsedReadme(text) if text else None
+            with self._lock:
+                self._store_locked(key, pending.value)
+        except BaseException as e:
+            pending.error = e
+            raise
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+            pending.done.set()
+        return pending.value
+
+    def huggingface(self, repo_id: str, revision: str = "main", api: Optional[HfApi] = None) -> Optional[ParsedReadme]:
+        return self.get(HF_HOST, repo_id, revision, lambda: _fetch_hf_readme(api or HfApi(), repo_id, revision))
+
+    def github(self, owner: str, repo: str) -> Optional[ParsedReadme]:
+        return self.get(GITHUB_HOST, f"{owner}/{repo}", "HEAD", lambda: _fetch_github_readme(owner, repo))
+
+
+def _fetch_hf_readme(api: HfApi, repo_id: str, revision: str) -> Optional[str]:
+    """
+    README.md from the Hub, falling back to a listing (one extra call)
+    only when the repo names its README differently.
+    """
+    filename = "README.md"
+    try:
+        path = api.hf_hub_download(repo_id=repo_id, filename=filename, revision=revision)
+    except EntryNotFoundError:
+        names = [f for f in api.list_repo_files(repo_id=repo_id, revision=revision) if f.lower() in README_NAMES]
+        if not names:
+            return None
+        path = api.hf_hub_download(repo_id=repo_id, filename=names[0], revision=revision)
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _fetch_github_readme(owner: str, repo: str) -> Optional[str]:
+    for branch in ("main", "master"):
+        r = http_client.get(f"https://raw.githubusercontent.com/{owner}/{repo}/{branch}/README.md", timeout=5)
+        if r.status_code == 200 and r.text.strip():
+            return r.text
+    return None
+
+
+_provider: Optional[ReadmeProvider] = None
+_provider_lock = threading.Lock()
+
+
+def get_readme_provider() -> ReadmeProvider:
+    global _provider
+    with _provider_lock:
+        if _provider is None:
+            _provider = ReadmeProvider()
+        return _provider
@@ -0,0 +1,78 @@
+"""
+Compare the byte-level LOC counter with the previous text-mode counter on a
+synthetic tree of about one million lines.
+
+    python backend/benchmarks/bench_loc_counter.py [--lines N] [--files N]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from utils.loc_counter import count_python_loc  # noqa: E402
+
+
+def text_mode_loc(root: str) -> int:
+    """
+    The counter Code.count_python_loc used before: decode every .py file and
+    iterate over its lines in Python.
+    """
+    total = 0
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            if not name.endswith(".py"):
+                continue
+            try:
+                with open(os.path.join(dirpath, name), "r", encoding="utf-8", errors="ignore") as f:
+                    for _ in f:
+                        total += 1
+            except Exception:
+                continue
+    return total
+
+
+def build_tree(root: str, lines: int, files: int) -> None:
+    rng = random.Random(0)
+    per_file = max(1, lines // files)
+    endings = ["\n"] * 8 + ["\r\n", "\r"]
+    for i in range(files):
+        directory = os.path.join(root, f"pkg{i % 50}", f"sub{i % 7}")
+        os.makedirs(directory, exist_ok=True)
+        ending = rng.choice(endings)
+        body = ending.join(f"value_{j} = {j} * {rng.randint(0, 999)}  # line {j}" for j in range(per_file))
+        with open(os.path.join(directory, f"mod{i}.py"), "w", newline="") as f:
+            f.write(body + ending)
+
+
+def timed(fn, *args, repeat: int = 3):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lines", type=int, default=1_000_000)
+    parser.add_argument("--files", type=int, default=2_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        build_tree(root, args.lines, args.files)
+        baseline, baseline_s = timed(text_mode_loc, root)
+        print(f"text mode        {baseline:>10} lines  {baseline_s * 1000:8.1f} ms")
+        for threads in (1, 4):
+            total, seconds = timed(count_python_loc, root, threads)
+            assert total == baseline, (total, baseline)
+            print(f"bytes, {threads} thread{'s' if threads > 1 else ' '}  {total:>10} lines  "
+                  f"{seconds * 1000:8.1f} ms  ({baseline_s / seconds:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,7 @@ import logging
 from pathlib import Path
 from unicodedata import category
 from dotenv import load_dotenv
-import requests
+from utils import http_client
 from URL_handler import URLHandler
 from CLI_parser import parse_input_file
 
@@ -156,7 +156,7 @@ def validate_github_token() -> None:
         'Accept': 'application/vnd.github.v3+json',
     }
     try:
-        resp = requests.get('https://api.github.com/user', headers=headers, timeout=5)
+        resp = http_client.get('https://api.github.com/user', headers=headers, timeout=5)
         if resp.status_code != 200:
             print("Error: GITHUB_TOKEN appears to be invalid (401 Unauthorized). Please check the token.", file=sys.stderr)
             sys.exit(1)
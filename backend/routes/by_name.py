@@ -1,5 +1,5 @@
 from flask import Blueprint, jsonify, request, current_app
-from utils.registry_utils import load_registry, iter_registry
+from utils.registry_utils import find_artifacts_by_name
 import os
 from dotenv import load_dotenv
 load_dotenv()
@@ -15,27 +15,24 @@ def artifact_by_name(name: str):
     if not clean:
         return jsonify({"error": "Missing or invalid artifact name"}), 400
 
+    registry_path = None
     if ENV == "local":
         registry_path = current_app.config["REGISTRY_PATH"]
-        registry = load_registry(registry_path)
-    else:
-        registry = load_registry()
 
     out = []
-    for aid, item in iter_registry(registry):
+    for aid, item in find_artifacts_by_name(registry_path, clean):
         meta = item.get("metadata") or {
             "name": item.get("name"),
             "version": item.get("version"),
             "type": item.get("type"),
             "id": item.get("id"),
         }
-        if (meta.get("name") or "").strip().lower() == clean.lower():
-            out.append({
-                "name": meta.get("name"),
-                "version": meta.get("version"),
-                "id": meta.get("id") or aid,
-                "type": meta.get("type"),
-            })
+        out.append({
+            "name": meta.get("name"),
+            "version": meta.get("version"),
+            "id": meta.get("id") or aid,
+            "type": meta.get("type"),
+        })
 
     if not out:
         return jsonify({"error": "No such artifact"}), 404
@@ -1,9 +1,10 @@
 import io
+import os
 import re
 import typing as t
 from urllib.parse import urlparse
 import boto3
-import requests
+from utils import http_client
 import zipstream
 from flask import Blueprint, current_app, jsonify, request
 from dotenv import load_dotenv
@@ -11,14 +12,13 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from utils.registry_utils import (
-    load_registry,
-    find_model_in_registry,
+    get_artifact_entry,
     add_to_audit,
 )
 
 download_bp = Blueprint("download", __name__)
 BUCKET = "461-phase2-team12"
-S3_CLIENT = boto3.client("s3", region_name="us-east-2")
+S3_CLIENT = boto3.client("s3", region_name="us-east-2", endpoint_url=os.getenv("S3_ENDPOINT_URL") or None)
 
 
 def extract_hf_repo_id(url: str) -> t.Optional[str]:
@@ -50,7 +50,7 @@ def list_hf_files(repo_id: str) -> t.List[str]:
     api = f"https://huggingface.co/api/models/{repo_id}"
 
     # send API request
-    r = requests.get(api, timeout=30)
+    r = http_client.get(api, timeout=30)
     r.raise_for_status()
 
     # parse JSON response
@@ -73,7 +73,7 @@ def stream_hf_file(repo_id: str, filename: str, chunk_size: int = 512 * 1024):
     url = f"https://huggingface.co/{repo_id}/resolve/main/{filename}"
 
     # send streaming request
-    with requests.get(url, stream=True, timeout=60) as r:
+    with http_client.get(url, stream=True, timeout=60) as r:
         r.raise_for_status()
         for chunk in r.iter_content(chunk_size=chunk_size):
             if chunk:
@@ -255,15 +255,11 @@ def download_model(model_id):
 
     ENV = current_app.config.get("ENVIRONMENT", "local")
 
-    # load registry
+    # lookup model
+    registry_path = None
     if ENV == "local":
         registry_path = current_app.config["REGISTRY_PATH"]
-        registry = load_registry(registry_path)
-    else:
-        registry = load_registry()
-
-    # lookup model
-    model = find_model_in_registry(registry, model_id)
+    model = get_artifact_entry(registry_path, model_id)
     if not model:
         return jsonify({"error": "Model not found"}), 404
 
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify, current_app
 from datetime import datetime, timezone
 import os
+from utils.metric_executor import get_metric_executor
 
 
 health_bp = Blueprint("health", __name__)
@@ -61,6 +62,20 @@ def health_check_components():
         ]
     }]
 
+    # shared pool every rating evaluates its metrics on
+    executor_stats = get_metric_executor().stats()
+    components.append({
+        "id": "metric_executor",
+        "display_name": "Metric Executor",
+        "status": "OK",
+        "observed_at": now,
+        "description": "Bounded worker pool shared by all metric evaluations.",
+        "metrics": executor_stats,
+        "issues": [],
+        "timeline": [],
+        "logs": []
+    })
+
     if include_timeline:
         for comp in components:
             comp["timeline"] = [
@@ -1,5 +1,5 @@
 from flask import Blueprint, request, jsonify, current_app
-from utils.registry_utils import load_registry, save_registry, add_to_audit
+from utils.registry_utils import get_artifact_entry, update_artifact_data, add_to_audit
 import jwt
 from datetime import datetime, timezone, timedelta
 import os
@@ -13,22 +13,19 @@ ENV = os.getenv("ENVIRONMENT", "local")
 @put_bp.route("/artifacts/<artifact_type>/<id>", methods=["PUT"])
 def update_artifact(artifact_type: str, id: str):
     # Access to config for registry path
+    registry_path = None
     if ENV == "local":
         registry_path = current_app.config["REGISTRY_PATH"]
-        registry = load_registry(registry_path)
-    else:
-        registry = load_registry()
     
     data = request.get_json()
     if not data:
         return jsonify({"error": "Missing artifact data"}), 400
     
-    if id not in registry:
+    old_artifact = get_artifact_entry(registry_path, id)
+    if old_artifact is None:
         return jsonify({"error": "Artifact not found"}), 404
     
     # Verify id and type match
-    old_artifact = registry[id]
-    print(old_artifact)
     if (
         old_artifact["metadata"]["id"] != id
         or old_artifact["metadata"]["type"] != artifact_type
@@ -36,11 +33,7 @@ def update_artifact(artifact_type: str, id: str):
         return jsonify({"error": "ID or type mismatch"}), 400
 
     # Replace the artifact contents
-    registry[id]["data"] = data
-    if ENV == "local":
-        save_registry(registry_path, registry)
-    else:
-        save_registry(data=registry)
+    update_artifact_data(registry_path, id, data)
 
     # Add to audit
     name = "Name" # Change this later
@@ -1,11 +1,14 @@
 from flask import Blueprint, request, jsonify, current_app
 from utils.registry_utils import (
-    load_registry,
-    save_registry,
-    find_model_in_registry,
+    get_artifact_entry,
+    set_artifact_rating,
+    find_artifacts_by_type,
+    find_model_ratings,
+    load_readme,
     add_to_audit
 )
 from utils.time_utils import ms_to_seconds
+from utils.rating_queue import get_rating_queue
 import os
 from urllib.parse import urlparse
 import re
@@ -75,39 +78,28 @@ def get_dataset_and_code(model_url, dataset_urls, code_urls, api_key):
     return response
 
 
-@rate_bp.route("/artifact/model/<id>/rate", methods=["GET"])
-def rate_model(id):
+class RatingError(Exception):
+    def __init__(self, message: str, status: int = 500) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def compute_model_rating(registry_path: Optional[str], id: str, api_key: Optional[str]) -> dict:
     '''
-    Rate the model and return the net and sub scores
-    from phase 1
-    Also includes new metrics
-    - Reproducibility: Whether model can be run using only 
-    the demonstrated code in model card
-    - Reviewedness: The fraction of all code in repo that was 
-    introduced by pull requests with a code review
-    - Treescore: Average of the total model scores of all parents
-    of the model
+    Rate the model and store the result on its registry entry.
+    Runs without a request context so rating jobs can call it from a worker.
+    Raises RatingError with the HTTP status to report on failure.
     '''
-
     if ModelClass is None:
-        return jsonify({"error": "Model implementation unavailable"}), 500
+        raise RatingError("Model implementation unavailable")
     if CodeClass is None:
-        return jsonify({"error": "Code implementation unavailable"}), 500
+        raise RatingError("Code implementation unavailable")
     if DatasetClass is None:
-        return jsonify({"error": "Model implementation unavailable"}), 500
-
-    if ENV == "local":
-        registry_path = current_app.config.get("REGISTRY_PATH")
-        if not registry_path:
-            return jsonify({"error": "Server misconfigured: REGISTRY_PATH unset"}), 500
-
-        registry = load_registry(registry_path)
-    else:
-        registry = load_registry()
+        raise RatingError("Model implementation unavailable")
 
-    entry = find_model_in_registry(registry, id) or registry.get(id)
+    entry = get_artifact_entry(registry_path, id)
     if not entry:
-        return jsonify({"error": "Artifact does not exist."}), 404
+        raise RatingError("Artifact does not exist.", 404)
     
     metadata = entry.get("metadata") or {}
     data = entry.get("data") or {}
@@ -115,17 +107,14 @@ def rate_model(id):
     model_url = (data.get("url") or "").strip()
     
     # get dataset and code urls from the registry
-    dataset_urls = []
-    code_urls = []
-    for _, artifact_values in registry.items():
-        artifact_type = artifact_values["metadata"]["type"]
-        artifact_url = artifact_values["data"]["url"]
-        if artifact_type == "dataset":
-            dataset_urls.append(artifact_url)
-        elif artifact_type == "code":
-            code_urls.append(artifact_url)
-
-    api_key = current_app.config.get("API_KEY")
+    dataset_urls = [
+        artifact_values["data"]["url"]
+        for _, artifact_values in find_artifacts_by_type(registry_path, "dataset")
+    ]
+    code_urls = [
+        artifact_values["data"]["url"]
+        for _, artifact_values in find_artifacts_by_type(registry_path, "code")
+    ]
 
     # prompt the LLM to get the dataset and code URLs
     response = get_dataset_and_code(model_url, dataset_urls, code_urls, api_key)
@@ -138,12 +127,20 @@ def rate_model(id):
     if response[1].startswith(("http://", "https://")):
         code_url = response[1]
 
-    model = ModelClass(model_url=model_url, dataset_url=dataset_url, code_url=code_url)
+    # reuse the README stored at registration instead of downloading it again
+    model = ModelClass(
+        model_url=model_url,
+        dataset_url=dataset_url,
+        code_url=code_url,
+        readme_text=load_readme(registry_path, entry),
+        # parents already rated in this registry count toward treescore as stored
+        stored_ratings=lambda repo_ids: find_model_ratings(registry_path, repo_ids),
+    )
 
     try:
         model.compute_net_score(api_key=api_key)
     except Exception as e:
-        return jsonify({"error": f"Failed to compute net score: {e}"}), 500
+        raise RatingError(f"Failed to compute net score: {e}")
     
     size_score = getattr(model, "size_score", {}) or {}
     size_score = {
@@ -195,13 +192,44 @@ def rate_model(id):
         "size_score_latency": ms_to_seconds(getattr(model, "size_score_latency", 0)),
     }
 
-    entry["rating"] = response
-    registry[id] = entry
+    # large repositories are scored from samples; say so and give the 95% range
+    code = getattr(model, "code", None)
+    if getattr(code, "quality_sampled", False):
+        response["code_quality_sampled"] = True
+        response["code_quality_bounds"] = [float(b) for b in code.quality_bounds]
+    if getattr(model, "reviewedness_sampled", False):
+        response["reviewedness_sampled"] = True
+        response["reviewedness_bounds"] = [float(b) for b in model.reviewedness_bounds]
+
+    set_artifact_rating(registry_path, id, response)
+
+    return response
 
+
+@rate_bp.route("/artifact/model/<id>/rate", methods=["GET"])
+def rate_model(id):
+    '''
+    Rate the model and return the net and sub scores
+    from phase 1
+    Also includes new metrics
+    - Reproducibility: Whether model can be run using only 
+    the demonstrated code in model card
+    - Reviewedness: The fraction of all code in repo that was 
+    introduced by pull requests with a code review
+    - Treescore: Average of the total model scores of all parents
+    of the model
+    '''
+
+    registry_path = None
     if ENV == "local":
-        save_registry(registry_path, registry)
-    else:
-        save_registry(data=registry)
+        registry_path = current_app.config.get("REGISTRY_PATH")
+        if not registry_path:
+            return jsonify({"error": "Server misconfigured: REGISTRY_PATH unset"}), 500
+
+    try:
+        response = compute_model_rating(registry_path, id, current_app.config.get("API_KEY"))
+    except RatingError as e:
+        return jsonify({"error": str(e)}), e.status
 
     # # Add to audit
     # name = "Name" # Change this later
@@ -210,4 +238,14 @@ def rate_model(id):
     # artifact_name = data["metadata"]["name"]
     # add_to_audit(name, admin, artifact_type, id, artifact_name, "RATE")
 
-    return jsonify(response), 200
\ No newline at end of file
+    return jsonify(response), 200
+
+@rate_bp.route("/rating/jobs/<job_id>", methods=["GET"])
+def rating_job_status(job_id):
+    '''
+    Status of a queued rating job, with its result once it has finished
+    '''
+    job = get_rating_queue().get(job_id)
+    if job is None:
+        return jsonify({"error": "Rating job not found"}), 404
+    return jsonify(job.to_dict()), 200
@@ -1,13 +1,20 @@
 from flask import Blueprint, request, jsonify, current_app
 import os
 import uuid
-import requests
 from utils.registry_utils import (
-    load_registry,
-    save_registry,
     infer_artifact_type,
     add_to_audit,
+    put_artifact_entry,
+    remove_artifact_entry,
+    find_artifact_by_url,
+    store_readme,
+    get_artifact_entry,
+    update_artifact_data,
+    update_artifact_metadata,
 )
+from utils.rating_queue import get_rating_queue, RatingQueueFull, JOB_FAILED
+from routes.rate import compute_model_rating
+from CustomObjects.ReadmeProvider import get_readme_provider
 
 from routes.download import (
     extract_hf_repo_id,
@@ -25,7 +32,7 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
-s3 = boto3.client("s3", region_name="us-east-2")
+s3 = boto3.client("s3", region_name="us-east-2", endpoint_url=os.getenv("S3_ENDPOINT_URL") or None)
 S3_BUCKET = "461-phase2-team12"
 
 
@@ -42,6 +49,32 @@ def s3_object_exists(bucket: str, key: str) -> bool:
 register_bp = Blueprint("artifact", __name__)
 UPLOAD_FOLDER = os.path.join(os.path.dirname(__file__), "uploads")
 ENV = os.getenv("ENVIRONMENT", "local")
+# how long registration waits for the rating before answering 202 with a job id
+RATING_SYNC_WAIT_SECONDS = float(os.getenv("RATING_SYNC_WAIT_SECONDS", "30"))
+
+
+def rate_and_record(registry_path, artifact_id: str, api_key):
+    """
+    Rating job body: rate a newly registered model and attach the rating
+    to its entry, or remove the entry if rating fails or the score is too low.
+    """
+    try:
+        rating = compute_model_rating(registry_path, artifact_id, api_key)
+    except Exception as e:
+        remove_artifact_entry(registry_path, artifact_id)
+        raise RuntimeError(f"Failed to rate model: {e}")
+
+    net_score = rating.get("net_score", 0.0)
+    if net_score < -1:
+        remove_artifact_entry(registry_path, artifact_id)
+        raise RuntimeError(f"Model rejected. Score too low: ({net_score}). Upload failed.")
+
+    # only touch "metadata" so the request thread's "data" update is not overwritten
+    entry = get_artifact_entry(registry_path, artifact_id)
+    if entry is not None:
+        metadata = {**(entry.get("metadata") or {}), "rating": rating}
+        update_artifact_metadata(registry_path, artifact_id, metadata)
+    return rating
 
 
 @register_bp.route("/artifact/<artifact_type>", methods=["POST"])
@@ -58,9 +91,6 @@ def register_artifact(artifact_type: str):
     registry_path = None
     if ENV == "local":
         registry_path = current_app.config["REGISTRY_PATH"]
-        registry = load_registry(registry_path)
-    else:
-        registry = load_registry()
 
     body = request.get_json(silent=True) or {}
     url = (body.get("url") or "").strip()
@@ -74,9 +104,8 @@ def register_artifact(artifact_type: str):
     except ValueError:
         pass
 
-    for entry0 in (registry.values() if isinstance(registry, dict) else registry):
-        if entry0.get("data", {}).get("url") == url:
-            return jsonify({"error": "Artifact with this URL already exists"}), 409
+    if find_artifact_by_url(registry_path, url) is not None:
+        return jsonify({"error": "Artifact with this URL already exists"}), 409
 
     try:
         total_size = get_artifact_size(url, artifact_type)
@@ -87,19 +116,14 @@ def register_artifact(artifact_type: str):
     if total_size > 5 * 1024**3:
         return jsonify({"error": "Artifact is too large"}), 424
 
+    # one README fetch through the shared provider; rating reuses it
     readme_text = ""
     try:
+        readme = None
         if "huggingface.co" in url:
             repo_id = extract_hf_repo_id(url)
             if repo_id:
-                for branch in ("main", "master"):
-                    for fn in ("README.md", "README.MD", "readme.md", "readme.MD", "README.txt", "README"):
-                        r = requests.get(f"https://huggingface.co/{repo_id}/raw/{branch}/{fn}", timeout=5)
-                        if r.status_code == 200 and r.text.strip():
-                            readme_text = r.text[:200_000]
-                            break
-                    if readme_text:
-                        break
+                readme = get_readme_provider().huggingface(repo_id)
 
         elif "github.com" in url:
             parts = urlparse(url).path.strip("/").split("/")
@@ -108,14 +132,9 @@ def register_artifact(artifact_type: str):
                 repo = parts[1]
                 if repo.endswith(".git"):
                     repo = repo[:-4]
-                for branch in ("main", "master"):
-                    r = requests.get(
-                        f"https://raw.githubusercontent.com/{owner}/{repo}/{branch}/README.md",
-                        timeout=5,
-                    )
-                    if r.status_code == 200 and r.text.strip():
-                        readme_text = r.text[:200_000]
-                        break
+                readme = get_readme_provider().github(owner, repo)
+        if readme is not None:
+            readme_text = readme.text[:200_000]
     except Exception:
         readme_text = ""
 
@@ -130,75 +149,28 @@ def register_artifact(artifact_type: str):
             "type": artifact_type,
         },
         "data": {"url": url},
-        "_index": {"readme": readme_text},
+        "_index": store_readme(registry_path, readme_text),
     }
 
-    if isinstance(registry, dict):
-        registry[artifact_id] = entry
-    else:
-        registry.append(entry)
-
-    if ENV == "local":
-        save_registry(registry_path, registry)
-    else:
-        save_registry(data=registry)
+    put_artifact_entry(registry_path, artifact_id, entry)
 
-    # rate the artifact
+    # rate the artifact on the rating queue; wait a bounded time for the
+    # result and otherwise hand back the job for the client to poll
+    rating_job = None
     if artifact_type == "model":
-        base = request.host_url.rstrip("/")
-        rate_url = f"{base}/artifact/model/{artifact_id}/rate"
+        api_key = current_app.config.get("API_KEY")
         try:
-            response = requests.get(rate_url)
-            if response.status_code != 200:
-                del registry[artifact_id]
-                if ENV == "local":
-                    save_registry(registry_path, registry)
-                else:
-                    save_registry(data=registry)
-                return jsonify({"error": f"Failed to rate model: {response.text}"}), 424
-
-            rating = response.json()
-            net_score = rating.get("net_score", 0.0)
-
-            if net_score < -1:
-                del registry[artifact_id]
-                if ENV == "local":
-                    save_registry(registry_path, registry)
-                else:
-                    save_registry(data=registry)
-                return jsonify({"error": f"Model rejected. Score too low: ({net_score}). Upload failed."}), 424
-
-            final_entry = {
-                "metadata": {
-                    "id": artifact_id,
-                    "name": artifact_name,
-                    "version": body.get("version") or "0.0.1",
-                    "type": artifact_type,
-                    "rating": rating,
-                },
-                "data": {"url": url},
-                "_index": entry.get("_index", {}),
-            }
-
-            if isinstance(registry, dict):
-                registry[artifact_id] = final_entry
-            else:
-                registry.append(final_entry)
-
-            if ENV == "local":
-                save_registry(registry_path, registry)
-            else:
-                save_registry(data=registry)
-
-            entry = final_entry
-
-        except Exception as e:
-            del registry[artifact_id]
-            if ENV == "local":
-                save_registry(registry_path, registry)
-            else:
-                save_registry(data=registry)
-            return jsonify({"error": f"Failed to rate model: {e}"}), 424
+            rating_job = get_rating_queue().submit(
+                artifact_id, lambda: rate_and_record(registry_path, artifact_id, api_key)
+            )
+        except RatingQueueFull as e:
+            remove_artifact_entry(registry_path, artifact_id)
+            return jsonify({"error": str(e)}), 503
+
+        if rating_job.wait(RATING_SYNC_WAIT_SECONDS):
+            if rating_job.status == JOB_FAILED:
+                return jsonify({"error": rating_job.error}), 424
+            entry = get_artifact_entry(registry_path, artifact_id) or entry
 
     # download the artifact
     try:
@@ -233,20 +205,20 @@ def register_artifact(artifact_type: str):
             entry["data"]["download_url"] = presigned_url
             entry["data"]["s3_key"] = s3_key
 
-        # update registry
-        if isinstance(registry, dict):
-            registry[artifact_id] = entry
-        else:
-            registry.append(entry)
-
-        if ENV == "local":
-            save_registry(registry_path, registry)
-        else:
-            save_registry(data=registry)
+        # update registry; only touch "data" so a rating finishing
+        # in the background is not overwritten
+        update_artifact_data(registry_path, artifact_id, entry["data"])
 
     except Exception as e:
         return jsonify({"error": "Failed to download and package artifact", "details": str(e)}), 500
 
     resp_entry = dict(entry)
     resp_entry.pop("_index", None)
+    if rating_job is not None and not rating_job.done():
+        resp_entry["rating_job"] = {
+            "job_id": rating_job.job_id,
+            "status": rating_job.status,
+            "status_url": f"/rating/jobs/{rating_job.job_id}",
+        }
+        return jsonify(resp_entry), 202
     return jsonify(resp_entry), 201
\ No newline at end of file
@@ -1,5 +1,5 @@
 from flask import Blueprint, request, jsonify, current_app
-from utils.registry_utils import load_registry, save_registry
+from utils.registry_utils import save_registry, get_artifact_entry, remove_artifact_entry
 import os
 from dotenv import load_dotenv
 load_dotenv()
@@ -39,13 +39,11 @@ def delete_artifact(artifact_type: str, id: str):
     if artifact_type not in ("model", "dataset", "code"):
         return jsonify({"error": "Invalid artifact_type"}), 400
 
+    registry_path = None
     if ENV == "local":
         registry_path = current_app.config["REGISTRY_PATH"]
-        registry = load_registry(registry_path)
-    else:
-        registry = load_registry()
 
-    artifact = registry.get(id)
+    artifact = get_artifact_entry(registry_path, id)
     if not artifact:
         return jsonify({"error": "Artifact not found"}), 404
 
@@ -53,11 +51,6 @@ def delete_artifact(artifact_type: str, id: str):
     if md.get("type") != artifact_type:
         return jsonify({"error": "Invalid artifact type"}), 400
 
-    del registry[id]
-
-    if ENV == "local":
-        save_registry(registry_path, registry)
-    else:
-        save_registry(data=registry)
+    remove_artifact_entry(registry_path, id)
 
     return jsonify({"message": "Artifact has been deleted"}), 200
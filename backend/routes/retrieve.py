@@ -1,5 +1,13 @@
 from flask import Blueprint, request, jsonify, current_app
-from utils.registry_utils import load_registry, add_to_audit, get_audit_entries
+from utils.registry_utils import (
+    load_registry,
+    add_to_audit,
+    get_audit_entries,
+    get_artifact_entry,
+    find_artifacts_by_name,
+    query_artifacts,
+    regex_search_artifacts,
+)
 from utils.lineage_utils import build_lineage_graph
 from typing import Any, Optional, Set
 import re
@@ -40,12 +48,10 @@ def get_artifacts():
     given a name and type
     """
     # get path to registry
+    registry_path = None
     if ENV == "local":
         registry_path = current_app.config.get("REGISTRY_PATH")
         assert registry_path is not None
-        registry = load_registry(registry_path)
-    else:
-        registry = load_registry()
 
     # parse JSON safely (handle single element list) 
     query = request.get_json(force=True, silent=True)
@@ -106,31 +112,11 @@ def get_artifacts():
         offset = 0
     page_size = 30
 
-    results = []
-    seen_ids = set()
-
-    for artifact_id, artifact in registry.items():
-        meta = artifact.get("metadata", {}) if isinstance(artifact, dict) else {}
-        a_name = str(meta.get("name", "")).strip() if isinstance(meta, dict) else ""
-        a_type = str(meta.get("type", "")).strip().lower() if isinstance(meta, dict) else ""
-
-        matched = False
-        for (name_q, types_set) in norm_queries:
-            if name_q != "*" and a_name.lower() != name_q.lower():
-                continue
-
-            if types_set is not None and a_type not in types_set:
-                continue
-
-            matched = True
-            break
-
-        if not matched:
-            continue
-
-        if artifact_id not in seen_ids:
-            results.append(serialize_artifact(artifact_id, artifact))
-            seen_ids.add(artifact_id)
+    # name/type indexes answer each query directly: O(Q + results)
+    results = [
+        serialize_artifact(artifact_id, artifact)
+        for artifact_id, artifact in query_artifacts(registry_path, norm_queries)
+    ]
 
     if len(results) > 100:
         return jsonify({"error": "Too many artifacts returned"}), 413
@@ -153,22 +139,16 @@ def get_name(name: str):
         return jsonify({"error": "Missing or invalid artifact name"}), 400
 
     # get path to registry
+    registry_path = None
     if ENV == "local":
         registry_path = current_app.config.get("REGISTRY_PATH")
         assert registry_path is not None
-        registry = load_registry(registry_path)
-    else:
-        registry = load_registry()
-
-    results = []
-    query = name.strip().lower()
 
     # append artifacts that match the name query
-    for artifact_id, artifact in registry.items():
-        metadata = artifact.get("metadata", {}) if isinstance(artifact, dict) else {}
-        artifact_name = str(metadata.get("name", "")).strip().lower() if isinstance(metadata, dict) else ""
-        if artifact_name == query:
-            results.append(serialize_artifact(artifact_id, artifact))
+    results = [
+        serialize_artifact(artifact_id, artifact)
+        for artifact_id, artifact in find_artifacts_by_name(registry_path, name)
+    ]
 
     # handle no results
     if not results:
@@ -184,15 +164,13 @@ def get_artifact(artifact_type: str, id: str):
     but ensure it includes id/name/type/version/metadata via serialization.
     """
     # get path to registry
+    registry_path = None
     if ENV == "local":
         registry_path = current_app.config.get("REGISTRY_PATH")
         assert registry_path is not None
-        registry = load_registry(registry_path)
-    else:
-        registry = load_registry()
 
     # get artifact by id
-    artifact = registry.get(id)
+    artifact = get_artifact_entry(registry_path, id)
     if not artifact:
         return jsonify({"error": "Artifact not found"}), 404
 
@@ -228,15 +206,13 @@ def get_cost(artifact_type: str, id: str):
         return jsonify({"error": "Missing field(s)"}), 400
 
     # get path to registry
+    registry_path = None
     if ENV == "local":
         registry_path = current_app.config.get("REGISTRY_PATH")
         assert registry_path is not None
-        registry = load_registry(registry_path)
-    else:
-        registry = load_registry()
 
     # get artifact
-    artifact = registry.get(id)
+    artifact = get_artifact_entry(registry_path, id)
     if not artifact:
         return jsonify({"error": "Artifact not found"}), 404
 
@@ -273,14 +249,12 @@ def get_audit(artifact_type: str, id: str):
     if not artifact_type or not id:
         return jsonify({"error": "Missing field(s)"}), 400
     
+    registry_path = None
     if ENV == "local":
         registry_path = current_app.config.get("REGISTRY_PATH")
         assert registry_path is not None
-        registry = load_registry(registry_path)
-    else:
-        registry = load_registry()
 
-    artifact = registry.get(id)
+    artifact = get_artifact_entry(registry_path, id)
     if not artifact:
         return jsonify({"error": "Artifact not found"}), 404
     
@@ -378,33 +352,32 @@ def get_by_regex():
     if not isinstance(pattern, str):
         return jsonify({"error": "Invalid regex type"}), 400
 
+    flags = re.IGNORECASE | re.DOTALL
     try:
-        compiled_regex = re.compile(pattern, re.IGNORECASE | re.DOTALL)
+        re.compile(pattern, flags)
     except re.error:
         return jsonify({"error": "Invalid regular expression"}), 400
 
+    registry_path = None
     if ENV == "local":
         registry_path = current_app.config.get("REGISTRY_PATH")
         assert registry_path is not None
-        registry = load_registry(registry_path)
-    else:
-        registry = load_registry()
 
+    found, complete = regex_search_artifacts(registry_path, pattern, flags)
     matches = []
-    for artifact_id, artifact in registry.items():
+    for artifact_id, artifact in found:
         metadata = artifact.get("metadata", {}) if isinstance(artifact, dict) else {}
-        name = str(metadata.get("name", ""))
-        readme = ""
-        if isinstance(artifact, dict):
-            idx = artifact.get("_index")
-            if isinstance(idx, dict):
-                readme = idx.get("readme") or ""
-        if compiled_regex.search(name) or (readme and compiled_regex.search(readme)):
-            matches.append({
-                "name": str(metadata.get("name", "")),
-                "id": str(metadata.get("id") or artifact_id),
-                "type": str(metadata.get("type", "")),
-            })
+        matches.append({
+            "name": str(metadata.get("name", "")),
+            "id": str(metadata.get("id") or artifact_id),
+            "type": str(metadata.get("type", "")),
+        })
+
+    if not complete:
+        # search budget ran out: return what finished, or reject the pattern
+        if not matches:
+            return jsonify({"error": "Regular expression took too long to evaluate"}), 400
+        return jsonify(matches), 200, {"X-Search-Partial": "true"}
 
     if not matches:
         return jsonify({"error": "No artifacts found"}), 404
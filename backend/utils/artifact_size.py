@@ -1,5 +1,6 @@
 from huggingface_hub import HfApi
 import requests
+from utils import http_client
 from urllib.parse import urlparse
 import os
 import time
@@ -85,7 +86,7 @@ def get_artifact_size(url: str, artifact_type: str) -> int:
         retries = 3
         for attempt in range(retries):
             try:
-                r = requests.get(api_url, headers=headers, timeout=10)
+                r = http_client.get(api_url, headers=headers, timeout=10)
                 r.raise_for_status()
                 data = r.json()
                 return int(data.get("size", 0)) * 1024  # KB → bytes
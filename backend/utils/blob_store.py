@@ -0,0 +1,99 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from botocore.exceptions import ClientError
+
+
+def blob_ref(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def read_blob_file(path: str) -> str:
+    with open(path, "rb") as f:
+        return f.read().decode("utf-8", "replace")
+
+
+class LocalBlobStore:
+    """
+    Content-addressed blobs on disk at <root>/<ref[:2]>/<ref>. Blobs are
+    immutable, so writing one that already exists is skipped.
+    """
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+
+    def path(self, ref: str) -> str:
+        return os.path.join(self.root, ref[:2], ref)
+
+    def put_text(self, text: str) -> str:
+        data = text.encode("utf-8")
+        ref = blob_ref(data)
+        path = self.path(ref)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        return ref
+
+    def get_text(self, ref: str) -> Optional[str]:
+        try:
+            return read_blob_file(self.path(ref))
+        except OSError:
+            return None
+
+    def local_path(self, ref: str) -> Optional[str]:
+        path = self.path(ref)
+        return path if os.path.exists(path) else None
+
+
+class S3BlobStore:
+    """
+    Content-addressed blobs stored as <prefix><ref> objects in a bucket.
+    """
+
+    def __init__(self, client, bucket: str, prefix: str = "blobs/", cache_size: int = 256) -> None:
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix
+        self.cache_size = cache_size
+        # blobs never change, so a fetched one can be kept indefinitely;
+        # failed reads are not cached so a transient error is retried
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def put_text(self, text: str) -> str:
+        data = text.encode("utf-8")
+        ref = blob_ref(data)
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=f"{self.prefix}{ref}",
+            Body=data,
+            ContentType="text/plain; charset=utf-8",
+        )
+        return ref
+
+    def get_text(self, ref: str) -> Optional[str]:
+        with self._cache_lock:
+            text = self._cache.get(ref)
+            if text is not None:
+                self._cache.move_to_end(ref)
+                return text
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=f"{self.prefix}{ref}")
+        except ClientError:
+            return None
+        text = response["Body"].read().decode("utf-8", "replace")
+        with self._cache_lock:
+            self._cache[ref] = text
+            self._cache.move_to_end(ref)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return text
+
+    def local_path(self, ref: str) -> Optional[str]:
+        return None
@@ -0,0 +1,107 @@
+import hashlib
+import math
+import os
+import random
+from typing import Dict, List, NamedTuple, Optional
+
+# two-sided 95% normal quantile
+Z_95 = 1.96
+
+
+class ErrorEstimate(NamedTuple):
+    errors: float  # extrapolated error count for the whole tree
+    low: float
+    high: float
+    sampled_files: int
+    sampled_loc: int
+
+
+def _stratum(root: str, path: str) -> str:
+    """
+    Top-level directory of path under root ("" for files in root itself).
+    """
+    rel = os.path.relpath(path, root)
+    head, sep, _ = rel.partition(os.sep)
+    return head if sep else ""
+
+
+def _strata(root: str, file_locs: Dict[str, int]) -> Dict[str, List[str]]:
+    strata: Dict[str, List[str]] = {}
+    for path in sorted(file_locs):
+        strata.setdefault(_stratum(root, path), []).append(path)
+    return strata
+
+
+def stratified_sample(root: str, file_locs: Dict[str, int], loc_budget: int, seed: Optional[int] = None) -> List[str]:
+    """
+    Random files from every top-level directory, each directory's share of
+    the LOC budget proportional to its share of the code. At least two files
+    per directory are taken where available so its variance can be estimated.
+    The default seed is derived from the file list, so an unchanged tree
+    always gets the same sample.
+    """
+    if seed is None:
+        listing = "\n".join(sorted(os.path.relpath(p, root) for p in file_locs))
+        seed = int.from_bytes(hashlib.sha1(listing.encode("utf-8")).digest()[:8], "big")
+    rng = random.Random(seed)
+    total = sum(file_locs.values()) or 1
+    sample = []
+    for _, paths in sorted(_strata(root, file_locs).items()):
+        stratum_loc = sum(file_locs[p] for p in paths)
+        budget = loc_budget * stratum_loc / total
+        paths = list(paths)
+        rng.shuffle(paths)
+        taken = 0
+        for i, path in enumerate(paths):
+            if i >= 2 and taken >= budget:
+                break
+            sample.append(path)
+            taken += file_locs[path]
+    return sample
+
+
+def estimate_errors(root: str, file_locs: Dict[str, int], errors: Dict[str, int], z: float = Z_95) -> ErrorEstimate:
+    """
+    Extrapolate the tree's error count from the sampled files in `errors`
+    with a separate ratio estimator (errors per line) in each stratum, and
+    a normal confidence interval around it.
+    """
+    sampled = [p for p in errors if p in file_locs]
+    by_stratum = _strata(root, file_locs)
+    sample_strata = _strata(root, {p: file_locs[p] for p in sampled})
+
+    # residual variance over all sampled files, for strata with a single file
+    all_loc = sum(file_locs[p] for p in sampled)
+    pooled_ratio = sum(errors[p] for p in sampled) / all_loc if all_loc else 0.0
+    pooled_s2 = (
+        sum((errors[p] - pooled_ratio * file_locs[p]) ** 2 for p in sampled) / (len(sampled) - 1)
+        if len(sampled) > 1 else 0.0
+    )
+
+    estimate = 0.0
+    variance = 0.0
+    for name, paths in by_stratum.items():
+        chosen = sample_strata.get(name, [])
+        stratum_loc = sum(file_locs[p] for p in paths)
+        sampled_loc = sum(file_locs[p] for p in chosen)
+        if not chosen or not sampled_loc:
+            estimate += pooled_ratio * stratum_loc
+            continue
+        ratio = sum(errors[p] for p in chosen) / sampled_loc
+        estimate += ratio * stratum_loc
+        n, size = len(chosen), len(paths)
+        if n > 1:
+            s2 = sum((errors[p] - ratio * file_locs[p]) ** 2 for p in chosen) / (n - 1)
+        else:
+            s2 = pooled_s2
+        variance += size * size * (1 - n / size) * s2 / n
+
+    observed = sum(errors[p] for p in sampled)
+    margin = z * math.sqrt(variance)
+    return ErrorEstimate(
+        errors=estimate,
+        low=max(float(observed), estimate - margin),
+        high=max(estimate, estimate + margin),
+        sampled_files=len(sampled),
+        sampled_loc=all_loc,
+    )
@@ -0,0 +1,170 @@
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+from array import array
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from huggingface_hub import constants
+from huggingface_hub.utils import build_hf_headers
+
+from utils import http_client
+
+COMMIT_HISTORY_DIR = os.getenv("COMMIT_HISTORY_DIR", os.path.join(tempfile.gettempdir(), "registry-commit-history"))
+
+# iterable of pages, each a list of raw commit dicts (id, date, authors), newest first
+PageSource = Callable[[str], Iterable[List[dict]]]
+
+
+class CommitHistory(NamedTuple):
+    """
+    (commit date, author) pairs of one repo in columns: epoch seconds, and
+    indices into an author table. head is the newest commit covered.
+    """
+    head: Optional[str]
+    authors: List[str]
+    dates: array  # 'q'
+    author_idx: array  # 'I'
+
+    def authors_since(self, cutoff: float) -> List[str]:
+        return [self.authors[i] for ts, i in zip(self.dates, self.author_idx) if ts > cutoff]
+
+
+def write_history(path: str, history: CommitHistory) -> None:
+    """
+    One JSON header line followed by the two columns as raw native arrays.
+    """
+    header = {
+        "head": history.head,
+        "authors": history.authors,
+        "count": len(history.dates),
+        "byteorder": sys.byteorder,
+    }
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(json.dumps(header).encode("utf-8") + b"\n")
+        f.write(history.dates.tobytes())
+        f.write(history.author_idx.tobytes())
+    os.replace(tmp, path)
+
+
+def read_history(path: str) -> Optional[CommitHistory]:
+    try:
+        with open(path, "rb") as f:
+            header = json.loads(f.readline())
+            dates, author_idx = array("q"), array("I")
+            dates.frombytes(f.read(header["count"] * dates.itemsize))
+            author_idx.frombytes(f.read(header["count"] * author_idx.itemsize))
+    except (OSError, ValueError, KeyError):
+        return None
+    if len(dates) != header["count"] or len(author_idx) != header["count"]:
+        return None
+    if header.get("byteorder", sys.byteorder) != sys.byteorder:
+        dates.byteswap()
+        author_idx.byteswap()
+    return CommitHistory(header["head"], list(header["authors"]), dates, author_idx)
+
+
+def hf_commit_pages(repo_id: str) -> Iterator[List[dict]]:
+    """
+    Pages of a model repo's commits from the Hub API, newest first,
+    fetched lazily so callers can stop early.
+    """
+    url: Optional[str] = f"{constants.ENDPOINT}/api/models/{repo_id}/commits/{constants.DEFAULT_REVISION}"
+    headers = build_hf_headers()
+    while url:
+        resp = http_client.get(url, headers=headers)
+        resp.raise_for_status()
+        yield resp.json()
+        url = resp.links.get("next", {}).get("url")
+
+
+class CommitHistoryCache:
+    """
+    Per-repo commit author/date history on disk. A refresh pages the
+    commit list from the newest commit and stops at the cached head or at
+    the first commit older than the window, so an unchanged repo costs one
+    request (none when the caller already knows the head sha). Entries
+    older than the window are dropped when saved.
+    """
+
+    def __init__(self, root: str = COMMIT_HISTORY_DIR, pages: PageSource = hf_commit_pages) -> None:
+        self.root = root
+        self.pages = pages
+        os.makedirs(root, exist_ok=True)
+        self._lock = threading.Lock()
+        self._repo_locks: Dict[str, threading.Lock] = {}
+
+    def path(self, repo_id: str) -> str:
+        return os.path.join(self.root, hashlib.sha1(repo_id.encode("utf-8")).hexdigest() + ".hist")
+
+    def recent_authors(self, repo_id: str, since: datetime, head_sha: Optional[str] = None) -> List[str]:
+        """
+        One author entry per (commit, author) newer than since.
+        """
+        cutoff = since.timestamp()
+        with self._lock:
+            repo_lock = self._repo_locks.setdefault(repo_id, threading.Lock())
+        with repo_lock:
+            path = self.path(repo_id)
+            cached = read_history(path)
+            if cached is not None and head_sha and cached.head == head_sha:
+                return cached.authors_since(cutoff)
+            history = self._refresh(repo_id, cached, cutoff)
+            write_history(path, history)
+            return history.authors_since(cutoff)
+
+    def _refresh(self, repo_id: str, cached: Optional[CommitHistory], cutoff: float) -> CommitHistory:
+        new: List[tuple] = []
+        head = None
+        reached_cache = False
+        done = False
+        for page in self.pages(repo_id):
+            for commit in page:
+                if head is None:
+                    head = commit["id"]
+                if cached is not None and commit["id"] == cached.head:
+                    reached_cache = done = True
+                    break
+                ts = datetime.fromisoformat(commit["date"].replace("Z", "+00:00")).timestamp()
+                if ts <= cutoff:
+                    done = True
+                    break
+                new.extend((ts, a["user"]) for a in commit.get("authors") or [] if a.get("user"))
+            if done:
+                break
+
+        authors: List[str] = []
+        index: Dict[str, int] = {}
+        dates, author_idx = array("q"), array("I")
+
+        def add(ts: float, author: str) -> None:
+            if ts <= cutoff:
+                return
+            if author not in index:
+                index[author] = len(authors)
+                authors.append(author)
+            dates.append(int(ts))
+            author_idx.append(index[author])
+
+        for ts, author in new:
+            add(ts, author)
+        if reached_cache:
+            for ts, i in zip(cached.dates, cached.author_idx):
+                add(ts, cached.authors[i])
+        return CommitHistory(head or (cached.head if cached else None), authors, dates, author_idx)
+
+
+_cache: Optional[CommitHistoryCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_commit_history_cache() -> CommitHistoryCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = CommitHistoryCache()
+        return _cache
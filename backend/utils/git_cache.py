@@ -0,0 +1,226 @@
+import fcntl
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import git
+
+GIT_CACHE_DIR = os.getenv("GIT_CACHE_DIR", os.path.join(tempfile.gettempdir(), "registry-git-cache"))
+# total size of all mirrors before least recently used ones are deleted
+GIT_CACHE_MAX_BYTES = int(os.getenv("GIT_CACHE_MAX_BYTES", str(2 * 1024 * 1024 * 1024)))
+# a mirror fetched this recently is used as is
+GIT_CACHE_FETCH_INTERVAL_SECONDS = float(os.getenv("GIT_CACHE_FETCH_INTERVAL_SECONDS", "300"))
+
+FETCHED_STAMP = "registry-fetched"
+USED_STAMP = "registry-used"
+
+
+class GitCacheError(Exception):
+    """The repository could not be cloned or checked out."""
+
+
+def canonical_url(url: str) -> str:
+    """
+    https://GitHub.com/org/repo.git/ and https://github.com/org/repo share a mirror.
+    """
+    url = url.strip().rstrip("/")
+    if url.endswith(".git"):
+        url = url[:-4]
+    parsed = urlparse(url)
+    if parsed.scheme and parsed.netloc:
+        url = parsed._replace(netloc=parsed.netloc.lower()).geturl()
+    return url
+
+
+def _dir_size(path: str) -> int:
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            try:
+                total += os.lstat(os.path.join(dirpath, name)).st_size
+            except OSError:
+                continue
+    return total
+
+
+def _touch(path: str) -> None:
+    with open(path, "a"):
+        pass
+    os.utime(path, None)
+
+
+def _mtime(path: str) -> float:
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return 0.0
+
+
+def _prune_worktrees(repo: git.Repo) -> None:
+    """
+    Drop worktree records whose directory is gone (e.g. a worker died
+    mid-checkout), so they neither pin the mirror nor pile up.
+    """
+    try:
+        repo.git.worktree("prune")
+    except git.GitCommandError:
+        pass
+
+
+class GitMirrorCache:
+    """
+    Bare mirrors of remote repositories keyed by URL. A checkout refreshes
+    the mirror with an incremental fetch (at most once per fetch interval)
+    and adds a throwaway worktree at HEAD, so repeated evaluations of the
+    same repository transfer only new objects. Mirrors are partial clones
+    (blob:none): history is kept, file contents are fetched when first
+    checked out. Total mirror size is bounded with LRU eviction.
+    """
+
+    def __init__(self, root: str = GIT_CACHE_DIR, max_bytes: int = GIT_CACHE_MAX_BYTES,
+                 fetch_interval: float = GIT_CACHE_FETCH_INTERVAL_SECONDS) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self.fetch_interval = fetch_interval
+        self.mirrors_dir = os.path.join(root, "mirrors")
+        self.worktrees_dir = os.path.join(root, "worktrees")
+        self.locks_dir = os.path.join(root, "locks")
+        for d in (self.mirrors_dir, self.worktrees_dir, self.locks_dir):
+            os.makedirs(d, exist_ok=True)
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+
+    def mirror_path(self, url: str) -> str:
+        key = hashlib.sha1(canonical_url(url).encode("utf-8")).hexdigest()
+        return os.path.join(self.mirrors_dir, f"{key}.git")
+
+    @contextmanager
+    def _locked(self, mirror: str) -> Iterator[None]:
+        """
+        Serialise work on one mirror across threads and processes.
+        """
+        name = os.path.basename(mirror)
+        with self._lock:
+            key_lock = self._key_locks.setdefault(name, threading.Lock())
+        with key_lock:
+            with open(os.path.join(self.locks_dir, f"{name}.lock"), "w") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _update(self, url: str, mirror: str) -> git.Repo:
+        if not os.path.isdir(mirror):
+            staging = f"{mirror}.{uuid.uuid4().hex}.tmp"
+            try:
+                repo = git.Repo.clone_from(url, staging, bare=True, filter="blob:none")
+                repo.git.config("remote.origin.fetch", "+refs/heads/*:refs/heads/*")
+                repo.close()
+                os.replace(staging, mirror)
+            except Exception as e:
+                shutil.rmtree(staging, ignore_errors=True)
+                raise GitCacheError(f"could not clone {url}: {e}") from e
+            _touch(os.path.join(mirror, FETCHED_STAMP))
+            return git.Repo(mirror)
+
+        repo = git.Repo(mirror)
+        _prune_worktrees(repo)
+        stamp = os.path.join(mirror, FETCHED_STAMP)
+        if time.time() - _mtime(stamp) >= self.fetch_interval:
+            try:
+                repo.git.fetch("origin", "--prune", "--tags")
+                _touch(stamp)
+            except git.GitCommandError:
+                # a stale mirror still beats failing the metric
+                pass
+        return repo
+
+    @contextmanager
+    def checkout(self, url: str) -> Iterator[str]:
+        """
+        Yield a private working tree of the repository's default branch,
+        removed again on exit. Raises GitCacheError if it cannot be created.
+        """
+        mirror = self.mirror_path(url)
+        worktree = os.path.join(self.worktrees_dir, f"{os.path.basename(mirror)[:-4]}-{uuid.uuid4().hex[:12]}")
+        with self._locked(mirror):
+            repo = self._update(url, mirror)
+            try:
+                repo.git.worktree("add", "--detach", worktree, "HEAD")
+            except git.GitCommandError as e:
+                repo.close()
+                shutil.rmtree(worktree, ignore_errors=True)
+                raise GitCacheError(f"could not check out {url}: {e}") from e
+            _touch(os.path.join(mirror, USED_STAMP))
+        try:
+            yield worktree
+        finally:
+            with self._locked(mirror):
+                try:
+                    repo.git.worktree("remove", "--force", worktree)
+                except git.GitCommandError:
+                    shutil.rmtree(worktree, ignore_errors=True)
+                    repo.git.worktree("prune")
+                finally:
+                    repo.close()
+            self.evict()
+
+    def mirrors(self) -> List[Tuple[str, float, int]]:
+        """
+        (path, last used, size in bytes) for every mirror.
+        """
+        out = []
+        for name in os.listdir(self.mirrors_dir):
+            path = os.path.join(self.mirrors_dir, name)
+            if name.endswith(".git") and os.path.isdir(path):
+                out.append((path, _mtime(os.path.join(path, USED_STAMP)), _dir_size(path)))
+        return out
+
+    def evict(self, max_bytes: Optional[int] = None) -> List[str]:
+        """
+        Delete least recently used mirrors until the cache fits max_bytes.
+        Mirrors with a live worktree (in any process) are never deleted.
+        """
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        mirrors = sorted(self.mirrors(), key=lambda m: m[1])
+        total = sum(size for _, _, size in mirrors)
+        evicted = []
+        for path, _, size in mirrors:
+            if total <= limit:
+                break
+            with self._locked(path):
+                try:
+                    with git.Repo(path) as repo:
+                        _prune_worktrees(repo)
+                except (git.InvalidGitRepositoryError, git.NoSuchPathError):
+                    pass
+                live = os.path.join(path, "worktrees")
+                if os.path.isdir(live) and os.listdir(live):
+                    continue
+                shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            evicted.append(path)
+        return evicted
+
+
+_cache: Optional[GitMirrorCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_git_cache() -> GitMirrorCache:
+    """
+    The process-wide clone cache shared by every metric that reads repository contents.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = GitMirrorCache()
+        return _cache
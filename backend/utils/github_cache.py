@@ -0,0 +1,165 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+GITHUB_CACHE_ENABLED = os.getenv("GITHUB_CACHE_ENABLED", "true").strip().lower() in ("1", "true", "yes")
+GITHUB_CACHE_PATH = os.getenv(
+    "GITHUB_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "github_cache.sqlite3"),
+)
+# conditional-request bodies kept (least recently used are dropped first)
+GITHUB_CACHE_MAX_RESPONSES = int(os.getenv("GITHUB_CACHE_MAX_RESPONSES", "20000"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    etag TEXT NOT NULL,
+    body BLOB NOT NULL,
+    link TEXT,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses(last_used);
+CREATE TABLE IF NOT EXISTS pull_requests (
+    repo TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    approved INTEGER NOT NULL,
+    files TEXT NOT NULL,
+    PRIMARY KEY (repo, number)
+);
+CREATE TABLE IF NOT EXISTS repo_sync (
+    repo TEXT PRIMARY KEY,
+    merged TEXT NOT NULL,
+    last_updated TEXT NOT NULL,
+    synced_at REAL NOT NULL
+);
+"""
+
+
+class CachedResponse(NamedTuple):
+    etag: str
+    body: bytes
+    link: Optional[str]
+
+
+class RepoSync(NamedTuple):
+    merged: List[int]  # merged PR numbers, most recently updated first
+    last_updated: str  # newest updated_at seen in the closed-PR listing
+    synced_at: float
+
+
+class GitHubCache:
+    """
+    Persistent GitHub data: ETag-tagged REST responses for conditional
+    requests (a 304 costs no rate limit), the review state and per-file
+    additions of merged PRs, which do not change once merged, and a per-repo
+    high-water mark so only PRs updated since the last sync are listed.
+    """
+
+    def __init__(self, db_path: str = GITHUB_CACHE_PATH, max_responses: int = GITHUB_CACHE_MAX_RESPONSES) -> None:
+        self.db_path = db_path
+        self.max_responses = max_responses
+        self._local = threading.local()
+        self._conn().executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def response_key(token: str, url: str, params: Optional[dict]) -> str:
+        # responses can differ per token (private repos), so tokens get separate entries
+        scope = hashlib.sha1(token.encode("utf-8")).hexdigest()[:12] if token else "anon"
+        query = json.dumps(sorted((params or {}).items()), default=str)
+        return f"{scope} {url} {query}"
+
+    def get_response(self, key: str) -> Optional[CachedResponse]:
+        conn = self._conn()
+        row = conn.execute("SELECT etag, body, link FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+        return CachedResponse(row[0], bytes(row[1]), row[2])
+
+    def put_response(self, key: str, etag: str, body: bytes, link: Optional[str]) -> None:
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN")
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, etag, body, link, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, etag, body, link, time.time()),
+            )
+            count = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            if count > self.max_responses:
+                conn.execute(
+                    "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY last_used LIMIT ?)",
+                    (count - self.max_responses,),
+                )
+
+    def get_pull_requests(self, repo: str, numbers: Iterable[int]) -> Dict[int, Tuple[bool, List[Tuple[str, int]]]]:
+        numbers = list(numbers)
+        found = {}
+        conn = self._conn()
+        for i in range(0, len(numbers), 500):
+            chunk = numbers[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT number, approved, files FROM pull_requests WHERE repo = ? AND number IN ({marks})",
+                (repo, *chunk),
+            ).fetchall()
+            for number, approved, files in rows:
+                found[number] = (bool(approved), [(path, int(added)) for path, added in json.loads(files)])
+        return found
+
+    def put_pull_requests(self, repo: str, prs: Dict[int, Tuple[bool, List[Tuple[str, int]]]]) -> None:
+        if not prs:
+            return
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN")
+            conn.executemany(
+                "INSERT OR REPLACE INTO pull_requests (repo, number, approved, files) VALUES (?, ?, ?, ?)",
+                [(repo, n, int(approved), json.dumps(files)) for n, (approved, files) in prs.items()],
+            )
+
+    def get_sync(self, repo: str) -> Optional[RepoSync]:
+        row = self._conn().execute(
+            "SELECT merged, last_updated, synced_at FROM repo_sync WHERE repo = ?", (repo,)
+        ).fetchone()
+        if row is None:
+            return None
+        return RepoSync(json.loads(row[0]), row[1], row[2])
+
+    def put_sync(self, repo: str, merged: List[int], last_updated: str) -> None:
+        self._conn().execute(
+            "INSERT OR REPLACE INTO repo_sync (repo, merged, last_updated, synced_at) VALUES (?, ?, ?, ?)",
+            (repo, json.dumps(merged), last_updated, time.time()),
+        )
+
+
+_cache: Optional[GitHubCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_github_cache() -> Optional[GitHubCache]:
+    """
+    The process-wide GitHub cache, or None if disabled or unusable.
+    """
+    global _cache
+    if not GITHUB_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            try:
+                _cache = GitHubCache()
+            except (OSError, sqlite3.Error):
+                return None
+        return _cache
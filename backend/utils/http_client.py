@@ -0,0 +1,60 @@
+import os
+import threading
+from typing import Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# number of hosts with a cached connection pool, and connections kept per host
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "16"))
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "32"))
+# applied to every request that does not pass its own timeout
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "30"))
+
+
+class PooledSession(requests.Session):
+    """
+    Session with per-host keep-alive pools sized for concurrent metric
+    threads and a default (connect, read) timeout so no call can hang forever.
+    """
+
+    def __init__(self, pool_connections: int = HTTP_POOL_CONNECTIONS, pool_maxsize: int = HTTP_POOL_MAXSIZE,
+                 timeout: Any = (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)) -> None:
+        super().__init__()
+        self.default_timeout = timeout
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def request(self, method, url, **kwargs):  # type: ignore[override]
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.default_timeout
+        return super().request(method, url, **kwargs)
+
+
+_session: Optional[PooledSession] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> PooledSession:
+    """
+    The process-wide pooled session shared by all outbound HTTP calls.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = PooledSession()
+        return _session
+
+
+def get(url: str, **kwargs: Any) -> requests.Response:
+    return get_session().get(url, **kwargs)
+
+
+def post(url: str, **kwargs: Any) -> requests.Response:
+    return get_session().post(url, **kwargs)
+
+
+def head(url: str, **kwargs: Any) -> requests.Response:
+    return get_session().head(url, **kwargs)
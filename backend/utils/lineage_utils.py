@@ -2,7 +2,7 @@ from typing import Any, Dict, Iterable, List, Tuple, Set, Optional
 import json
 import os
 from urllib.parse import urlparse
-from huggingface_hub import HfApi
+from CustomObjects.HFMetadata import HFMetadata
 from utils.registry_utils import HF_HOSTS
 
 def _hf_repo_id_from_url(url: str) -> str:
@@ -50,7 +50,15 @@ def _load_config_from_local_path(path: str) -> Optional[Dict[str, Any]]:
     except Exception:
         return None
     
-def load_config_for_artifact(artifact: Dict[str, Any]) -> Dict[str, Any]:
+def load_config_for_artifact(
+    artifact: Dict[str, Any],
+    hf_metadata: Optional[HFMetadata] = None,
+    ) -> Dict[str, Any]:
+    """
+    config.json for an artifact: embedded in the entry, at a local path, or
+    from the Hub. Hub reads go through hf_metadata when it is the context
+    for the same repo, so an evaluation downloads config.json only once.
+    """
     metadata = artifact.get("metadata") or {}
     data = artifact.get("data") or {}
 
@@ -72,12 +80,11 @@ def load_config_for_artifact(artifact: Dict[str, Any]) -> Dict[str, Any]:
     url = data.get("url")
     if isinstance(url, str) and url:
         repo_id = _hf_repo_id_from_url(url)
-        if repo_id and HfApi is not None:
+        if repo_id:
+            if hf_metadata is None or hf_metadata.repo_id != repo_id:
+                hf_metadata = HFMetadata(repo_id)
             try:
-                api = HfApi()
-                cfg_path = api.hf_hub_download(repo_id=repo_id, filename="config.json")
-                with open(cfg_path, "r", encoding="utf-8") as f:
-                    cfg = json.load(f)
+                cfg = json.loads(hf_metadata.read_text("config.json"))
                 if isinstance(cfg, dict):
                     return cfg
             except Exception:
@@ -124,6 +131,7 @@ def build_lineage_graph(
     registry: Any,
     root_id: str,
     root_artifact: Dict[str, Any],
+    hf_metadata: Optional[HFMetadata] = None,
     ) -> Dict[str, Any]:
 
     id_to_model: Dict[str, Dict[str, Any]] = {}
@@ -152,7 +160,7 @@ def build_lineage_graph(
     edge_set: Set[Tuple[str, str, str]] = set()
 
     for cur_id, cur_art in id_to_model.items():
-        cfg = load_config_for_artifact(cur_art)
+        cfg = load_config_for_artifact(cur_art, hf_metadata if cur_id == root_id else None)
         cfg_strings = _collect_strings(cfg) if isinstance(cfg, dict) else set()
         has_config[cur_id] = bool(cfg_strings)
 
@@ -201,7 +209,7 @@ def build_lineage_graph(
         component = {root_id}
         id_to_model[root_id] = root_artifact
         has_config[root_id] = bool(
-            _collect_strings(load_config_for_artifact(root_artifact) or {})
+            _collect_strings(load_config_for_artifact(root_artifact, hf_metadata) or {})
         )
 
     nodes: List[Dict[str, Any]] = []
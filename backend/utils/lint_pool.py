@@ -0,0 +1,235 @@
+import hashlib
+import multiprocessing
+import os
+import sqlite3
+import sys
+import threading
+import time
+from functools import lru_cache
+from multiprocessing.pool import Pool
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import flake8
+from flake8.api import legacy
+from flake8.discover_files import expand_paths
+
+from utils.loc_counter import VENDORED_DIRS
+
+LINT_POOL_SIZE = int(os.getenv("LINT_POOL_SIZE", str(min(4, os.cpu_count() or 1))))
+# files handed to a worker per task
+LINT_SHARD_FILES = int(os.getenv("LINT_SHARD_FILES", "32"))
+LINT_CACHE_PATH = os.getenv(
+    "LINT_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "lint_cache.sqlite3"),
+)
+LINT_CACHE_MAX_ENTRIES = int(os.getenv("LINT_CACHE_MAX_ENTRIES", "500000"))
+
+# options that change which errors flake8 reports for a given file
+RESULT_OPTIONS = (
+    "select", "extend_select", "ignore", "extend_ignore", "extended_default_ignore",
+    "extended_default_select", "per_file_ignores", "max_line_length", "max_doc_length",
+    "max_complexity", "indent_size", "hang_closing", "builtins", "doctests",
+    "disable_noqa", "enable_extensions",
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS lint_results (
+    config TEXT NOT NULL,
+    blob TEXT NOT NULL,
+    errors INTEGER NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (config, blob)
+);
+CREATE INDEX IF NOT EXISTS idx_lint_results_last_used ON lint_results(last_used);
+"""
+
+_pool: Optional[Pool] = None
+_pool_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _style_guide():
+    return legacy.get_style_guide(quiet=2)
+
+
+@lru_cache(maxsize=1)
+def config_key() -> str:
+    """
+    Fingerprint of the flake8 version, plugins and result-affecting options;
+    cached results are only reused under the same fingerprint.
+    """
+    style = _style_guide()
+    options = style.options
+    parts = [flake8.__version__, style._application.plugins.versions_str()]
+    parts += [f"{name}={getattr(options, name, None)!r}" for name in RESULT_OPTIONS]
+    return hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def blob_hash(data: bytes) -> str:
+    """
+    Git blob id of the content, so files are keyed the way the repository keys them.
+    """
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def list_python_files(root: str) -> List[str]:
+    """
+    The files `flake8 root` would check, using flake8's own discovery rules,
+    minus the vendored directories the line count skips as well.
+    """
+    options = _style_guide().options
+    return list(expand_paths(
+        paths=[root],
+        stdin_display_name=options.stdin_display_name,
+        filename_patterns=options.filename,
+        exclude=(*options.exclude, *options.extend_exclude, *VENDORED_DIRS, "*.egg"),
+    ))
+
+
+def _init_worker() -> None:
+    # workers are single-purpose processes, so silencing them is safe
+    sys.stdout = open(os.devnull, "w")
+
+
+def _lint_shard(paths: Sequence[str]) -> List[int]:
+    """
+    Worker side: flake8 error count for each file.
+    """
+    style = _style_guide()
+    return [int(style.check_files([p]).total_errors or 0) for p in paths]
+
+
+class LintCache:
+    """
+    flake8 error counts per file content (git blob id) and configuration,
+    on disk so they survive restarts and are shared with the CLI.
+    """
+
+    def __init__(self, db_path: str = LINT_CACHE_PATH, max_entries: int = LINT_CACHE_MAX_ENTRIES) -> None:
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._conn().executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get_many(self, config: str, blobs: Iterable[str]) -> Dict[str, int]:
+        blobs = list(blobs)
+        conn = self._conn()
+        found: Dict[str, int] = {}
+        # stay under SQLite's bound-parameter limit
+        for i in range(0, len(blobs), 500):
+            chunk = blobs[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT blob, errors FROM lint_results WHERE config = ? AND blob IN ({marks})", (config, *chunk)
+            ).fetchall()
+            found.update(rows)
+        if found:
+            now = time.time()
+            conn.executemany(
+                "UPDATE lint_results SET last_used = ? WHERE config = ? AND blob = ?",
+                [(now, config, b) for b in found],
+            )
+        return found
+
+    def put_many(self, config: str, results: Dict[str, int]) -> None:
+        now = time.time()
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN")
+            conn.executemany(
+                "INSERT OR REPLACE INTO lint_results (config, blob, errors, last_used) VALUES (?, ?, ?, ?)",
+                [(config, b, n, now) for b, n in results.items()],
+            )
+            count = conn.execute("SELECT COUNT(*) FROM lint_results").fetchone()[0]
+            if count > self.max_entries:
+                conn.execute(
+                    "DELETE FROM lint_results WHERE rowid IN "
+                    "(SELECT rowid FROM lint_results ORDER BY last_used LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+
+
+_cache: Optional[LintCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_lint_cache() -> Optional[LintCache]:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            try:
+                _cache = LintCache()
+            except (OSError, sqlite3.Error):
+                return None
+        return _cache
+
+
+def _get_pool() -> Pool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: forking a threaded server process is not safe
+            _pool = multiprocessing.get_context("spawn").Pool(
+                processes=max(1, LINT_POOL_SIZE), initializer=_init_worker
+            )
+        return _pool
+
+
+def shutdown_lint_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.terminate()
+
+
+def _lint_uncached(paths: List[str]) -> List[int]:
+    if len(paths) <= 1:
+        return _lint_shard(paths)
+    size = max(1, LINT_SHARD_FILES)
+    shards = [paths[i:i + size] for i in range(0, len(paths), size)]
+    counts: List[int] = []
+    for shard_counts in _get_pool().map(_lint_shard, shards):
+        counts.extend(shard_counts)
+    return counts
+
+
+def lint_files(paths: Sequence[str], cache: Optional[LintCache] = None) -> Dict[str, int]:
+    """
+    flake8 error count per file. Files whose content was linted before (in
+    this or any earlier evaluation) come from the cache; the rest are
+    sharded across the lint process pool. Summing the values gives the same
+    total_errors as one flake8 run over the files.
+    """
+    cache = cache if cache is not None else get_lint_cache()
+    config = config_key()
+    blobs: Dict[str, Optional[str]] = {}
+    for p in paths:
+        try:
+            with open(p, "rb") as f:
+                blobs[p] = blob_hash(f.read())
+        except OSError:
+            blobs[p] = None  # let flake8 report it
+
+    known = cache.get_many(config, {b for b in blobs.values() if b}) if cache else {}
+    # lint each distinct content once
+    todo: Dict[str, str] = {}
+    for p, b in blobs.items():
+        key = b or p
+        if key not in known and key not in todo:
+            todo[key] = p
+    if todo:
+        linted = dict(zip(todo, _lint_uncached(list(todo.values()))))
+        if cache:
+            cache.put_many(config, {key: n for key, n in linted.items() if blobs[todo[key]] == key})
+        known = {**known, **linted}
+    return {p: known[b or p] for p, b in blobs.items()}
@@ -0,0 +1,144 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").strip().lower() in ("1", "true", "yes")
+LLM_CACHE_PATH = os.getenv(
+    "LLM_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "llm_cache.sqlite3"),
+)
+LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    model TEXT NOT NULL,
+    prompt_hash TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (model, prompt_hash)
+);
+CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses(last_used);
+"""
+
+
+def prompt_hash(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    On-disk cache of LLM completions keyed by (model, sha256(prompt)), shared
+    by every process that points at the same file (server workers and the
+    CLI alike). Entries expire after ttl seconds; once the cache grows past
+    max_bytes the least recently used entries are evicted.
+    """
+
+    def __init__(self, db_path: str = LLM_CACHE_PATH, ttl: float = LLM_CACHE_TTL_SECONDS,
+                 max_bytes: int = LLM_CACHE_MAX_BYTES) -> None:
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0}
+        dirpath = os.path.dirname(os.path.abspath(db_path))
+        if dirpath:
+            os.makedirs(dirpath, exist_ok=True)
+        self._conn().executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, name: str, n: int = 1) -> None:
+        with self._stats_lock:
+            self._stats[name] += n
+
+    def get(self, model: str, prompt: str) -> Optional[str]:
+        key = (model, prompt_hash(prompt))
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT response, created_at FROM responses WHERE model = ? AND prompt_hash = ?", key
+        ).fetchone()
+        now = time.time()
+        if row is None:
+            self._count("misses")
+            return None
+        if now - row[1] > self.ttl:
+            conn.execute("DELETE FROM responses WHERE model = ? AND prompt_hash = ?", key)
+            self._count("expired")
+            self._count("misses")
+            return None
+        conn.execute(
+            "UPDATE responses SET last_used = ? WHERE model = ? AND prompt_hash = ?", (now, *key)
+        )
+        self._count("hits")
+        return row[0]
+
+    def put(self, model: str, prompt: str, response: str) -> None:
+        now = time.time()
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (model, prompt_hash, response, size, created_at, last_used) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (model, prompt_hash(prompt), response, len(response.encode("utf-8")), now, now),
+        )
+        self._evict()
+
+    def _evict(self) -> None:
+        conn = self._conn()
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl,))
+            rows = conn.execute("SELECT model, prompt_hash, size FROM responses ORDER BY last_used").fetchall()
+            total = sum(r[2] for r in rows)
+            evicted = 0
+            # evict down to 90% so we do not evict again on the very next put
+            for model, key, size in rows:
+                if total <= self.max_bytes * 0.9:
+                    break
+                conn.execute("DELETE FROM responses WHERE model = ? AND prompt_hash = ?", (model, key))
+                total -= size
+                evicted += 1
+        self._count("evictions", evicted)
+
+    def stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            out = dict(self._stats)
+        row = self._conn().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        out["entries"], out["bytes"] = row[0], row[1]
+        return out
+
+
+_cache: Optional[LLMResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """
+    The process-wide LLM response cache, or None if disabled or unusable.
+    """
+    global _cache
+    if not LLM_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            try:
+                _cache = LLMResponseCache()
+            except (OSError, sqlite3.Error):
+                return None
+        return _cache
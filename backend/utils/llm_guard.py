@@ -0,0 +1,155 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+# prompts in flight at once across every request and rating job
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+# a duplicate request is sent once the first has run longer than the observed p95
+LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "true").strip().lower() in ("1", "true", "yes")
+LLM_HEDGE_MIN_SECONDS = float(os.getenv("LLM_HEDGE_MIN_SECONDS", "2"))
+# consecutive failures that open the breaker, and how long it stays open
+LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+LLM_BREAKER_COOLDOWN_SECONDS = float(os.getenv("LLM_BREAKER_COOLDOWN_SECONDS", "30"))
+
+# p95 is only trusted after this many samples
+MIN_LATENCY_SAMPLES = 20
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+
+class LatencyTracker:
+    """
+    Rolling window of successful call latencies.
+    """
+
+    def __init__(self, window: int = 200) -> None:
+        self._lock = threading.Lock()
+        self._samples: deque = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def p95(self) -> Optional[float]:
+        with self._lock:
+            if len(self._samples) < MIN_LATENCY_SAMPLES:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def hedge_delay(self) -> Optional[float]:
+        """
+        Seconds to wait before hedging, or None until enough calls were seen.
+        """
+        p95 = self.p95()
+        if p95 is None:
+            return None
+        return max(p95, LLM_HEDGE_MIN_SECONDS)
+
+
+class CircuitBreaker:
+    """
+    Opens after `failures` consecutive failures and rejects calls for
+    `cooldown` seconds; then lets a single trial call through (half-open),
+    which closes the breaker on success or re-opens it on failure.
+    """
+
+    def __init__(self, failures: int = LLM_BREAKER_FAILURES, cooldown: float = LLM_BREAKER_COOLDOWN_SECONDS) -> None:
+        self.failures = failures
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._state = BREAKER_CLOSED
+        self._consecutive = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == BREAKER_OPEN and time.monotonic() - self._opened_at >= self.cooldown:
+                return BREAKER_HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == BREAKER_CLOSED:
+                return True
+            if self._state == BREAKER_OPEN:
+                if time.monotonic() - self._opened_at < self.cooldown:
+                    return False
+                self._state = BREAKER_HALF_OPEN
+                self._trial_in_flight = False
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = BREAKER_CLOSED
+            self._consecutive = 0
+            self._trial_in_flight = False
+
+    def cancel(self) -> None:
+        """
+        An allowed call never reached the endpoint; free the half-open trial.
+        """
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._consecutive += 1
+            if self._state == BREAKER_HALF_OPEN or self._consecutive >= self.failures:
+                self._state = BREAKER_OPEN
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+class EndpointGuard:
+    """
+    Health state kept per LLM endpoint.
+    """
+
+    def __init__(self) -> None:
+        self.breaker = CircuitBreaker()
+        self.latency = LatencyTracker()
+
+
+_guards: Dict[str, EndpointGuard] = {}
+_semaphore = threading.BoundedSemaphore(max(1, LLM_MAX_CONCURRENCY))
+_executor: Optional[ThreadPoolExecutor] = None
+_lock = threading.Lock()
+
+
+def get_endpoint_guard(endpoint: str) -> EndpointGuard:
+    with _lock:
+        guard = _guards.get(endpoint)
+        if guard is None:
+            guard = EndpointGuard()
+            _guards[endpoint] = guard
+        return guard
+
+
+def get_llm_semaphore() -> threading.BoundedSemaphore:
+    """
+    Process-wide cap on LLM requests in flight, hedges included.
+    """
+    return _semaphore
+
+
+def get_llm_executor() -> ThreadPoolExecutor:
+    """
+    Threads that carry the HTTP calls so the caller can stop waiting at its
+    deadline. Twice the concurrency cap leaves room for hedged attempts.
+    """
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=2 * max(1, LLM_MAX_CONCURRENCY), thread_name_prefix="llm")
+        return _executor
@@ -0,0 +1,147 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+# worker threads shared by every metric evaluation in the process
+METRIC_EXECUTOR_WORKERS = int(os.getenv("METRIC_EXECUTOR_WORKERS", "16"))
+# recent task waits kept for the wait-time metrics
+WAIT_SAMPLES = 1000
+
+
+class _Batch:
+    """
+    The metric calls of one evaluation, queued together so workers can
+    take turns between evaluations.
+    """
+
+    def __init__(self, calls: Sequence[Callable[[], Any]]) -> None:
+        now = time.monotonic()
+        self.futures: List[Future] = [Future() for _ in calls]
+        self.pending: Deque[Tuple[Callable[[], Any], Future, float]] = deque(
+            (call, future, now) for call, future in zip(calls, self.futures)
+        )
+
+
+class MetricExecutor:
+    """
+    Bounded, process-wide pool for metric work. Each run_all call is one
+    batch; idle workers take the next task from the batches in turn, so a
+    large evaluation cannot starve the ones queued behind it. The caller
+    runs tasks of its own batch while it waits, which keeps nested
+    evaluations (treescore rating parent models) from deadlocking on a
+    pool whose workers are all busy waiting for them.
+    """
+
+    def __init__(self, workers: int = METRIC_EXECUTOR_WORKERS) -> None:
+        self.workers = max(1, workers)
+        self._cond = threading.Condition()
+        self._batches: Deque[_Batch] = deque()
+        self._threads: List[threading.Thread] = []
+        self._idle = 0
+        self._running = 0
+        self._completed = 0
+        self._waits: Deque[float] = deque(maxlen=WAIT_SAMPLES)
+
+    def run_all(self, calls: Sequence[Callable[[], Any]]) -> List[Any]:
+        """
+        Run the calls concurrently and return their results in order,
+        raising the first exception in call order.
+        """
+        if not calls:
+            return []
+        batch = _Batch(calls)
+        with self._cond:
+            self._batches.append(batch)
+            # the caller takes one task itself; wake or start workers for the rest
+            wanted = len(calls) - 1
+            woken = min(wanted, self._idle)
+            self._cond.notify(woken)
+            wanted -= woken
+            while wanted > 0 and len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._worker, name=f"metric-worker-{len(self._threads)}", daemon=True)
+                self._threads.append(thread)
+                thread.start()
+                wanted -= 1
+
+        while True:
+            with self._cond:
+                task = self._take(batch)
+            if task is None:
+                break
+            self._run(task)
+
+        return [future.result() for future in batch.futures]
+
+    def _take(self, batch: Optional[_Batch] = None) -> Optional[Tuple[Callable[[], Any], Future, float]]:
+        """
+        Next task, from the given batch or round-robin over all of them. Caller holds the lock.
+        """
+        if batch is None:
+            if not self._batches:
+                return None
+            batch = self._batches.popleft()
+            task = batch.pending.popleft()
+            if batch.pending:
+                self._batches.append(batch)
+        else:
+            if not batch.pending:
+                return None
+            task = batch.pending.popleft()
+            if not batch.pending:
+                self._batches.remove(batch)
+        self._waits.append(time.monotonic() - task[2])
+        self._running += 1
+        return task
+
+    def _run(self, task: Tuple[Callable[[], Any], Future, float]) -> None:
+        call, future, _ = task
+        try:
+            future.set_result(call())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._cond:
+                self._running -= 1
+                self._completed += 1
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                while not self._batches:
+                    self._idle += 1
+                    self._cond.wait()
+                    self._idle -= 1
+                task = self._take()
+            if task is not None:
+                self._run(task)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            waits = sorted(self._waits)
+            out = {
+                "workers": self.workers,
+                "threads": len(self._threads),
+                "queue_depth": sum(len(b.pending) for b in self._batches),
+                "queued_evaluations": len(self._batches),
+                "running": self._running,
+                "completed": self._completed,
+            }
+        out["wait_ms_avg"] = round(1000 * sum(waits) / len(waits), 3) if waits else 0.0
+        out["wait_ms_p95"] = round(1000 * waits[int(0.95 * (len(waits) - 1))], 3) if waits else 0.0
+        out["wait_ms_max"] = round(1000 * waits[-1], 3) if waits else 0.0
+        return out
+
+
+_executor: Optional[MetricExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_metric_executor() -> MetricExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = MetricExecutor()
+        return _executor
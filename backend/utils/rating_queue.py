@@ -0,0 +1,137 @@
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, Optional
+
+RATING_WORKERS = int(os.getenv("RATING_WORKERS", "2"))
+# jobs waiting for a worker beyond this are refused instead of queued
+RATING_QUEUE_MAX = int(os.getenv("RATING_QUEUE_MAX", "32"))
+# finished jobs kept around for the status endpoint
+RATING_JOB_HISTORY = int(os.getenv("RATING_JOB_HISTORY", "1000"))
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+
+class RatingQueueFull(Exception):
+    pass
+
+
+class RatingJob:
+    def __init__(self, job_id: str, artifact_id: str) -> None:
+        self.job_id = job_id
+        self.artifact_id = artifact_id
+        self.status = JOB_QUEUED
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.future: Optional[Future] = None
+
+    def done(self) -> bool:
+        return self.status in (JOB_SUCCEEDED, JOB_FAILED)
+
+    def wait(self, timeout: Optional[float]) -> bool:
+        """
+        Block up to timeout seconds for the job to finish; True if it did.
+        """
+        if self.future is None:
+            return self.done()
+        try:
+            self.future.exception(timeout=timeout)
+        except FutureTimeout:
+            return False
+        except Exception:
+            pass
+        return self.done()
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = {
+            "job_id": self.job_id,
+            "artifact_id": self.artifact_id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+        if self.status == JOB_SUCCEEDED:
+            out["result"] = self.result
+        if self.status == JOB_FAILED:
+            out["error"] = self.error
+        return out
+
+
+class RatingQueue:
+    """
+    In-process queue of rating jobs run by a bounded pool of worker threads.
+    A second request to rate an artifact that is already queued or running
+    gets the existing job back instead of starting another computation.
+    """
+
+    def __init__(self, workers: int = RATING_WORKERS, max_pending: int = RATING_QUEUE_MAX,
+                 history: int = RATING_JOB_HISTORY) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="rating")
+        self._max_pending = max_pending
+        self._history = history
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, RatingJob]" = OrderedDict()
+        self._active: Dict[str, RatingJob] = {}
+
+    def submit(self, artifact_id: str, fn: Callable[[], Any]) -> RatingJob:
+        with self._lock:
+            active = self._active.get(artifact_id)
+            if active is not None:
+                return active
+            pending = sum(1 for job in self._active.values() if job.status == JOB_QUEUED)
+            if pending >= self._max_pending:
+                raise RatingQueueFull("Rating queue is full, try again later")
+            job = RatingJob(uuid.uuid4().hex, artifact_id)
+            self._jobs[job.job_id] = job
+            self._active[artifact_id] = job
+            self._prune_locked()
+            job.future = self._executor.submit(self._run, job, fn)
+            return job
+
+    def _run(self, job: RatingJob, fn: Callable[[], Any]) -> None:
+        job.status = JOB_RUNNING
+        try:
+            job.result = fn()
+            job.status = JOB_SUCCEEDED
+        except Exception as e:
+            job.error = str(e)
+            job.status = JOB_FAILED
+        finally:
+            job.finished_at = time.time()
+            with self._lock:
+                if self._active.get(job.artifact_id) is job:
+                    del self._active[job.artifact_id]
+
+    def _prune_locked(self) -> None:
+        finished = [jid for jid, job in self._jobs.items() if job.done()]
+        for jid in finished[:max(0, len(self._jobs) - self._history)]:
+            del self._jobs[jid]
+
+    def get(self, job_id: str) -> Optional[RatingJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            queued = sum(1 for job in self._active.values() if job.status == JOB_QUEUED)
+            return {"queued": queued, "running": len(self._active) - queued, "tracked": len(self._jobs)}
+
+
+_queue: Optional[RatingQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_rating_queue() -> RatingQueue:
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = RatingQueue()
+        return _queue
@@ -0,0 +1,227 @@
+import multiprocessing
+import os
+import re
+import threading
+import time
+from functools import lru_cache
+from multiprocessing.connection import Connection, wait
+from typing import Dict, List, Optional, Set, Tuple
+
+from utils.blob_store import read_blob_file
+
+# worker processes shared by all searches; each search checks out its own
+REGEX_POOL_SIZE = int(os.getenv("REGEX_POOL_SIZE", str(max(2, min(4, os.cpu_count() or 1)))))
+# workers one search may hold, so a runaway pattern leaves the rest to other requests
+REGEX_SEARCH_WORKERS = int(os.getenv("REGEX_SEARCH_WORKERS", str(max(1, REGEX_POOL_SIZE // 2))))
+REGEX_TIMEOUT_SECONDS = float(os.getenv("REGEX_TIMEOUT_SECONDS", "5"))
+# upper bound on text handed to one worker task; large scans are split
+# so every worker gets a share and finished chunks survive a timeout
+REGEX_CHUNK_BYTES = int(os.getenv("REGEX_CHUNK_BYTES", str(1024 * 1024)))
+MIN_CHUNK_BYTES = 64 * 1024
+
+# (artifact id, name, README text, or path of a local README blob to map)
+SearchDoc = Tuple[str, str, str, Optional[str]]
+
+
+@lru_cache(maxsize=64)
+def _compile(pattern: str, flags: int):
+    return re.compile(pattern, flags)
+
+
+def _match_chunk(pattern: str, flags: int, docs: List[SearchDoc]) -> List[str]:
+    """
+    Worker side: ids of docs whose name or README matches.
+    """
+    compiled = _compile(pattern, flags)
+    matched = []
+    for aid, name, readme, readme_path in docs:
+        if compiled.search(name):
+            matched.append(aid)
+            continue
+        if readme_path:
+            try:
+                readme = read_blob_file(readme_path)
+            except OSError:
+                readme = ""
+        if readme and compiled.search(readme):
+            matched.append(aid)
+    return matched
+
+
+def _serve(conn: Connection) -> None:
+    """
+    Worker process loop: match one chunk per message until the pipe closes.
+    """
+    while True:
+        try:
+            pattern, flags, docs = conn.recv()
+        except (EOFError, OSError):
+            return
+        try:
+            conn.send(_match_chunk(pattern, flags, docs))
+        except Exception:
+            conn.send([])
+
+
+class _Worker:
+    """
+    One regex worker process, used by a single search at a time so a
+    timeout can kill it without touching anybody else's work.
+    """
+
+    def __init__(self) -> None:
+        # spawn: forking a threaded server process is not safe
+        ctx = multiprocessing.get_context("spawn")
+        self.conn, child = ctx.Pipe()
+        self.process = ctx.Process(target=_serve, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+_idle: List[_Worker] = []
+# live workers, idle or checked out; at most REGEX_POOL_SIZE
+_workers_total = 0
+_workers_cond = threading.Condition()
+
+
+def _checkout(wanted: int, deadline: float) -> List[_Worker]:
+    """
+    Up to wanted workers for one search: idle ones first, then new ones
+    while under REGEX_POOL_SIZE. Waits for a worker until the deadline
+    when all are busy; returns [] if none became free in time.
+    """
+    global _workers_total
+    with _workers_cond:
+        while not _idle and _workers_total >= REGEX_POOL_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return []
+            _workers_cond.wait(remaining)
+        workers = [_idle.pop() for _ in range(min(wanted, len(_idle)))]
+        spawn = min(wanted - len(workers), REGEX_POOL_SIZE - _workers_total)
+        _workers_total += spawn
+    for i in range(spawn):
+        try:
+            workers.append(_Worker())
+        except OSError:
+            with _workers_cond:
+                _workers_total -= spawn - i
+                _workers_cond.notify_all()
+            break
+    return workers
+
+
+def _checkin(healthy: List[_Worker], stuck: List[_Worker]) -> None:
+    """
+    Return a search's workers: healthy ones to the idle list, stuck ones
+    (still running a timed-out chunk, or dead) are killed and replaced
+    on demand.
+    """
+    global _workers_total
+    for worker in stuck:
+        worker.kill()
+    with _workers_cond:
+        _idle.extend(healthy)
+        _workers_total -= len(stuck)
+        _workers_cond.notify_all()
+
+
+def shutdown_regex_pool() -> None:
+    """
+    Kill the idle workers; workers in use are returned and reused as usual.
+    """
+    global _workers_total
+    with _workers_cond:
+        idle = list(_idle)
+        _idle.clear()
+        _workers_total -= len(idle)
+        _workers_cond.notify_all()
+    for worker in idle:
+        worker.kill()
+
+
+def _doc_size(doc: SearchDoc) -> int:
+    size = len(doc[1]) + len(doc[2])
+    if doc[3]:
+        try:
+            size += os.path.getsize(doc[3])
+        except OSError:
+            pass
+    return size
+
+
+def _partition(docs: List[SearchDoc], workers: int) -> List[List[SearchDoc]]:
+    sizes = [_doc_size(doc) for doc in docs]
+    total = sum(sizes)
+    target = max(MIN_CHUNK_BYTES, min(REGEX_CHUNK_BYTES, total // max(1, workers) + 1))
+    chunks: List[List[SearchDoc]] = []
+    current: List[SearchDoc] = []
+    size = 0
+    for doc, doc_size in zip(docs, sizes):
+        current.append(doc)
+        size += doc_size
+        if size >= target:
+            chunks.append(current)
+            current, size = [], 0
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def run_regex_search(pattern: str, flags: int, docs: List[SearchDoc],
+                     timeout: Optional[float] = None) -> Tuple[Set[str], bool]:
+    """
+    Evaluate pattern against docs in the worker pool within timeout seconds.
+    Returns (matching ids, complete); complete is False when the deadline
+    cut the search short, in which case the ids are a partial result.
+    """
+    if not docs:
+        return set(), True
+    timeout = REGEX_TIMEOUT_SECONDS if timeout is None else timeout
+    deadline = time.monotonic() + timeout
+
+    chunks = _partition(docs, REGEX_SEARCH_WORKERS)
+    workers = _checkout(min(len(chunks), max(1, REGEX_SEARCH_WORKERS)), deadline)
+    if not workers:
+        return set(), False
+
+    matched: Set[str] = set()
+    busy: Dict[Connection, _Worker] = {}
+    healthy: List[_Worker] = []
+    stuck: List[_Worker] = []
+
+    def assign(worker: _Worker) -> None:
+        if not chunks:
+            healthy.append(worker)
+            return
+        try:
+            worker.conn.send((pattern, flags, chunks.pop(0)))
+            busy[worker.conn] = worker
+        except (OSError, ValueError):
+            stuck.append(worker)
+
+    for worker in workers:
+        assign(worker)
+    while busy:
+        ready = wait(list(busy), timeout=max(0.0, deadline - time.monotonic()))
+        if not ready:
+            break
+        for conn in ready:
+            worker = busy.pop(conn)
+            try:
+                matched.update(conn.recv())
+            except (EOFError, OSError):
+                stuck.append(worker)
+                continue
+            assign(worker)
+
+    # only this search's workers still on a chunk are killed
+    stuck.extend(busy.values())
+    complete = not stuck and not chunks
+    _checkin(healthy, stuck)
+    return matched, complete
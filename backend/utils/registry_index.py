@@ -0,0 +1,103 @@
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from utils.sqlite_registry import normalize_name
+
+# (name or "*", set of allowed types or None for any type)
+ArtifactQuery = Tuple[str, Optional[Set[str]]]
+
+
+def _summary(entry: Any) -> Tuple[str, str, Optional[str]]:
+    if not isinstance(entry, dict):
+        return "", "", None
+    meta = entry.get("metadata") or {
+        "name": entry.get("name"),
+        "type": entry.get("type"),
+    }
+    data = entry.get("data") or {}
+    url = data.get("url") if isinstance(data, dict) else None
+    return (
+        normalize_name(meta.get("name")),
+        str(meta.get("type") or "").strip().lower(),
+        url if isinstance(url, str) else None,
+    )
+
+
+class RegistryIndex:
+    """
+    Secondary indexes over a registry keyed by normalized name, type and
+    url, so exact-name and type-filtered lookups are hash lookups instead
+    of full scans. Ids keep their registry order via a sequence number.
+    """
+
+    def __init__(self) -> None:
+        self.by_name: Dict[str, Set[str]] = {}
+        self.by_type: Dict[str, Set[str]] = {}
+        self.by_url: Dict[str, Set[str]] = {}
+        self._rows: Dict[str, Tuple[int, str, str, Optional[str]]] = {}
+        self._seq = 0
+
+    @classmethod
+    def build(cls, items: Iterable[Tuple[str, Any]]) -> "RegistryIndex":
+        index = cls()
+        for aid, entry in items:
+            index.add(aid, entry)
+        return index
+
+    def add(self, artifact_id: str, entry: Any) -> None:
+        aid = str(artifact_id)
+        seq = self._rows[aid][0] if aid in self._rows else None
+        self.remove(aid)
+        if seq is None:
+            seq = self._seq
+            self._seq += 1
+        name, artifact_type, url = _summary(entry)
+        self._rows[aid] = (seq, name, artifact_type, url)
+        self.by_name.setdefault(name, set()).add(aid)
+        self.by_type.setdefault(artifact_type, set()).add(aid)
+        if url is not None:
+            self.by_url.setdefault(url, set()).add(aid)
+
+    def remove(self, artifact_id: str) -> None:
+        row = self._rows.pop(str(artifact_id), None)
+        if row is None:
+            return
+        _, name, artifact_type, url = row
+        for table, key in ((self.by_name, name), (self.by_type, artifact_type), (self.by_url, url)):
+            ids = table.get(key)
+            if ids is not None:
+                ids.discard(str(artifact_id))
+                if not ids:
+                    del table[key]
+
+    def _ordered(self, ids: Iterable[str]) -> List[str]:
+        return sorted(ids, key=lambda aid: self._rows[aid][0])
+
+    def ids_by_name(self, name: str) -> List[str]:
+        return self._ordered(self.by_name.get(normalize_name(name), ()))
+
+    def ids_by_type(self, artifact_type: str) -> List[str]:
+        return self._ordered(self.by_type.get(str(artifact_type).strip().lower(), ()))
+
+    def id_by_url(self, url: str) -> Optional[str]:
+        ids = self._ordered(self.by_url.get(url, ()))
+        return ids[0] if ids else None
+
+    def query(self, queries: List[ArtifactQuery]) -> List[str]:
+        """
+        Ids matching any of the (name, types) queries, in registry order.
+        Costs O(Q + results) rather than O(N * Q).
+        """
+        matched: Set[str] = set()
+        for name, types in queries:
+            if name == "*":
+                if types is None:
+                    return self._ordered(self._rows)
+                for t in types:
+                    matched.update(self.by_type.get(t, ()))
+                continue
+            ids = self.by_name.get(normalize_name(name), ())
+            if types is None:
+                matched.update(ids)
+            else:
+                matched.update(aid for aid in ids if self._rows[aid][2] in types)
+        return self._ordered(matched)
@@ -0,0 +1,368 @@
+import copy
+import fcntl
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from utils.registry_index import RegistryIndex, ArtifactQuery
+
+JOURNAL_OPS = ("create", "update_data", "update_metadata", "set_rating", "delete")
+
+
+def _file_validator(path: str):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def read_records(path: str, offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Journal records in path from offset, and the offset after the last
+    complete line. A torn trailing line (crash mid-append) is left for the
+    next read.
+    """
+    try:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            chunk = f.read()
+    except OSError:
+        return [], offset
+    end = chunk.rfind(b"\n") + 1
+    records = []
+    for line in chunk[:end].splitlines():
+        if not line.strip():
+            continue
+        try:
+            records.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    return records, offset + end
+
+
+def apply_record(state: Dict[str, Any], record: Dict[str, Any]) -> None:
+    """
+    Apply one journal record to the in-memory registry. Every op sets a
+    key or field outright, so replaying a record twice is harmless.
+    """
+    op = record.get("op")
+    aid = str(record.get("id") or "")
+    if not aid:
+        return
+    if op == "create":
+        state[aid] = record.get("entry") or {}
+    elif op == "delete":
+        state.pop(aid, None)
+    elif op == "update_data":
+        if aid in state:
+            state[aid] = {**state[aid], "data": record.get("data")}
+    elif op == "update_metadata":
+        if aid in state:
+            state[aid] = {**state[aid], "metadata": record.get("metadata")}
+    elif op == "set_rating":
+        if aid in state:
+            state[aid] = {**state[aid], "rating": record.get("rating")}
+
+
+class JournaledRegistry:
+    """
+    Registry kept as a compacted JSON snapshot plus an append-only log of
+    mutations. Writes append one small record; the snapshot is rewritten in
+    a background thread once the log passes compact_threshold bytes.
+
+    Several processes may share the files: appends, rotation and the final
+    swap of a compacted snapshot hold an exclusive flock on a lock file
+    next to the snapshot, and reads hold it shared, so no process sees the
+    rotated journal removed before the snapshot that replaces it. A running
+    compaction also holds a second lock, so a rotated journal left behind by
+    a process that died mid-compaction can be told apart and folded in.
+    """
+
+    def __init__(self, snapshot_path: str, compact_threshold: int = 1024 * 1024) -> None:
+        self.snapshot_path = snapshot_path
+        self.journal_path = snapshot_path + ".journal"
+        self.rotated_path = snapshot_path + ".journal.compacting"
+        self.lock_path = snapshot_path + ".lock"
+        self.compact_lock_path = snapshot_path + ".compact.lock"
+        self.compact_threshold = compact_threshold
+
+        self._lock = threading.RLock()
+        self._state: Dict[str, Any] = {}
+        self._index = RegistryIndex()
+        self._snapshot_validator = None
+        self._journal_ino = None
+        self._journal_offset = 0
+        self._compactor: Optional[threading.Thread] = None
+        self._loaded = False
+
+        dirpath = os.path.dirname(os.path.abspath(snapshot_path))
+        if dirpath:
+            os.makedirs(dirpath, exist_ok=True)
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool) -> Iterator[None]:
+        """
+        Cross-process lock on the registry files. Take self._lock first;
+        flock is per open file, so it must not be nested within a process.
+        """
+        with open(self.lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    # loading / replay
+
+    def _read_snapshot(self) -> Dict[str, Any]:
+        try:
+            with open(self.snapshot_path, "r") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _replay(self, path: str, offset: int = 0) -> int:
+        """
+        Apply records from path starting at offset; returns the new offset.
+        """
+        records, offset = read_records(path, offset)
+        for record in records:
+            self._apply(record)
+        return offset
+
+    def _apply(self, record: Dict[str, Any]) -> None:
+        apply_record(self._state, record)
+        aid = str(record.get("id") or "")
+        if aid in self._state:
+            self._index.add(aid, self._state[aid])
+        else:
+            self._index.remove(aid)
+
+    def _reload(self) -> None:
+        self._snapshot_validator = _file_validator(self.snapshot_path)
+        self._state = self._read_snapshot()
+        self._index = RegistryIndex.build(self._state.items())
+        if os.path.exists(self.rotated_path):
+            self._replay(self.rotated_path)
+        try:
+            self._journal_ino = os.stat(self.journal_path).st_ino
+        except OSError:
+            self._journal_ino = None
+        self._journal_offset = self._replay(self.journal_path) if self._journal_ino else 0
+        self._loaded = True
+
+    def _refresh(self) -> None:
+        """
+        Pick up changes made by other processes: a new snapshot forces a full
+        reload, otherwise only records appended since our last read are applied.
+        Caller holds the file lock.
+        """
+        if not self._loaded or _file_validator(self.snapshot_path) != self._snapshot_validator:
+            self._reload()
+            return
+        try:
+            st = os.stat(self.journal_path)
+        except OSError:
+            if self._journal_ino is not None:
+                self._reload()
+            return
+        if st.st_ino != self._journal_ino or st.st_size < self._journal_offset:
+            self._reload()
+        elif st.st_size > self._journal_offset:
+            self._journal_offset = self._replay(self.journal_path, self._journal_offset)
+
+    # writes
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        with self._lock, self._file_lock(exclusive=True):
+            self._refresh()
+            self._append_locked(record)
+
+    def _append_locked(self, record: Dict[str, Any]) -> None:
+        """
+        Append one record; caller holds both locks and has refreshed.
+        """
+        line = (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+        fd = os.open(self.journal_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+            st = os.fstat(fd)
+        finally:
+            os.close(fd)
+        self._apply(record)
+        # our own append; skip re-reading it on the next refresh
+        if self._journal_ino in (None, st.st_ino) and st.st_size - len(line) == self._journal_offset:
+            self._journal_offset = st.st_size
+        self._journal_ino = st.st_ino
+        if st.st_size >= self.compact_threshold:
+            self._start_compaction()
+
+    def _write_tmp(self, data: Dict[str, Any]) -> str:
+        tmp_path = f"{self.snapshot_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, indent=4)
+        return tmp_path
+
+    def _fold_rotated(self) -> str:
+        """
+        Snapshot with the rotated journal applied, written to a tmp file.
+        Built from the files rather than self._state, which may lag records
+        other processes appended before the rotation.
+        """
+        data = self._read_snapshot()
+        for record in read_records(self.rotated_path)[0]:
+            apply_record(data, record)
+        return self._write_tmp(data)
+
+    def _install_snapshot(self, tmp_path: str) -> None:
+        """
+        Swap in a folded snapshot and drop the rotated journal it contains.
+        Must be called with both locks held.
+        """
+        os.replace(tmp_path, self.snapshot_path)
+        os.remove(self.rotated_path)
+        self._snapshot_validator = _file_validator(self.snapshot_path)
+
+    def _start_compaction(self) -> None:
+        """
+        Rotate the journal and rewrite the snapshot in the background.
+        Must be called with both locks held.
+        """
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+        if not os.path.exists(self.rotated_path) and not os.path.exists(self.journal_path):
+            return
+        compact_lock = open(self.compact_lock_path, "a")
+        try:
+            fcntl.flock(compact_lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            # another process is compacting
+            compact_lock.close()
+            return
+        try:
+            if os.path.exists(self.rotated_path):
+                # left by a compaction that died; fold it in before rotating again
+                self._install_snapshot(self._fold_rotated())
+            if not os.path.exists(self.journal_path):
+                compact_lock.close()
+                return
+            os.replace(self.journal_path, self.rotated_path)
+            rotated_ino = os.stat(self.rotated_path).st_ino
+        except BaseException:
+            compact_lock.close()
+            raise
+        self._journal_ino = None
+        self._journal_offset = 0
+
+        def compact():
+            # writers keep appending to the fresh journal meanwhile
+            try:
+                tmp_path = self._fold_rotated()
+                with self._lock, self._file_lock(exclusive=True):
+                    try:
+                        current = os.stat(self.rotated_path).st_ino
+                    except OSError:
+                        current = None
+                    if current != rotated_ino:
+                        # replace_all ran meanwhile; its snapshot wins
+                        os.remove(tmp_path)
+                        return
+                    self._install_snapshot(tmp_path)
+            finally:
+                compact_lock.close()
+
+        self._compactor = threading.Thread(target=compact, name="registry-compactor", daemon=True)
+        self._compactor.start()
+
+    def compact(self) -> None:
+        """
+        Synchronously fold the journal into the snapshot.
+        """
+        with self._lock, self._file_lock(exclusive=True):
+            self._start_compaction()
+            compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+
+    def replace_all(self, data: Dict[str, Any]) -> None:
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+        with self._lock, self._file_lock(exclusive=True):
+            os.replace(self._write_tmp(data), self.snapshot_path)
+            for path in (self.journal_path, self.rotated_path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._reload()
+
+    def put(self, artifact_id: str, entry: Dict[str, Any]) -> None:
+        self._append({"op": "create", "id": str(artifact_id), "entry": entry})
+
+    def update_data(self, artifact_id: str, data: Any) -> None:
+        self._append({"op": "update_data", "id": str(artifact_id), "data": data})
+
+    def update_metadata(self, artifact_id: str, metadata: Any) -> None:
+        self._append({"op": "update_metadata", "id": str(artifact_id), "metadata": metadata})
+
+    def set_rating(self, artifact_id: str, rating: Any) -> None:
+        self._append({"op": "set_rating", "id": str(artifact_id), "rating": rating})
+
+    def delete(self, artifact_id: str) -> bool:
+        with self._lock, self._file_lock(exclusive=True):
+            self._refresh()
+            if str(artifact_id) not in self._state:
+                return False
+            self._append_locked({"op": "delete", "id": str(artifact_id)})
+            return True
+
+    # reads
+
+    @contextmanager
+    def _reading(self) -> Iterator[None]:
+        with self._lock, self._file_lock(exclusive=False):
+            self._refresh()
+            yield
+
+    def load_all(self) -> Dict[str, Any]:
+        with self._reading():
+            return copy.deepcopy(self._state)
+
+    def get(self, artifact_id: str) -> Optional[Dict[str, Any]]:
+        with self._reading():
+            return copy.deepcopy(self._state.get(str(artifact_id)))
+
+    def _entries(self, ids: List[str]) -> List[Tuple[str, Dict[str, Any]]]:
+        # copies, so callers cannot edit the in-memory state
+        return [(aid, copy.deepcopy(self._state[aid])) for aid in ids]
+
+    def find_by_url(self, url: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        with self._reading():
+            aid = self._index.id_by_url(url)
+            return (aid, copy.deepcopy(self._state[aid])) if aid is not None else None
+
+    def find_by_name(self, name: str) -> List[Tuple[str, Dict[str, Any]]]:
+        with self._reading():
+            return self._entries(self._index.ids_by_name(name))
+
+    def find_by_type(self, artifact_type: str) -> List[Tuple[str, Dict[str, Any]]]:
+        with self._reading():
+            return self._entries(self._index.ids_by_type(artifact_type))
+
+    def query(self, queries: List[ArtifactQuery]) -> List[Tuple[str, Dict[str, Any]]]:
+        with self._reading():
+            return self._entries(self._index.query(queries))
+
+    def size_bytes(self) -> int:
+        total = 0
+        for path in (self.snapshot_path, self.journal_path, self.rotated_path):
+            try:
+                total += os.path.getsize(path)
+            except OSError:
+                continue
+        return total
@@ -1,15 +1,41 @@
+import copy
 import json
 import os
+import threading
 from urllib.parse import urlparse
 from pathlib import Path
 from datetime import datetime, timezone
 import boto3
-from typing import Optional
+from botocore.exceptions import ClientError
+from typing import Any, Dict, List, Optional, Tuple
 from dotenv import load_dotenv
+from utils.sqlite_registry import SQLiteRegistry
+from utils.registry_journal import JournaledRegistry
+from utils.s3_registry import S3ObjectRegistry
+from utils.registry_index import RegistryIndex, ArtifactQuery
+from utils.trigram_index import get_trigram_index, literal_plan
+from utils.regex_pool import run_regex_search
+from utils.blob_store import LocalBlobStore, S3BlobStore
+from utils.treescore import canonical_repo_id
 load_dotenv()
 
 ENV = os.getenv("ENVIRONMENT", "local")
 
+# Registry storage engine: "json" (registry.json locally / single S3 key),
+# "sqlite" (one row per artifact, see utils/sqlite_registry.py) or
+# "journal" (snapshot + append-only mutation log, see utils/registry_journal.py)
+# or "s3objects" (one S3 object per artifact + manifest, see utils/s3_registry.py)
+REGISTRY_BACKEND = os.getenv("REGISTRY_BACKEND", "json").strip().lower()
+REGISTRY_DB_PATH = os.getenv("REGISTRY_DB_PATH")
+REGISTRY_JOURNAL_COMPACT_BYTES = int(os.getenv("REGISTRY_JOURNAL_COMPACT_BYTES", str(1024 * 1024)))
+REGISTRY_S3_PREFIX = os.getenv("REGISTRY_S3_PREFIX", "registry/")
+# README text lives outside the registry in a content-addressed blob store:
+# BLOB_STORE_DIR (default: blobs/ next to the registry file) locally,
+# or under BLOB_S3_PREFIX in the registry bucket otherwise
+BLOB_STORE_DIR = os.getenv("BLOB_STORE_DIR")
+BLOB_S3_PREFIX = os.getenv("BLOB_S3_PREFIX", "blobs/")
+DEFAULT_REGISTRY_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "registry.json")
+
 HF_HOSTS = {"huggingface.co", "hf.co"}
 CODE_HOSTS = {
     "github.com", "gitlab.com", "bitbucket.org",
@@ -22,11 +48,30 @@ MODEL_EXTS = (
 AUDIT_ACTIONS = ["CREATE", "UPDATE", "DOWNLOAD", "RATE", "AUDIT"]
 AUDIT_DIR = Path("audit_logs")
 
-s3 = boto3.client("s3", region_name="us-east-2")
+# S3_ENDPOINT_URL points the client at a local S3 stand-in (MinIO, moto server)
+s3 = boto3.client("s3", region_name="us-east-2", endpoint_url=os.getenv("S3_ENDPOINT_URL") or None)
 
 BUCKET_NAME = "461-phase2-team12"
 KEY = "registry.json"
 
+# Process-wide registry cache: source -> (validator, parsed registry).
+# The validator is (mtime_ns, size, inode) for the local file and the
+# object ETag for S3, so unchanged registries are never re-parsed.
+_registry_cache: Dict[str, Tuple[Any, Any]] = {}
+_registry_cache_lock = threading.Lock()
+
+# Secondary name/type/url indexes for cached JSON registries:
+# source -> (registry object they were built from, entries by id, index)
+_registry_indexes: Dict[str, Tuple[Any, Dict[str, Any], RegistryIndex]] = {}
+
+# Serializes read-modify-write of the JSON registry within this process so
+# single-field updates (data, metadata, rating) never drop each other
+_json_write_lock = threading.RLock()
+
+# Process-wide storage engines for the non-JSON backends, keyed by file
+_stores: Dict[str, Any] = {}
+_stores_lock = threading.Lock()
+
 def audit_path(artifact_id: str):
     path = AUDIT_DIR
     path.mkdir(parents=True, exist_ok=True)
@@ -137,54 +182,182 @@ def _as_dict(data):
         return out
     return {}
 
+def _copy_registry(data):
+    """
+    Top-level copy of a cached registry so callers can add and remove
+    entries without changing what other requests read from the cache.
+    The entries themselves are shared: treat them as read-only and build a
+    new dict to change one (get_artifact_entry returns a private copy).
+    """
+    return dict(data)
+
+def _cache_put(source: str, validator, data) -> None:
+    with _registry_cache_lock:
+        if validator is None:
+            _registry_cache.pop(source, None)
+        else:
+            _registry_cache[source] = (validator, data)
+
+def clear_registry_cache() -> None:
+    """
+    Drop every cached registry (e.g. after an out-of-band change).
+    """
+    with _registry_cache_lock:
+        _registry_cache.clear()
+        _registry_indexes.clear()
+
+def _local_validator(path: str):
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+def _s3_source() -> str:
+    return f"s3://{BUCKET_NAME}/{KEY}"
+
+def _is_not_modified(e: ClientError) -> bool:
+    code = str(e.response.get("Error", {}).get("Code", ""))
+    status = e.response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+    return code in ("304", "NotModified") or status == 304
+
+def _backend_store(path: Optional[str]):
+    """
+    Return the process-wide storage engine for the configured backend,
+    or None when the plain JSON registry is in use.
+    """
+    if REGISTRY_BACKEND == "sqlite":
+        # The database lives at REGISTRY_DB_PATH, or next to the JSON registry it replaces
+        if REGISTRY_DB_PATH:
+            db_path = REGISTRY_DB_PATH
+        else:
+            db_path = os.path.splitext(path or DEFAULT_REGISTRY_PATH)[0] + ".sqlite3"
+        key = os.path.abspath(db_path)
+        factory = lambda: SQLiteRegistry(key, seed_json_path=path)
+    elif REGISTRY_BACKEND == "journal":
+        key = os.path.abspath(path or DEFAULT_REGISTRY_PATH)
+        factory = lambda: JournaledRegistry(key, compact_threshold=REGISTRY_JOURNAL_COMPACT_BYTES)
+    elif REGISTRY_BACKEND == "s3objects":
+        key = f"s3://{BUCKET_NAME}/{REGISTRY_S3_PREFIX}"
+        factory = lambda: S3ObjectRegistry(s3, BUCKET_NAME, REGISTRY_S3_PREFIX)
+    else:
+        return None
+
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = factory()
+            _stores[key] = store
+        return store
+
 def load_registry(path: Optional[str] = None):
     """
     Load the registry from S3. If it doesn't exist, return an empty dict.
+    Results are cached per process and only re-parsed when the file's
+    mtime/size or the S3 object's ETag changes. Entries in the result are
+    shared with the cache and must not be edited in place.
+    """
+    store = _backend_store(path)
+    if store is not None:
+        return store.load_all()
+    return _copy_registry(_load_json_registry(path))
+
+def _load_json_registry(path: Optional[str] = None):
+    """
+    Cached JSON registry shared by every caller; do not mutate the result.
     """
-    print(path)
     if ENV == "local":
         if not os.path.exists(path):
             return {}
+        source = os.path.abspath(path)
+        try:
+            validator = _local_validator(path)
+        except OSError:
+            return {}
+        with _registry_cache_lock:
+            cached = _registry_cache.get(source)
+        if cached is not None and cached[0] == validator:
+            return cached[1]
         with open(path, "r") as f:
             try:
-                return json.load(f)
+                data = json.load(f)
             except json.JSONDecodeError:
                 return {}
-        return {}
+        _cache_put(source, validator, data)
+        return data
 
+    source = _s3_source()
+    with _registry_cache_lock:
+        cached = _registry_cache.get(source)
     try:
-        response = s3.get_object(Bucket=BUCKET_NAME, Key=KEY)
+        kwargs = {"Bucket": BUCKET_NAME, "Key": KEY}
+        if cached is not None:
+            kwargs["IfNoneMatch"] = cached[0]
+        response = s3.get_object(**kwargs)
         content = response["Body"].read().decode("utf-8")
-        return _as_dict(json.loads(content))
+        data = _as_dict(json.loads(content))
+        _cache_put(source, response.get("ETag"), data)
+        return data
     except s3.exceptions.NoSuchKey:
         # Registry file doesn't exist yet
+        _cache_put(source, None, None)
         return {}
+    except ClientError as e:
+        if cached is not None and _is_not_modified(e):
+            return cached[1]
+        raise RuntimeError(f"Failed to load registry from S3: {e}") from e
     except Exception as e:
         raise RuntimeError(f"Failed to load registry from S3: {e}") from e
 
 
+def _json_registry_index(path: Optional[str]) -> Tuple[Dict[str, Any], RegistryIndex]:
+    """
+    Entries by id plus secondary indexes for the cached JSON registry.
+    Rebuilt only when the cached registry object itself changes.
+    """
+    data = _load_json_registry(path)
+    source = os.path.abspath(path) if ENV == "local" else _s3_source()
+    with _registry_cache_lock:
+        cached = _registry_indexes.get(source)
+    if cached is not None and cached[0] is data:
+        return cached[1], cached[2]
+    entries = dict(iter_registry(data))
+    index = RegistryIndex.build(entries.items())
+    with _registry_cache_lock:
+        _registry_indexes[source] = (data, entries, index)
+    return entries, index
+
+
 def save_registry(path: Optional[str] = None, data=None):
     """
-    Save the registry to S3. Hii
+    Save the registry to S3 (or the local file) and refresh the cache
+    in place so the next load does not re-read what was just written.
     """
     data = _as_dict(data)
 
+    store = _backend_store(path)
+    if store is not None:
+        store.replace_all(data)
+        return
+
     if ENV == "local":
         dirpath = os.path.dirname(os.path.abspath(path))
         if dirpath and not os.path.exists(dirpath):
             os.makedirs(dirpath, exist_ok=True)
-        with open(path, "w") as f:
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
             json.dump(data, f, indent=4)
+        os.replace(tmp_path, path)
+        _cache_put(os.path.abspath(path), _local_validator(path), _copy_registry(data))
         return 
 
     try:
-        s3.put_object(
+        response = s3.put_object(
             Bucket=BUCKET_NAME,
             Key=KEY,
             Body=json.dumps(data, indent=4),
             ContentType="application/json"
         )
+        _cache_put(_s3_source(), response.get("ETag"), _copy_registry(data))
     except Exception as e:
+        _cache_put(_s3_source(), None, None)
         raise RuntimeError(f"Failed to save registry to S3: {e}") from e
 
 def iter_registry(registry):
@@ -203,3 +376,270 @@ def find_model_in_registry(registry, model_id: str):
         if _extract_id(item) == model_id:
             return item
     return None
+
+def get_artifact_entry(path: Optional[str], artifact_id: str):
+    """
+    Point read of a single artifact entry, or None if it does not exist.
+    """
+    store = _backend_store(path)
+    if store is not None:
+        return store.get(artifact_id)
+    return copy.deepcopy(find_model_in_registry(_load_json_registry(path), str(artifact_id)))
+
+def put_artifact_entry(path: Optional[str], artifact_id: str, entry: Dict[str, Any]) -> None:
+    """
+    Create or replace a single artifact entry.
+    """
+    store = _backend_store(path)
+    if store is not None:
+        store.put(artifact_id, entry)
+    else:
+        with _json_write_lock:
+            registry = load_registry(path)
+            registry = _as_dict(registry)
+            # the cache keeps this entry; the caller may go on editing theirs
+            registry[str(artifact_id)] = copy.deepcopy(entry)
+            save_registry(path, registry)
+    _index_search_text(path, str(artifact_id), entry)
+
+def _update_json_field(path: Optional[str], artifact_id: str, field: str, value: Any) -> bool:
+    # read-modify-write under the lock so concurrent updates of other fields are kept
+    with _json_write_lock:
+        entry = get_artifact_entry(path, artifact_id)
+        if entry is None:
+            return False
+        put_artifact_entry(path, artifact_id, {**entry, field: value})
+        return True
+
+def update_artifact_data(path: Optional[str], artifact_id: str, data: Any) -> bool:
+    """
+    Replace the "data" object of a single artifact. Returns False if missing.
+    """
+    store = _backend_store(path)
+    if store is not None:
+        if store.get(artifact_id) is None:
+            return False
+        store.update_data(artifact_id, data)
+        return True
+    return _update_json_field(path, artifact_id, "data", data)
+
+def update_artifact_metadata(path: Optional[str], artifact_id: str, metadata: Dict[str, Any]) -> bool:
+    """
+    Replace the "metadata" object of a single artifact. Returns False if missing.
+    """
+    store = _backend_store(path)
+    if store is not None:
+        if store.get(artifact_id) is None:
+            return False
+        store.update_metadata(artifact_id, metadata)
+        return True
+    return _update_json_field(path, artifact_id, "metadata", metadata)
+
+def set_artifact_rating(path: Optional[str], artifact_id: str, rating: Dict[str, Any]) -> bool:
+    """
+    Store the latest rating on a single artifact. Returns False if missing.
+    """
+    store = _backend_store(path)
+    if store is not None:
+        if store.get(artifact_id) is None:
+            return False
+        store.set_rating(artifact_id, rating)
+        return True
+    return _update_json_field(path, artifact_id, "rating", rating)
+
+def remove_artifact_entry(path: Optional[str], artifact_id: str) -> bool:
+    """
+    Delete a single artifact entry. Returns False if it did not exist.
+    """
+    get_trigram_index(_search_key(path)).remove(str(artifact_id))
+    store = _backend_store(path)
+    if store is not None:
+        return store.delete(artifact_id)
+    with _json_write_lock:
+        registry = _as_dict(load_registry(path))
+        if str(artifact_id) not in registry:
+            return False
+        del registry[str(artifact_id)]
+        save_registry(path, registry)
+    return True
+
+def find_artifact_by_url(path: Optional[str], url: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """
+    Return (id, entry) of the artifact registered with this exact URL.
+    """
+    store = _backend_store(path)
+    if store is not None:
+        return store.find_by_url(url)
+    entries, index = _json_registry_index(path)
+    aid = index.id_by_url(url)
+    return (aid, copy.deepcopy(entries[aid])) if aid is not None else None
+
+def find_artifacts_by_name(path: Optional[str], name: str) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Return (id, entry) pairs whose name matches case-insensitively.
+    """
+    store = _backend_store(path)
+    if store is not None:
+        return store.find_by_name(name)
+    entries, index = _json_registry_index(path)
+    return [(aid, copy.deepcopy(entries[aid])) for aid in index.ids_by_name(name)]
+
+def find_artifacts_by_type(path: Optional[str], artifact_type: str) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Return (id, entry) pairs of the given artifact type.
+    """
+    store = _backend_store(path)
+    if store is not None:
+        return store.find_by_type(artifact_type)
+    entries, index = _json_registry_index(path)
+    return [(aid, copy.deepcopy(entries[aid])) for aid in index.ids_by_type(artifact_type)]
+
+def query_artifacts(path: Optional[str], queries: List[ArtifactQuery]) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Return (id, entry) pairs matching any (name or "*", types or None)
+    query, in registry order and without duplicates.
+    """
+    store = _backend_store(path)
+    if store is not None:
+        return store.query(queries)
+    entries, index = _json_registry_index(path)
+    return [(aid, copy.deepcopy(entries[aid])) for aid in index.query(queries)]
+
+def find_model_ratings(path: Optional[str], repo_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Return the stored ratings of models registered for these Hugging Face
+    repo ids, keyed by canonical repo id; any URL form of a repo matches.
+    """
+    wanted = {canonical_repo_id(r) for r in repo_ids} - {None}
+    found: Dict[str, Dict[str, Any]] = {}
+    if not wanted:
+        return found
+    for _, entry in find_artifacts_by_type(path, "model"):
+        data = entry.get("data") or {}
+        key = canonical_repo_id(data.get("url") or "") if isinstance(data, dict) else None
+        rating = entry.get("rating") or (entry.get("metadata") or {}).get("rating")
+        if key in wanted and isinstance(rating, dict):
+            found[key] = rating
+    return found
+
+def get_blob_store(path: Optional[str]):
+    """
+    Return the blob store that holds README text for this registry.
+    """
+    if BLOB_STORE_DIR or path:
+        root = os.path.abspath(BLOB_STORE_DIR or os.path.join(os.path.dirname(path), "blobs"))
+        key = f"blobs:{root}"
+        factory = lambda: LocalBlobStore(root)
+    else:
+        key = f"blobs:s3://{BUCKET_NAME}/{BLOB_S3_PREFIX}"
+        factory = lambda: S3BlobStore(s3, BUCKET_NAME, BLOB_S3_PREFIX)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = factory()
+            _stores[key] = store
+        return store
+
+def store_readme(path: Optional[str], text: str) -> Dict[str, Any]:
+    """
+    Put README text in the blob store and return the "_index" object that
+    references it from the registry entry.
+    """
+    if not text:
+        return {}
+    return {"readme_ref": get_blob_store(path).put_text(text), "readme_size": len(text)}
+
+def _readme_source(entry: Any) -> Tuple[str, Optional[str]]:
+    """
+    (inline README, blob ref) of an entry; older entries carry the text inline.
+    """
+    idx = entry.get("_index") if isinstance(entry, dict) else None
+    if not isinstance(idx, dict):
+        return "", None
+    ref = idx.get("readme_ref")
+    if isinstance(ref, str) and ref:
+        return "", ref
+    readme = idx.get("readme") or ""
+    return (readme if isinstance(readme, str) else ""), None
+
+def load_readme(path: Optional[str], entry: Any) -> str:
+    """
+    README text stored for an artifact, read from the blob store on demand.
+    """
+    readme, ref = _readme_source(entry)
+    if ref is None:
+        return readme
+    return get_blob_store(path).get_text(ref) or ""
+
+def migrate_inline_readmes(path: Optional[str]) -> int:
+    """
+    Move README text still stored inline in older entries into the blob
+    store. Returns the number of entries rewritten.
+    """
+    moved = 0
+    for aid, entry in list(_as_dict(load_registry(path)).items()):
+        readme, ref = _readme_source(entry)
+        idx = entry.get("_index") if isinstance(entry, dict) else None
+        if ref is None and isinstance(idx, dict) and "readme" in idx:
+            put_artifact_entry(path, aid, {**entry, "_index": store_readme(path, readme)})
+            moved += 1
+    return moved
+
+def _artifact_name(entry: Any) -> str:
+    metadata = (entry.get("metadata") or {}) if isinstance(entry, dict) else {}
+    return str(metadata.get("name", "")) if isinstance(metadata, dict) else ""
+
+def _search_key(path: Optional[str]) -> str:
+    return path if path else _s3_source()
+
+def _search_doc(path: Optional[str], artifact_id: str, entry: Any):
+    name = _artifact_name(entry)
+    readme, ref = _readme_source(entry)
+    if ref is not None:
+        # the blob is only read when the entry is new or changed
+        signature = (name, ref)
+        load = lambda: (name, load_readme(path, entry))
+    else:
+        # str hashes are cached on the object, so re-checking an unchanged
+        # inline README on later searches costs O(1)
+        signature = (name, len(readme), hash(readme))
+        load = lambda: (name, readme)
+    return str(artifact_id), signature, load
+
+def _index_search_text(path: Optional[str], artifact_id: str, entry: Any) -> None:
+    aid, signature, load = _search_doc(path, artifact_id, entry)
+    get_trigram_index(_search_key(path)).add(aid, signature, *load())
+
+def regex_search_artifacts(path: Optional[str], pattern: str, flags: int,
+                           timeout: Optional[float] = None) -> Tuple[List[Tuple[str, Dict[str, Any]]], bool]:
+    """
+    Return ((id, entry) pairs whose name or README matches, complete).
+    A trigram index narrows the candidates to artifacts containing the
+    pattern's required literals (patterns without any are full scans); the
+    regex itself runs in the worker pool under a deadline, and complete is
+    False when that deadline cut the search short.
+    """
+    registry = _as_dict(load_registry(path))
+    index = get_trigram_index(_search_key(path))
+    index.sync(_search_doc(path, aid, entry) for aid, entry in registry.items())
+
+    plan = literal_plan(pattern)
+    candidates = index.candidates(plan) if plan is not None else None
+
+    blobs = get_blob_store(path)
+    docs = []
+    for aid, entry in registry.items():
+        if candidates is not None and str(aid) not in candidates:
+            continue
+        readme, ref = _readme_source(entry)
+        readme_path = None
+        if ref is not None:
+            # local blobs are read by the worker itself rather than
+            # read here and pickled across
+            readme_path = blobs.local_path(ref)
+            if readme_path is None:
+                readme = blobs.get_text(ref) or ""
+        docs.append((str(aid), _artifact_name(entry), readme, readme_path))
+
+    matched, complete = run_regex_search(pattern, flags, docs, timeout)
+    return [(aid, entry) for aid, entry in registry.items() if str(aid) in matched], complete
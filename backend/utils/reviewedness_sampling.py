@@ -0,0 +1,91 @@
+import hashlib
+import math
+import os
+import random
+from typing import Callable, Dict, List, NamedTuple, Sequence, Tuple
+
+# exact (every merged PR), sample, or auto (sample above REVIEWEDNESS_SAMPLE_MIN_PRS)
+REVIEWEDNESS_MODE = os.getenv("REVIEWEDNESS_MODE", "auto").strip().lower()
+REVIEWEDNESS_SAMPLE_MIN_PRS = int(os.getenv("REVIEWEDNESS_SAMPLE_MIN_PRS", "100"))
+# stop once the 95% interval is at most +/- this wide...
+REVIEWEDNESS_TOLERANCE = float(os.getenv("REVIEWEDNESS_TOLERANCE", "0.05"))
+# ...or once this many GitHub requests were spent on sampled PRs
+REVIEWEDNESS_REQUEST_BUDGET = int(os.getenv("REVIEWEDNESS_REQUEST_BUDGET", "60"))
+
+# PRs fetched per round, and the fewest we trust an interval from
+SAMPLE_BATCH = 10
+MIN_SAMPLE = 20
+Z_95 = 1.96
+
+
+class ReviewednessEstimate(NamedTuple):
+    value: float
+    low: float
+    high: float
+    sampled_prs: int
+    population: int
+
+
+def use_sampling(population: int, mode: str = REVIEWEDNESS_MODE) -> bool:
+    if mode == "sample":
+        return True
+    if mode == "exact":
+        return False
+    return population > REVIEWEDNESS_SAMPLE_MIN_PRS
+
+
+def ratio_interval(pairs: Sequence[Tuple[int, int]], population: int, z: float = Z_95) -> Tuple[float, float, float]:
+    """
+    Ratio estimate of sum(reviewed) / sum(total) over the population from
+    (code additions, reviewed code additions) pairs of a simple random
+    sample, with a normal interval including the finite population correction.
+    """
+    n = len(pairs)
+    total = sum(x for x, _ in pairs)
+    if not total:
+        return 0.0, 0.0, 1.0
+    ratio = sum(y for _, y in pairs) / total
+    if n >= population:
+        return ratio, ratio, ratio
+    if n < 2:
+        return ratio, 0.0, 1.0
+    s2 = sum((y - ratio * x) ** 2 for x, y in pairs) / (n - 1)
+    mean_x = total / n
+    se = math.sqrt((1 - n / population) * s2 / n) / mean_x
+    return ratio, max(0.0, ratio - z * se), min(1.0, ratio + z * se)
+
+
+def estimate_reviewedness(
+    numbers: Sequence[int],
+    fetch_details: Callable[[List[int]], Dict[int, object]],
+    code_additions: Callable[[object], Tuple[int, int]],
+    request_count: Callable[[], int],
+    tolerance: float = REVIEWEDNESS_TOLERANCE,
+    budget: int = REVIEWEDNESS_REQUEST_BUDGET,
+    seed_text: str = "",
+) -> ReviewednessEstimate:
+    """
+    Fetch merged PRs in random order, a batch at a time, until the interval
+    around the additions-weighted reviewed fraction is narrow enough, the
+    request budget is spent, or every PR has been seen. The order is seeded
+    from seed_text and the PR list, so an unchanged repository gets the
+    same estimate.
+    """
+    order = list(numbers)
+    seed = hashlib.sha1(f"{seed_text}:{','.join(map(str, order))}".encode("utf-8")).digest()
+    random.Random(seed).shuffle(order)
+
+    start = request_count()
+    pairs: List[Tuple[int, int]] = []
+    taken = 0
+    value, low, high = 0.0, 0.0, 1.0
+    while taken < len(order):
+        batch = order[taken:taken + SAMPLE_BATCH]
+        taken += len(batch)
+        pairs.extend(code_additions(pr) for pr in fetch_details(batch).values())
+        value, low, high = ratio_interval(pairs, len(order))
+        if len(pairs) >= MIN_SAMPLE and (high - low) / 2 <= tolerance:
+            break
+        if request_count() - start >= budget:
+            break
+    return ReviewednessEstimate(value, low, high, taken, len(order))
@@ -0,0 +1,247 @@
+import copy
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from botocore.exceptions import ClientError
+
+from utils.registry_index import RegistryIndex
+
+MANIFEST_RETRIES = 10
+# artifact objects fetched in parallel by multi-artifact reads
+S3_REGISTRY_FETCH_WORKERS = int(os.getenv("S3_REGISTRY_FETCH_WORKERS", "16"))
+
+
+def _error_code(e: ClientError) -> str:
+    return str(e.response.get("Error", {}).get("Code", ""))
+
+
+def _summary(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Manifest row for an artifact: just enough to answer lookups by
+    name, type and url without fetching the artifact object itself.
+    """
+    meta = entry.get("metadata") or {}
+    data = entry.get("data") or {}
+    url = data.get("url") if isinstance(data, dict) else None
+    return {
+        "name": str(meta.get("name") or ""),
+        "type": str(meta.get("type") or "").strip().lower(),
+        "url": url if isinstance(url, str) else None,
+    }
+
+
+class S3ObjectRegistry:
+    """
+    Registry laid out on S3 as one object per artifact under
+    <prefix>artifacts/<id>.json plus a small <prefix>manifest.json index.
+    Rating and data updates rewrite a single artifact object; creates and
+    deletes also update the manifest with an ETag-conditional write so
+    concurrent writers retry instead of clobbering each other.
+    """
+
+    def __init__(self, client, bucket: str, prefix: str = "registry/") -> None:
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix
+        self.manifest_key = f"{prefix}manifest.json"
+        self._lock = threading.Lock()
+        # key -> (etag, parsed body); revalidated with IfNoneMatch
+        self._objects: Dict[str, Tuple[str, Any]] = {}
+        # (manifest etag, name/type/url index built from it)
+        self._index: Tuple[Optional[str], RegistryIndex] = (None, RegistryIndex())
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def artifact_key(self, artifact_id: str) -> str:
+        return f"{self.prefix}artifacts/{artifact_id}.json"
+
+    # object I/O
+
+    def _get_json(self, key: str) -> Tuple[Optional[str], Any]:
+        with self._lock:
+            cached = self._objects.get(key)
+        kwargs = {"Bucket": self.bucket, "Key": key}
+        if cached is not None:
+            kwargs["IfNoneMatch"] = cached[0]
+        try:
+            response = self.client.get_object(**kwargs)
+        except ClientError as e:
+            code = _error_code(e)
+            if cached is not None and code in ("304", "NotModified"):
+                return cached
+            if code in ("NoSuchKey", "404"):
+                with self._lock:
+                    self._objects.pop(key, None)
+                return None, None
+            raise
+        body = json.loads(response["Body"].read().decode("utf-8"))
+        etag = response.get("ETag")
+        with self._lock:
+            self._objects[key] = (etag, body)
+        return etag, body
+
+    def _put_json(self, key: str, body: Any, **conditions: str) -> None:
+        response = self.client.put_object(
+            Bucket=self.bucket,
+            Key=key,
+            Body=json.dumps(body),
+            ContentType="application/json",
+            **conditions,
+        )
+        with self._lock:
+            self._objects[key] = (response.get("ETag"), body)
+
+    def _delete_key(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+        with self._lock:
+            self._objects.pop(key, None)
+
+    # manifest
+
+    def _manifest(self) -> Dict[str, Dict[str, Any]]:
+        _, manifest = self._get_json(self.manifest_key)
+        return manifest if isinstance(manifest, dict) else {}
+
+    def _manifest_index(self) -> RegistryIndex:
+        """
+        Name/type/url index over the manifest, rebuilt only when its ETag changes.
+        """
+        etag, manifest = self._get_json(self.manifest_key)
+        with self._lock:
+            if etag is not None and self._index[0] == etag:
+                return self._index[1]
+        rows = manifest.items() if isinstance(manifest, dict) else ()
+        index = RegistryIndex.build(
+            (aid, {"metadata": {"name": row.get("name"), "type": row.get("type")}, "data": {"url": row.get("url")}})
+            for aid, row in rows
+        )
+        with self._lock:
+            self._index = (etag, index)
+        return index
+
+    def _update_manifest(self, artifact_id: str, summary: Optional[Dict[str, Any]]) -> None:
+        """
+        Set (or with summary=None remove) one manifest row using optimistic
+        concurrency: the put only succeeds if nobody changed the manifest
+        since we read it.
+        """
+        for _ in range(MANIFEST_RETRIES):
+            etag, manifest = self._get_json(self.manifest_key)
+            manifest = dict(manifest) if isinstance(manifest, dict) else {}
+            if summary is None:
+                if artifact_id not in manifest:
+                    return
+                manifest.pop(artifact_id)
+            else:
+                if manifest.get(artifact_id) == summary:
+                    return
+                manifest[artifact_id] = summary
+            condition = {"IfMatch": etag} if etag else {"IfNoneMatch": "*"}
+            try:
+                self._put_json(self.manifest_key, manifest, **condition)
+                return
+            except ClientError as e:
+                if _error_code(e) not in ("PreconditionFailed", "412", "ConditionalRequestConflict"):
+                    raise
+                with self._lock:
+                    self._objects.pop(self.manifest_key, None)
+        raise RuntimeError("Failed to update registry manifest: too much write contention")
+
+    # registry interface
+
+    def get(self, artifact_id: str) -> Optional[Dict[str, Any]]:
+        _, entry = self._get_json(self.artifact_key(str(artifact_id)))
+        # callers may edit the entry; keep the cached body intact
+        return copy.deepcopy(entry) if isinstance(entry, dict) else None
+
+    def put(self, artifact_id: str, entry: Dict[str, Any]) -> None:
+        self._put_json(self.artifact_key(str(artifact_id)), entry)
+        self._update_manifest(str(artifact_id), _summary(entry))
+
+    def _update_field(self, artifact_id: str, field: str, value: Any) -> None:
+        """
+        Set one top-level field with an ETag-conditional write, retrying if
+        another writer changed the object in between so neither update is lost.
+        """
+        key = self.artifact_key(str(artifact_id))
+        for _ in range(MANIFEST_RETRIES):
+            etag, entry = self._get_json(key)
+            if not isinstance(entry, dict):
+                return
+            entry = {**entry, field: value}
+            try:
+                self._put_json(key, entry, **({"IfMatch": etag} if etag else {}))
+                break
+            except ClientError as e:
+                if _error_code(e) not in ("PreconditionFailed", "412", "ConditionalRequestConflict"):
+                    raise
+                with self._lock:
+                    self._objects.pop(key, None)
+        else:
+            raise RuntimeError(f"Failed to update artifact {artifact_id}: too much write contention")
+        if field in ("data", "metadata"):
+            self._update_manifest(str(artifact_id), _summary(entry))
+
+    def update_data(self, artifact_id: str, data: Any) -> None:
+        self._update_field(artifact_id, "data", data)
+
+    def update_metadata(self, artifact_id: str, metadata: Any) -> None:
+        self._update_field(artifact_id, "metadata", metadata)
+
+    def set_rating(self, artifact_id: str, rating: Any) -> None:
+        self._update_field(artifact_id, "rating", rating)
+
+    def delete(self, artifact_id: str) -> bool:
+        if self.get(artifact_id) is None:
+            return False
+        self._delete_key(self.artifact_key(str(artifact_id)))
+        self._update_manifest(str(artifact_id), None)
+        return True
+
+    def _fetch(self, ids: List[str]) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Artifact bodies for ids, in order, fetched concurrently; missing ones are skipped.
+        """
+        if len(ids) <= 1:
+            entries = [self.get(aid) for aid in ids]
+        else:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=max(1, S3_REGISTRY_FETCH_WORKERS), thread_name_prefix="s3-registry"
+                    )
+                executor = self._executor
+            entries = list(executor.map(self.get, ids))
+        return [(aid, entry) for aid, entry in zip(ids, entries) if entry is not None]
+
+    def load_all(self) -> Dict[str, Any]:
+        return dict(self._fetch(list(self._manifest())))
+
+    def replace_all(self, data: Dict[str, Any]) -> None:
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=f"{self.prefix}artifacts/"):
+            for obj in page.get("Contents", []):
+                self._delete_key(obj["Key"])
+        manifest = {}
+        for aid, entry in data.items():
+            if not isinstance(entry, dict):
+                continue
+            self._put_json(self.artifact_key(str(aid)), entry)
+            manifest[str(aid)] = _summary(entry)
+        self._put_json(self.manifest_key, manifest)
+
+    def find_by_url(self, url: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        aid = self._manifest_index().id_by_url(url)
+        found = self._fetch([aid]) if aid is not None else []
+        return found[0] if found else None
+
+    def find_by_name(self, name: str) -> List[Tuple[str, Dict[str, Any]]]:
+        return self._fetch(self._manifest_index().ids_by_name(name))
+
+    def find_by_type(self, artifact_type: str) -> List[Tuple[str, Dict[str, Any]]]:
+        return self._fetch(self._manifest_index().ids_by_type(artifact_type))
+
+    def query(self, queries: List[Tuple[str, Optional[Set[str]]]]) -> List[Tuple[str, Dict[str, Any]]]:
+        return self._fetch(self._manifest_index().query(queries))
@@ -0,0 +1,192 @@
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL DEFAULT '',
+    name_norm TEXT NOT NULL DEFAULT '',
+    type TEXT NOT NULL DEFAULT '',
+    url TEXT,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_artifacts_name_norm ON artifacts(name_norm);
+CREATE INDEX IF NOT EXISTS idx_artifacts_type ON artifacts(type);
+CREATE INDEX IF NOT EXISTS idx_artifacts_url ON artifacts(url);
+"""
+
+
+def normalize_name(name: Any) -> str:
+    return str(name or "").strip().lower()
+
+
+def _row_values(artifact_id: str, entry: Dict[str, Any]) -> Tuple[str, str, str, str, Optional[str], str]:
+    meta = entry.get("metadata") or {}
+    data = entry.get("data") or {}
+    name = str(meta.get("name") or "")
+    url = data.get("url") if isinstance(data, dict) else None
+    return (
+        str(artifact_id),
+        name,
+        normalize_name(name),
+        str(meta.get("type") or "").strip().lower(),
+        url if isinstance(url, str) else None,
+        json.dumps(entry),
+    )
+
+
+class SQLiteRegistry:
+    """
+    Registry stored as one row per artifact, with indexes on id, normalized
+    name, type and data.url so lookups and writes touch a single row.
+    """
+
+    def __init__(self, db_path: str, seed_json_path: Optional[str] = None) -> None:
+        self.db_path = db_path
+        self._local = threading.local()
+        dirpath = os.path.dirname(os.path.abspath(db_path))
+        if dirpath:
+            os.makedirs(dirpath, exist_ok=True)
+        is_new = not os.path.exists(db_path)
+        conn = self._conn()
+        conn.executescript(SCHEMA)
+        if is_new and seed_json_path:
+            self._seed_from_json(seed_json_path)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _seed_from_json(self, json_path: str) -> None:
+        """
+        Import an existing registry.json the first time the database is created.
+        """
+        if not os.path.exists(json_path):
+            return
+        try:
+            with open(json_path, "r") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+        if isinstance(data, dict):
+            self.replace_all(data)
+
+    def _decode(self, rows: Iterable[Tuple[str, str]]) -> List[Tuple[str, Dict[str, Any]]]:
+        return [(aid, json.loads(body)) for aid, body in rows]
+
+    def load_all(self) -> Dict[str, Any]:
+        rows = self._conn().execute("SELECT id, body FROM artifacts ORDER BY rowid")
+        return dict(self._decode(rows))
+
+    def replace_all(self, data: Dict[str, Any]) -> None:
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM artifacts")
+            conn.executemany(
+                "INSERT INTO artifacts (id, name, name_norm, type, url, body) VALUES (?, ?, ?, ?, ?, ?)",
+                [_row_values(aid, entry) for aid, entry in data.items() if isinstance(entry, dict)],
+            )
+
+    def get(self, artifact_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute(
+            "SELECT body FROM artifacts WHERE id = ?", (str(artifact_id),)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, artifact_id: str, entry: Dict[str, Any]) -> None:
+        # an upsert keeps the rowid, so updated artifacts keep their place in listings
+        self._conn().execute(
+            "INSERT INTO artifacts (id, name, name_norm, type, url, body) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET name = excluded.name, name_norm = excluded.name_norm, "
+            "type = excluded.type, url = excluded.url, body = excluded.body",
+            _row_values(artifact_id, entry),
+        )
+
+    def _update_field(self, artifact_id: str, field: str, value: Any) -> None:
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT body FROM artifacts WHERE id = ?", (str(artifact_id),)
+            ).fetchone()
+            if not row:
+                return
+            entry = json.loads(row[0])
+            entry[field] = value
+            _, name, name_norm, artifact_type, url, body = _row_values(artifact_id, entry)
+            conn.execute(
+                "UPDATE artifacts SET name = ?, name_norm = ?, type = ?, url = ?, body = ? WHERE id = ?",
+                (name, name_norm, artifact_type, url, body, str(artifact_id)),
+            )
+
+    def update_data(self, artifact_id: str, data: Any) -> None:
+        self._update_field(artifact_id, "data", data)
+
+    def update_metadata(self, artifact_id: str, metadata: Any) -> None:
+        self._update_field(artifact_id, "metadata", metadata)
+
+    def set_rating(self, artifact_id: str, rating: Any) -> None:
+        self._update_field(artifact_id, "rating", rating)
+
+    def delete(self, artifact_id: str) -> bool:
+        cur = self._conn().execute("DELETE FROM artifacts WHERE id = ?", (str(artifact_id),))
+        return cur.rowcount > 0
+
+    def find_by_url(self, url: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        row = self._conn().execute(
+            "SELECT id, body FROM artifacts WHERE url = ? LIMIT 1", (url,)
+        ).fetchone()
+        return (row[0], json.loads(row[1])) if row else None
+
+    def find_by_name(self, name: str) -> List[Tuple[str, Dict[str, Any]]]:
+        rows = self._conn().execute(
+            "SELECT id, body FROM artifacts WHERE name_norm = ? ORDER BY rowid",
+            (normalize_name(name),),
+        )
+        return self._decode(rows)
+
+    def find_by_type(self, artifact_type: str) -> List[Tuple[str, Dict[str, Any]]]:
+        rows = self._conn().execute(
+            "SELECT id, body FROM artifacts WHERE type = ? ORDER BY rowid",
+            (str(artifact_type).strip().lower(),),
+        )
+        return self._decode(rows)
+
+    def query(self, queries: List[Tuple[str, Optional[Set[str]]]]) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Artifacts matching any (name or "*", types or None) query, each
+        query answered from the name_norm/type indexes.
+        """
+        clauses = []
+        params: List[Any] = []
+        for name, types in queries:
+            conds = []
+            if name != "*":
+                conds.append("name_norm = ?")
+                params.append(normalize_name(name))
+            if types is not None:
+                conds.append(f"type IN ({', '.join('?' for _ in types)})")
+                params.extend(sorted(types))
+            if not conds:
+                clauses = []
+                params = []
+                break
+            clauses.append("(" + " AND ".join(conds) + ")")
+        where = f" WHERE {' OR '.join(clauses)}" if clauses else ""
+        rows = self._conn().execute(f"SELECT id, body FROM artifacts{where} ORDER BY rowid", params)
+        return self._decode(rows)
+
+    def size_bytes(self) -> int:
+        try:
+            return os.path.getsize(self.db_path)
+        except OSError:
+            return 0
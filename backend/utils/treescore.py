@@ -0,0 +1,131 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+# how long a computed parent net score is reused across rating requests
+TREESCORE_MEMO_TTL_SECONDS = float(os.getenv("TREESCORE_MEMO_TTL_SECONDS", "3600"))
+TREESCORE_MEMO_MAX_ENTRIES = int(os.getenv("TREESCORE_MEMO_MAX_ENTRIES", "1024"))
+
+HF_HOSTS = {"huggingface.co", "www.huggingface.co", "hf.co"}
+# path segments after the repo id in Hub URLs (/org/name/tree/main, /blob/..., ...)
+HF_URL_SUFFIXES = {"tree", "blob", "resolve", "raw", "commit", "commits", "discussions"}
+
+
+def canonical_repo_id(value: str) -> Optional[str]:
+    """
+    Lowercased Hugging Face model id ("org/name", or a legacy "name") from
+    a bare id or any Hub URL form, or None if it is not a model repo.
+    """
+    value = (value or "").strip()
+    if not value:
+        return None
+    if "://" in value or value.split("/", 1)[0].lower() in HF_HOSTS:
+        parsed = urlparse(value if "://" in value else f"https://{value}")
+        if (parsed.hostname or "").lower() not in HF_HOSTS:
+            return None
+        parts = [p for p in parsed.path.split("/") if p]
+        if parts and parts[0] == "models":
+            parts = parts[1:]
+        if parts and parts[0] in ("datasets", "spaces"):
+            return None
+    else:
+        parts = [p for p in value.split("/") if p]
+    if len(parts) >= 2 and parts[1] in HF_URL_SUFFIXES:
+        parts = parts[:1]
+    parts = parts[:2]
+    if not parts or any(ch in p for p in parts for ch in (" ", "\t", "\\")):
+        return None
+    return "/".join(parts).lower()
+
+
+class TreeScoreEngine:
+    """
+    Parent net scores for treescore. A rating already stored in the
+    registry wins; otherwise computed scores are memoized for ttl seconds
+    across requests, and concurrent requests needing the same parent wait
+    on the one computation in flight instead of starting their own.
+    """
+
+    def __init__(self, ttl: float = TREESCORE_MEMO_TTL_SECONDS, max_entries: int = TREESCORE_MEMO_MAX_ENTRIES) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._memo: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()  # id -> (score, expires_at)
+        self._inflight: Dict[str, Future] = {}
+        self._stats = {"stored": 0, "hits": 0, "shared": 0, "computed": 0, "failed": 0}
+
+    def parent_score(self, repo_id: str, compute: Callable[[], float], stored: Optional[Any] = None) -> Optional[float]:
+        """
+        Net score of one parent in [0, 1], or None if it could not be computed.
+        """
+        key = canonical_repo_id(repo_id) or repo_id
+        try:
+            stored = float(stored) if stored is not None else None
+        except (TypeError, ValueError):
+            stored = None
+        if stored is not None and 0.0 <= stored <= 1.0:
+            with self._lock:
+                self._stats["stored"] += 1
+            return stored
+
+        with self._lock:
+            memo = self._memo.get(key)
+            if memo is not None and memo[1] > time.monotonic():
+                self._memo.move_to_end(key)
+                self._stats["hits"] += 1
+                return memo[0]
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+            else:
+                self._stats["shared"] += 1
+        if not owner:
+            return future.result()
+
+        score: Optional[float] = None
+        try:
+            value = float(compute())
+            if 0.0 <= value <= 1.0:
+                score = value
+        except Exception:
+            score = None
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+                if score is None:
+                    self._stats["failed"] += 1
+                else:
+                    self._stats["computed"] += 1
+                    self._remember(key, score)
+            future.set_result(score)
+        return score
+
+    def _remember(self, key: str, score: float) -> None:
+        self._memo[key] = (score, time.monotonic() + self.ttl)
+        self._memo.move_to_end(key)
+        while len(self._memo) > self.max_entries:
+            self._memo.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            out = dict(self._stats)
+            out["entries"] = len(self._memo)
+            out["in_flight"] = len(self._inflight)
+        return out
+
+
+_engine: Optional[TreeScoreEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_treescore_engine() -> TreeScoreEngine:
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = TreeScoreEngine()
+        return _engine
@@ -0,0 +1,191 @@
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    from re import _parser as sre_parse, _constants as sre_constants
+except ImportError:  # Python < 3.11
+    import sre_parse, sre_constants  # type: ignore
+
+# Characters that re.IGNORECASE treats as equal to another letter but that
+# str.lower() maps elsewhere; folded first so trigrams of text and pattern agree.
+_FOLD_FIXES = str.maketrans({
+    "\u00b5": "\u03bc", "\u0130": "i", "\u0131": "i", "\u017f": "s",
+    "\u0345": "\u03b9", "\u03c2": "\u03c3", "\u03d0": "\u03b2", "\u03d1": "\u03b8",
+    "\u03d5": "\u03c6", "\u03d6": "\u03c0", "\u03f0": "\u03ba", "\u03f1": "\u03c1",
+    "\u03f5": "\u03b5", "\u1c80": "\u0432", "\u1c81": "\u0434", "\u1c82": "\u043e",
+    "\u1c83": "\u0441", "\u1c84": "\u0442", "\u1c85": "\u0442", "\u1c86": "\u044a",
+    "\u1c87": "\u0463", "\u1c88": "\ua64b", "\u1e9b": "\u1e61", "\u1fbe": "\u03b9",
+})
+
+_REPEATS = {sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT}
+_POSSESSIVE = getattr(sre_constants, "POSSESSIVE_REPEAT", None)
+if _POSSESSIVE is not None:
+    _REPEATS.add(_POSSESSIVE)
+_ATOMIC = getattr(sre_constants, "ATOMIC_GROUP", None)
+
+
+def fold(text: str) -> str:
+    return text.translate(_FOLD_FIXES).lower()
+
+
+def trigrams(text: str) -> Set[str]:
+    text = fold(text)
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _required_literals(items) -> List[str]:
+    """
+    Literal runs that every match of this sequence must contain.
+    """
+    out: List[str] = []
+    run: List[str] = []
+
+    def flush():
+        if run:
+            out.append("".join(run))
+            run.clear()
+
+    for op, av in items:
+        if op == sre_constants.LITERAL:
+            run.append(chr(av))
+        elif op == sre_constants.AT:
+            # zero-width: the characters around it are still adjacent
+            continue
+        elif op == sre_constants.SUBPATTERN:
+            flush()
+            out.extend(_required_literals(av[-1]))
+        elif _ATOMIC is not None and op == _ATOMIC:
+            flush()
+            out.extend(_required_literals(av))
+        elif op in _REPEATS:
+            flush()
+            min_count, _, sub = av
+            if min_count >= 1:
+                out.extend(_required_literals(sub))
+        else:
+            flush()
+    flush()
+    return out
+
+
+def literal_plan(pattern: str) -> Optional[List[List[str]]]:
+    """
+    Required literal fragments of a regex as an OR of ANDs: a text can only
+    match if, for some alternative, it contains every fragment listed.
+    Returns None when no fragment is long enough to narrow the search.
+    """
+    try:
+        parsed = list(sre_parse.parse(pattern))
+    except Exception:
+        return None
+
+    while len(parsed) == 1 and parsed[0][0] == sre_constants.SUBPATTERN:
+        parsed = list(parsed[0][1][-1])
+    if len(parsed) == 1 and parsed[0][0] == sre_constants.BRANCH:
+        alternatives = [list(alt) for alt in parsed[0][1][1]]
+    else:
+        alternatives = [parsed]
+
+    plan = []
+    for alt in alternatives:
+        literals = [fold(lit) for lit in _required_literals(alt) if len(lit) >= 3]
+        if not literals:
+            return None
+        plan.append(literals)
+    return plan
+
+
+class TrigramIndex:
+    """
+    Trigram -> artifact ids posting lists over artifact names and README
+    text, used to narrow regex searches to artifacts containing every
+    required literal before the real regex runs.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._postings: Dict[str, Set[str]] = {}
+        self._docs: Dict[str, Tuple[object, Set[str]]] = {}
+
+    def add(self, artifact_id: str, signature: object, *texts: str) -> None:
+        grams: Set[str] = set()
+        for text in texts:
+            if text:
+                grams |= trigrams(text)
+        with self._lock:
+            self._remove_locked(artifact_id)
+            self._docs[artifact_id] = (signature, grams)
+            for g in grams:
+                self._postings.setdefault(g, set()).add(artifact_id)
+
+    def _remove_locked(self, artifact_id: str) -> None:
+        doc = self._docs.pop(artifact_id, None)
+        if doc is None:
+            return
+        for g in doc[1]:
+            ids = self._postings.get(g)
+            if ids is not None:
+                ids.discard(artifact_id)
+                if not ids:
+                    del self._postings[g]
+
+    def remove(self, artifact_id: str) -> None:
+        with self._lock:
+            self._remove_locked(artifact_id)
+
+    def signature(self, artifact_id: str) -> object:
+        with self._lock:
+            doc = self._docs.get(artifact_id)
+        return doc[0] if doc is not None else None
+
+    def sync(self, docs: Iterable[Tuple[str, object, Callable[[], Tuple[str, ...]]]]) -> None:
+        """
+        Bring the index in line with the registry: (re)index documents whose
+        signature changed and drop ids that are gone. Each doc carries a
+        loader for its texts so unchanged documents are never read.
+        """
+        seen = set()
+        for artifact_id, signature, load in docs:
+            seen.add(artifact_id)
+            if self.signature(artifact_id) != signature:
+                self.add(artifact_id, signature, *load())
+        with self._lock:
+            for artifact_id in [aid for aid in self._docs if aid not in seen]:
+                self._remove_locked(artifact_id)
+
+    def candidates(self, plan: List[List[str]]) -> Set[str]:
+        """
+        Ids that contain every trigram of every literal for some alternative.
+        """
+        out: Set[str] = set()
+        with self._lock:
+            for literals in plan:
+                grams = set()
+                for lit in literals:
+                    grams |= {lit[i:i + 3] for i in range(len(lit) - 2)}
+                postings = sorted((self._postings.get(g, set()) for g in grams), key=len)
+                if not postings or not postings[0]:
+                    continue
+                found = set(postings[0])
+                for ids in postings[1:]:
+                    found &= ids
+                    if not found:
+                        break
+                out |= found
+        return out
+
+
+_indexes: Dict[str, TrigramIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_trigram_index(key: str) -> TrigramIndex:
+    """
+    Process-wide trigram index for one registry (keyed by path or S3 source).
+    """
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = TrigramIndex()
+            _indexes[key] = index
+        return index
@@ -9,6 +9,10 @@ from pathlib import Path
 backend_path = os.path.join(os.path.dirname(__file__), "../../backend")
 sys.path.insert(0, backend_path)
 
+# keep mocked LLM and GitHub responses from leaking between runs through the on-disk caches
+os.environ.setdefault("LLM_CACHE_ENABLED", "false")
+os.environ.setdefault("GITHUB_CACHE_ENABLED", "false")
+
 from app import app
 
 
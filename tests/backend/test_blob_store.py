@@ -0,0 +1,86 @@
+"""Tests for the content-addressed README blob store"""
+import pytest
+import io
+import json
+import re
+from botocore.exceptions import ClientError
+
+from utils.blob_store import LocalBlobStore, S3BlobStore
+from utils.registry_utils import (
+    clear_registry_cache,
+    load_readme,
+    load_registry,
+    migrate_inline_readmes,
+    put_artifact_entry,
+    regex_search_artifacts,
+    store_readme,
+)
+
+
+@pytest.fixture
+def registry_file(tmp_path):
+    clear_registry_cache()
+    path = tmp_path / "registry.json"
+    path.write_text(json.dumps({}))
+    yield str(path)
+    clear_registry_cache()
+
+
+def test_blobs_are_content_addressed(tmp_path):
+    """Test identical text is stored once and read back intact"""
+    store = LocalBlobStore(str(tmp_path / "blobs"))
+    ref = store.put_text("# Model card\nsome text")
+    assert store.put_text("# Model card\nsome text") == ref
+    assert store.get_text(ref) == "# Model card\nsome text"
+    assert store.get_text("0" * 64) is None
+    assert store.get_text(store.put_text("")) == ""
+
+
+def test_s3_failed_read_is_retried():
+    """Test a transient S3 error is not cached but a successful read is"""
+    class FlakyClient:
+        calls = 0
+
+        def get_object(self, Bucket, Key):
+            self.calls += 1
+            if self.calls == 1:
+                raise ClientError({"Error": {"Code": "SlowDown"}}, "GetObject")
+            return {"Body": io.BytesIO(b"card text")}
+
+    client = FlakyClient()
+    store = S3BlobStore(client, "bucket")
+    assert store.get_text("ref") is None
+    assert store.get_text("ref") == "card text"
+    assert store.get_text("ref") == "card text"
+    assert client.calls == 2
+
+
+def test_registry_holds_only_a_reference(registry_file):
+    """Test README text stays out of the registry but is still searchable"""
+    readme = "Fine-tuned for sentiment analysis. " * 1000
+    entry = {
+        "metadata": {"id": "1", "name": "distilbert", "type": "model"},
+        "data": {"url": "https://huggingface.co/distilbert"},
+        "_index": store_readme(registry_file, readme),
+    }
+    put_artifact_entry(registry_file, "1", entry)
+
+    with open(registry_file) as f:
+        assert "sentiment" not in f.read()
+    assert load_readme(registry_file, load_registry(registry_file)["1"]) == readme
+
+    found, complete = regex_search_artifacts(registry_file, "sentiment analysis", re.IGNORECASE | re.DOTALL)
+    assert complete
+    assert [aid for aid, _ in found] == ["1"]
+
+
+def test_inline_readmes_are_migrated(registry_file):
+    """Test legacy entries with inline README text move to the blob store"""
+    with open(registry_file, "w") as f:
+        json.dump({"1": {"metadata": {"id": "1", "name": "old"}, "_index": {"readme": "legacy text"}}}, f)
+
+    assert migrate_inline_readmes(registry_file) == 1
+    entry = load_registry(registry_file)["1"]
+    assert "readme" not in entry["_index"]
+    assert load_readme(registry_file, entry) == "legacy text"
+    assert migrate_inline_readmes(registry_file) == 0
@@ -0,0 +1,64 @@
+"""Tests for sampled code-quality scoring"""
+import os
+import random
+
+from CustomObjects import Code as code_module
+from CustomObjects.Code import Code
+from utils import loc_counter
+from utils.code_sampling import estimate_errors, stratified_sample
+
+
+def synthetic_tree(root, files_per_dir=50, density=0.1, seed=0):
+    rng = random.Random(seed)
+    locs, errors = {}, {}
+    for d in ("src", "tests", "docs"):
+        for i in range(files_per_dir):
+            path = os.path.join(root, d, f"f{i}.py")
+            locs[path] = rng.randint(20, 400)
+            errors[path] = int(locs[path] * density * rng.uniform(0.5, 1.5))
+    return locs, errors
+
+
+def test_sample_covers_every_directory_within_budget():
+    """Test the sample respects the budget and draws from each directory"""
+    locs, _ = synthetic_tree("/repo")
+    sample = stratified_sample("/repo", locs, loc_budget=6000)
+    assert {p.split(os.sep)[2] for p in sample} == {"src", "tests", "docs"}
+    assert sum(locs[p] for p in sample) < 6000 + 3 * 400
+    assert sample == stratified_sample("/repo", locs, loc_budget=6000)
+
+
+def test_estimate_brackets_true_error_count():
+    """Test the extrapolated count and interval cover the true total"""
+    locs, errors = synthetic_tree("/repo")
+    sample = stratified_sample("/repo", locs, loc_budget=8000)
+    estimate = estimate_errors("/repo", locs, {p: errors[p] for p in sample})
+    truth = sum(errors.values())
+    assert estimate.low <= truth <= estimate.high
+    assert abs(estimate.errors - truth) / truth < 0.2
+
+
+def test_large_repository_is_scored_from_sample(tmp_path, monkeypatch):
+    """Test a tree over the LOC threshold is tagged as sampled"""
+    monkeypatch.setattr(code_module, "CODE_QUALITY_SAMPLE_LOC", 100)
+    for i in range(30):
+        (tmp_path / f"m{i}.py").write_text("import os,sys\n" * 20)
+
+    code = Code("https://github.com/org/repo")
+    score = code._score_checkout(str(tmp_path))
+    assert code.quality_sampled
+    low, high = code.quality_bounds
+    assert low <= score <= high
+
+
+def test_sampled_scoring_counts_each_file_once(tmp_path, monkeypatch):
+    """Test the line count and the sample weights share one pass over the files"""
+    monkeypatch.setattr(code_module, "CODE_QUALITY_SAMPLE_LOC", 100)
+    for i in range(30):
+        (tmp_path / f"m{i}.py").write_text("import os,sys\n" * 20)
+    counted = []
+    count_file_lines = loc_counter.count_file_lines
+    monkeypatch.setattr(loc_counter, "count_file_lines", lambda p: counted.append(p) or count_file_lines(p))
+
+    Code("https://github.com/org/repo")._score_checkout(str(tmp_path))
+    assert sorted(counted) == sorted(str(tmp_path / f"m{i}.py") for i in range(30))
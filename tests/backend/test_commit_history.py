@@ -0,0 +1,70 @@
+"""Tests for the incremental commit-history cache behind the bus factor"""
+import pytest
+from array import array
+from datetime import datetime, timedelta, timezone
+
+from utils.commit_history import CommitHistory, CommitHistoryCache, read_history, write_history
+
+NOW = datetime(2025, 6, 1, tzinfo=timezone.utc)
+
+
+def commit(sha, days_ago, *users):
+    date = (NOW - timedelta(days=days_ago)).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+    return {"id": sha, "date": date, "authors": [{"user": u} for u in users]}
+
+
+class FakeHub:
+    """Serves a commit list, newest first, in pages of two and counts page requests."""
+
+    def __init__(self, commits):
+        self.commits = commits
+        self.requests = 0
+
+    def __call__(self, repo_id):
+        for i in range(0, len(self.commits), 2):
+            self.requests += 1
+            yield self.commits[i:i + 2]
+
+
+@pytest.fixture
+def hub():
+    return FakeHub([commit("c3", 10, "ann"), commit("c2", 20, "bob", "ann"), commit("c1", 30, "cy")])
+
+
+def test_history_file_round_trip(tmp_path):
+    """Test the columnar file reads back what was written"""
+    history = CommitHistory("abc", ["ann", "bob"], array("q", [300, 200, 100]), array("I", [0, 1, 0]))
+    write_history(str(tmp_path / "h"), history)
+    assert read_history(str(tmp_path / "h")) == history
+    assert read_history(str(tmp_path / "missing")) is None
+
+
+def test_refresh_stops_at_cached_head(tmp_path, hub):
+    """Test a later run fetches only the commits newer than the cached head"""
+    cache = CommitHistoryCache(str(tmp_path), pages=hub)
+    since = NOW - timedelta(days=365)
+    assert sorted(cache.recent_authors("org/model", since)) == ["ann", "ann", "bob", "cy"]
+
+    hub.commits.insert(0, commit("c4", 1, "dee"))
+    hub.requests = 0
+    assert sorted(cache.recent_authors("org/model", since)) == ["ann", "ann", "bob", "cy", "dee"]
+    assert hub.requests == 1
+
+
+def test_known_head_skips_request(tmp_path, hub):
+    """Test a head sha matching the cache answers without any request"""
+    cache = CommitHistoryCache(str(tmp_path), pages=hub)
+    since = NOW - timedelta(days=365)
+    cache.recent_authors("org/model", since)
+    hub.requests = 0
+    assert len(cache.recent_authors("org/model", since, head_sha="c3")) == 4
+    assert hub.requests == 0
+
+
+def test_paging_stops_past_window(tmp_path, hub):
+    """Test commits older than the window end paging and are not stored"""
+    hub.commits += [commit(f"old{i}", 400 + i, "zed") for i in range(6)]
+    cache = CommitHistoryCache(str(tmp_path), pages=hub)
+    assert sorted(cache.recent_authors("org/model", NOW - timedelta(days=25))) == ["ann", "ann", "bob"]
+    assert hub.requests == 2
+    assert read_history(cache.path("org/model")).authors == ["ann", "bob"]
@@ -0,0 +1,76 @@
+"""Tests for the bare-mirror git clone cache"""
+import os
+import pytest
+import shutil
+
+import git
+
+from utils.git_cache import GitMirrorCache, canonical_url
+
+AUTHOR = git.Actor("Test", "test@example.com")
+
+
+def make_upstream(path, files):
+    repo = git.Repo.init(path)
+    commit(repo, files)
+    return repo
+
+
+def commit(repo, files):
+    for name, text in files.items():
+        with open(os.path.join(repo.working_dir, name), "w") as f:
+            f.write(text)
+    repo.index.add(list(files))
+    repo.index.commit("update", author=AUTHOR, committer=AUTHOR)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return GitMirrorCache(str(tmp_path / "cache"), max_bytes=1 << 30, fetch_interval=0)
+
+
+def test_canonical_url():
+    """Test URL spellings of one repository share a mirror"""
+    assert canonical_url("https://GitHub.com/org/repo.git/") == "https://github.com/org/repo"
+
+
+def test_checkout_reuses_mirror_and_fetches_updates(cache, tmp_path):
+    """Test a second checkout reuses the mirror and sees new commits"""
+    upstream = make_upstream(tmp_path / "up", {"a.py": "x = 1\n"})
+    url = str(tmp_path / "up")
+
+    with cache.checkout(url) as tree:
+        assert open(os.path.join(tree, "a.py")).read() == "x = 1\n"
+    assert not os.path.exists(tree)
+
+    commit(upstream, {"a.py": "x = 2\n"})
+    with cache.checkout(url) as tree:
+        assert open(os.path.join(tree, "a.py")).read() == "x = 2\n"
+    assert len(cache.mirrors()) == 1
+
+
+def test_lru_eviction_spares_live_worktrees(cache, tmp_path):
+    """Test the least recently used mirror is evicted, but not one in use"""
+    make_upstream(tmp_path / "one", {"a.py": "1\n"})
+    make_upstream(tmp_path / "two", {"b.py": "2\n"})
+
+    with cache.checkout(str(tmp_path / "one")):
+        pass
+    with cache.checkout(str(tmp_path / "two")):
+        assert cache.evict(max_bytes=0) == [cache.mirror_path(str(tmp_path / "one"))]
+    assert [path for path, _, _ in cache.mirrors()] == [cache.mirror_path(str(tmp_path / "two"))]
+
+
+def test_crashed_checkout_does_not_pin_mirror(cache, tmp_path):
+    """Test worktree records left by a dead worker do not block eviction"""
+    make_upstream(tmp_path / "one", {"a.py": "1\n"})
+    url = str(tmp_path / "one")
+    with cache.checkout(url):
+        pass
+    mirror = cache.mirror_path(url)
+    with git.Repo(mirror) as repo:
+        repo.git.worktree("add", "--detach", str(tmp_path / "orphan"), "HEAD")
+    # the worker dies and its scratch directory is cleaned up
+    shutil.rmtree(tmp_path / "orphan")
+
+    assert cache.evict(max_bytes=0) == [mirror]
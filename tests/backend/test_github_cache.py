@@ -0,0 +1,75 @@
+"""Tests for the persistent, ETag-conditional GitHub cache"""
+import pytest
+from json import dumps
+from unittest.mock import MagicMock
+
+from CustomObjects.GitHubFetcher import GitHubFetcher
+from utils.github_cache import GitHubCache
+
+
+def pr(number, updated, merged=True):
+    return {"number": number, "updated_at": updated, "merged_at": "2024-01-01T00:00:00Z" if merged else None}
+
+
+class ConditionalGitHub:
+    """Serves a PR listing with ETags and answers matching If-None-Match with 304."""
+
+    def __init__(self, listing):
+        self.listing = listing
+        self.calls = []
+
+    def request(self, method, url, headers=None, timeout=None, params=None, json=None):
+        self.calls.append((url, (headers or {}).get("If-None-Match")))
+        if url.endswith("/reviews"):
+            body = [{"state": "APPROVED"}]
+        elif url.endswith("/files"):
+            body = [{"filename": "a.py", "additions": 3}] if params["page"] == 1 else []
+        else:
+            body = self.listing
+        etag = f'"{hash(repr(body))}"'
+        resp = MagicMock(headers={"ETag": etag})
+        if (headers or {}).get("If-None-Match") == etag:
+            resp.status_code = 304
+            return resp
+        resp.status_code = 200
+        resp.content = dumps(body).encode()
+        resp.json.return_value = body
+        return resp
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return GitHubCache(str(tmp_path / "github.sqlite3"))
+
+
+def test_unchanged_listing_is_served_from_304(cache):
+    """Test a repeated GET is conditional and a 304 returns the cached body"""
+    github = ConditionalGitHub([pr(2, "2024-02-01"), pr(1, "2024-01-01")])
+    fetcher = GitHubFetcher("org", "repo", token="", mode="rest", session=github, cache=cache)
+    first = list(fetcher.paginate(fetcher.base_url + "/pulls"))
+    second = list(fetcher.paginate(fetcher.base_url + "/pulls"))
+    assert first == second
+    assert github.calls[0][1] is None and github.calls[1][1] is not None
+
+
+def test_merged_prs_are_fetched_once(cache):
+    """Test PR details come from the cache on later runs"""
+    github = ConditionalGitHub([])
+    fetcher = GitHubFetcher("org", "repo", token="", mode="rest", session=github, cache=cache)
+    assert fetcher.pr_details([7])[7].files == [("a.py", 3)]
+    calls = len(github.calls)
+
+    again = GitHubFetcher("org", "repo", token="", mode="rest", session=github, cache=cache)
+    assert again.pr_details([7])[7].approved
+    assert len(github.calls) == calls
+
+
+def test_listing_stops_at_last_sync(cache):
+    """Test only PRs updated since the last sync are listed"""
+    github = ConditionalGitHub([pr(2, "2024-02-01"), pr(1, "2024-01-01")])
+    fetcher = GitHubFetcher("org", "repo", token="", mode="rest", session=github, cache=cache)
+    assert fetcher.merged_pr_numbers() == [2, 1]
+
+    github.listing = [pr(3, "2024-03-01"), pr(4, "2024-02-15", merged=False), pr(2, "2024-02-01"), pr(1, "2024-01-01")]
+    assert fetcher.merged_pr_numbers() == [3, 2, 1]
+    assert cache.get_sync("org/repo").last_updated == "2024-03-01"
@@ -0,0 +1,80 @@
+"""Tests for the concurrent, rate-limit aware GitHub fetcher"""
+import time
+import pytest
+from unittest.mock import MagicMock
+
+from CustomObjects import GitHubFetcher as fetcher_module
+from CustomObjects.GitHubFetcher import GitHubFetcher, GitHubRateLimited, RateLimitGate
+
+
+def response(body, status=200, headers=None):
+    resp = MagicMock(status_code=status, headers=headers or {})
+    resp.json.return_value = body
+    return resp
+
+
+class FakeGitHub:
+    """Answers REST and GraphQL calls for a repo with PRs 1-3."""
+
+    files = {1: [("a.py", 10)], 2: [("b.py", 5), ("w.bin", 100)], 3: [("c.py", 7)]}
+    approved = {1, 3}
+
+    def __init__(self):
+        self.calls = []
+
+    def request(self, method, url, headers=None, timeout=None, params=None, json=None):
+        self.calls.append((method, url))
+        if url.endswith("/graphql"):
+            repo = {}
+            for n in self.files:
+                if f"pr{n}:" in json["query"]:
+                    repo[f"pr{n}"] = {
+                        "number": n,
+                        "reviews": {"totalCount": int(n in self.approved)},
+                        "files": {
+                            "nodes": [{"path": p, "additions": a} for p, a in self.files[n]],
+                            "pageInfo": {"hasNextPage": False, "endCursor": None},
+                        },
+                    }
+            return response({"data": {"repository": repo}})
+        if url.endswith("/pulls"):
+            return response([{"number": n, "merged_at": "2024-01-01"} for n in self.files] + [{"number": 9, "merged_at": None}])
+        n = int(url.split("/")[-2])
+        if url.endswith("/reviews"):
+            return response([{"state": "APPROVED" if n in self.approved else "COMMENTED"}])
+        if params and params.get("page", 1) > 1:
+            return response([])
+        return response([{"filename": p, "additions": a} for p, a in self.files[n]])
+
+
+@pytest.mark.parametrize("mode", ["rest", "graphql"])
+def test_pr_details_in_both_modes(mode):
+    """Test REST and GraphQL return the same review states and additions"""
+    github = FakeGitHub()
+    fetcher = GitHubFetcher("org", "repo", token="t", mode=mode, session=github)
+    numbers = fetcher.merged_pr_numbers()
+    assert numbers == [1, 2, 3]
+
+    details = fetcher.pr_details(numbers)
+    assert {n: d.approved for n, d in details.items()} == {1: True, 2: False, 3: True}
+    assert details[2].files == [("b.py", 5), ("w.bin", 100)]
+    graphql_calls = [c for c in github.calls if c[1].endswith("/graphql")]
+    assert len(graphql_calls) == (1 if mode == "graphql" else 0)
+
+
+def test_gate_waits_for_reset():
+    """Test an exhausted bucket sleeps until the advertised reset"""
+    gate = RateLimitGate()
+    gate.update(response({}, headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(time.time() + 0.2)}))
+    start = time.monotonic()
+    gate.acquire()
+    assert time.monotonic() - start >= 0.15
+
+
+def test_gate_gives_up_on_distant_reset(monkeypatch):
+    """Test a reset further away than the allowed wait fails fast"""
+    monkeypatch.setattr(fetcher_module, "GITHUB_RATE_LIMIT_MAX_WAIT", 1)
+    gate = RateLimitGate()
+    gate.update(response({}, headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(time.time() + 600)}))
+    with pytest.raises(GitHubRateLimited):
+        gate.acquire()
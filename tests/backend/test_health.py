@@ -21,3 +21,10 @@ def test_health_check_components(client):
     assert len(data['components']) > 0
     assert 'id' in data['components'][0]
     assert 'status' in data['components'][0]
+
+
+def test_health_reports_metric_executor(client):
+    """Test the metric executor's queue metrics are reported"""
+    data = client.get('/health/components').get_json()
+    executor = next(c for c in data['components'] if c['id'] == 'metric_executor')
+    assert {'queue_depth', 'wait_ms_avg', 'workers'} <= set(executor['metrics'])
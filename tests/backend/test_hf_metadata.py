@@ -0,0 +1,68 @@
+"""Tests for the shared per-evaluation Hugging Face metadata"""
+import pytest
+import threading
+import time
+from types import SimpleNamespace
+
+from CustomObjects.HFMetadata import HFMetadata
+from CustomObjects.Model import Model
+
+
+class FakeApi:
+    def __init__(self):
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def model_info(self, repo_id, files_metadata=False):
+        with self.lock:
+            self.calls += 1
+        time.sleep(0.05)
+        return SimpleNamespace(
+            siblings=[SimpleNamespace(size=1024)],
+            cardData={"license": "mit"},
+            downloads=10,
+            likes=1,
+        )
+
+
+def test_model_info_fetched_once_across_threads():
+    """Test concurrent callers share one in-flight request"""
+    api = FakeApi()
+    hf = HFMetadata("org/model", api=api)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(hf.model_info())) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert api.calls == 1
+    assert all(r is results[0] for r in results)
+
+
+def test_errors_are_shared():
+    """Test a failed fetch is not retried within one evaluation"""
+    class FailingApi:
+        calls = 0
+
+        def model_info(self, repo_id, files_metadata=False):
+            FailingApi.calls += 1
+            raise RuntimeError("offline")
+
+    hf = HFMetadata("org/model", api=FailingApi())
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            hf.model_info()
+    assert FailingApi.calls == 1
+
+
+def test_model_metrics_share_one_fetch():
+    """Test size, license and popularity read the same model_info"""
+    api = FakeApi()
+    model = Model("https://huggingface.co/org/model", dataset_url="", code_url="")
+    model.hf_metadata = HFMetadata("org/model", api=api)
+
+    assert model.get_size()["raspberry_pi"] == 1.0
+    assert model.get_license() == 1.0
+    assert model.get_popularity_score() > 0.0
+    assert api.calls == 1
+    assert HFMetadata.from_url("https://example.com") is None
@@ -0,0 +1,23 @@
+"""Tests for the shared pooled HTTP client"""
+from unittest.mock import patch
+
+import requests
+
+from utils.http_client import PooledSession, get_session
+
+
+def test_session_is_shared():
+    """Test every caller gets the same pooled session"""
+    assert get_session() is get_session()
+
+
+def test_default_timeout_and_pool_size():
+    """Test requests get a default timeout unless one is passed"""
+    session = PooledSession(pool_maxsize=7, timeout=(1, 2))
+    assert session.get_adapter("https://example.com")._pool_maxsize == 7
+
+    with patch.object(requests.Session, "request", return_value="ok") as sent:
+        session.get("https://example.com")
+        assert sent.call_args.kwargs["timeout"] == (1, 2)
+        session.get("https://example.com", timeout=9)
+        assert sent.call_args.kwargs["timeout"] == 9
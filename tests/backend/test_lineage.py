@@ -9,3 +9,32 @@ def test_get_lineage(client, registry_with_artifact):
     response = client.get('/artifact/model/test-id-123/lineage')
     # May return lineage data or error
     assert response.status_code in [200, 404, 400, 500]
+
+
+def test_lineage_reads_config_through_evaluation_context(tmp_path):
+    """Test the root's config.json comes from the evaluation's shared context"""
+    from CustomObjects.HFMetadata import HFMetadata
+    from utils.lineage_utils import build_lineage_graph
+
+    config = tmp_path / "config.json"
+    config.write_text('{"base_model_name_or_path": "base-model"}')
+
+    class FakeApi:
+        downloads = 0
+
+        def hf_hub_download(self, repo_id, filename, repo_type="model"):
+            self.downloads += 1
+            return str(config)
+
+    api = FakeApi()
+    hf = HFMetadata("org/child", api=api)
+    hf.read_text("config.json")
+    registry = {
+        "1": {"metadata": {"id": "1", "name": "child", "type": "model"},
+              "data": {"url": "https://huggingface.co/org/child"}},
+        "2": {"metadata": {"id": "2", "name": "base-model", "type": "model"}, "data": {}},
+    }
+    graph = build_lineage_graph(registry, "1", registry["1"], hf_metadata=hf)
+
+    assert graph["edges"] == [{"from_node_artifact_id": "2", "to_node_artifact_id": "1", "relationship": "base_model"}]
+    assert api.downloads == 1
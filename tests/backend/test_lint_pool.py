@@ -0,0 +1,66 @@
+"""Tests for the parallel, cached flake8 runner"""
+import os
+import pytest
+from unittest.mock import patch
+
+from flake8.api import legacy
+
+from utils import lint_pool
+from utils.lint_pool import LintCache, lint_files, list_python_files
+
+
+@pytest.fixture
+def tree(tmp_path):
+    files = {
+        "clean.py": "x = 1\n",
+        "messy.py": "import os,sys\nx=1 \n",
+        "copy.py": "import os,sys\nx=1 \n",
+        "pkg/mod.py": "def f( a ):\n  return a\n",
+        "__pycache__/skip.py": "import os,sys\n",
+        "notes.txt": "not python",
+    }
+    for name, text in files.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+    return tmp_path
+
+
+def test_total_matches_single_flake8_run(tree, tmp_path, monkeypatch):
+    """Test sharded per-file counts add up to flake8's own total"""
+    monkeypatch.setattr(lint_pool, "LINT_SHARD_FILES", 1)
+    expected = legacy.get_style_guide(quiet=2).check_files([str(tree)]).total_errors
+    files = list_python_files(str(tree))
+    assert sorted(os.path.relpath(f, tree) for f in files) == ["clean.py", "copy.py", "messy.py", os.path.join("pkg", "mod.py")]
+
+    counts = lint_files(files, cache=LintCache(str(tmp_path / "lint.sqlite3")))
+    assert sum(counts.values()) == expected
+    assert counts[str(tree / "copy.py")] == counts[str(tree / "messy.py")] > 0
+
+
+def test_unchanged_files_come_from_cache(tree, tmp_path):
+    """Test re-linting only touches files whose content changed"""
+    cache = LintCache(str(tmp_path / "lint.sqlite3"))
+    files = list_python_files(str(tree))
+    lint_files(files, cache=cache)
+
+    (tree / "clean.py").write_text("y=2\n")
+    with patch.object(lint_pool, "_lint_uncached", wraps=lint_pool._lint_uncached) as linted:
+        counts = lint_files(files, cache=cache)
+    assert linted.call_args.args[0] == [str(tree / "clean.py")]
+    assert counts[str(tree / "clean.py")] == 1
+
+
+def test_line_count_covers_linted_files(tmp_path):
+    """Test vendored files are neither linted nor counted, so errors and lines match"""
+    from CustomObjects.Code import Code
+
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "mod.py").write_text("import os,sys\nx=1 \ny = 2\n")
+    (tmp_path / "venv").mkdir()
+    for i in range(50):
+        (tmp_path / "venv" / f"dep{i}.py").write_text("import os,sys\n")
+
+    files = list_python_files(str(tmp_path))
+    assert files == [str(tmp_path / "pkg" / "mod.py")]
+    assert Code("").count_python_loc(str(tmp_path)) == 3
@@ -0,0 +1,70 @@
+"""Tests for batched LLM metric scoring"""
+import json
+import threading
+from unittest.mock import MagicMock, patch
+
+from CustomObjects.LLMBatchScorer import LLMBatchScorer
+from CustomObjects.LLMQuerier import LLMQuerier
+from utils.llm_cache import LLMResponseCache
+
+
+class FakeQuerier:
+    def __init__(self, response):
+        self.response = response
+        self.prompts = []
+
+    def query(self, prompt, model="llama4:latest", validate=None):
+        self.prompts.append(prompt)
+        return self.response
+
+
+def test_one_request_for_all_metrics():
+    """Test concurrent metrics share a single completion"""
+    querier = FakeQuerier('```json\n{"ramp_up_time": 0.8, "performance_claims": 1.4}\n```')
+    batch = LLMBatchScorer(querier, {
+        "ramp_up_time": lambda: "ramp prompt",
+        "performance_claims": lambda: "perf prompt",
+        "dataset_quality": lambda: None,
+    })
+    results = {}
+    threads = [
+        threading.Thread(target=lambda k=k: results.__setitem__(k, batch.score(k)))
+        for k in ("ramp_up_time", "performance_claims", "dataset_quality")
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(querier.prompts) == 1
+    assert "dataset_quality" not in querier.prompts[0]
+    assert results == {"ramp_up_time": 0.8, "performance_claims": 1.0, "dataset_quality": None}
+
+
+def test_unparseable_response_falls_back():
+    """Test a non-JSON answer leaves every metric to its own prompt"""
+    batch = LLMBatchScorer(FakeQuerier("0.7"), {"ramp_up_time": lambda: "ramp prompt"})
+    assert batch.score("ramp_up_time") is None
+    assert LLMBatchScorer.parse_scores('{"a": "high"}', ["a"]) == {}
+
+
+def test_only_parsed_batches_are_cached(tmp_path):
+    """Test a batch answer is written to the LLM cache only once it parses"""
+    cache = LLMResponseCache(str(tmp_path / "llm.sqlite3"))
+    querier = LLMQuerier(endpoint="https://llm.test/batch-cache")
+    prompts = {"ramp_up_time": lambda: "ramp prompt"}
+
+    def answer(text):
+        response = MagicMock(status_code=200)
+        response.content = json.dumps({"choices": [{"message": {"content": text}}]}).encode()
+        return response
+
+    with patch("CustomObjects.LLMQuerier.get_llm_cache", return_value=cache), \
+            patch("utils.http_client.post", return_value=answer("not json")):
+        assert LLMBatchScorer(querier, prompts).score("ramp_up_time") is None
+    assert cache.stats()["entries"] == 0
+
+    with patch("CustomObjects.LLMQuerier.get_llm_cache", return_value=cache), \
+            patch("utils.http_client.post", return_value=answer('{"ramp_up_time": 0.6}')):
+        assert LLMBatchScorer(querier, prompts).score("ramp_up_time") == 0.6
+    assert cache.stats()["entries"] == 1
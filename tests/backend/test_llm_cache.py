@@ -0,0 +1,60 @@
+"""Tests for the on-disk LLM response cache"""
+import pytest
+import json
+import sqlite3
+import time
+from unittest.mock import MagicMock, patch
+
+from CustomObjects.LLMQuerier import LLMQuerier
+from utils.llm_cache import LLMResponseCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return LLMResponseCache(str(tmp_path / "llm.sqlite3"), ttl=60, max_bytes=1000)
+
+
+def test_hit_and_miss_counters(cache):
+    """Test responses are keyed by model and prompt"""
+    assert cache.get("llama", "score this") is None
+    cache.put("llama", "score this", "0.8")
+    assert cache.get("llama", "score this") == "0.8"
+    assert cache.get("other-model", "score this") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 2, 1)
+
+
+def test_entries_expire(cache):
+    """Test entries older than the TTL are dropped"""
+    cache.put("llama", "p", "0.1")
+    cache.ttl = -1
+    assert cache.get("llama", "p") is None
+    assert cache.stats()["expired"] == 1
+
+
+def test_lru_eviction(cache):
+    """Test the least recently used entries go once over the size cap"""
+    cache.put("llama", "old", "x" * 400)
+    time.sleep(0.01)
+    cache.put("llama", "recent", "y" * 400)
+    time.sleep(0.01)
+    cache.get("llama", "old")
+    cache.put("llama", "new", "z" * 400)
+
+    assert cache.get("llama", "recent") is None
+    assert cache.get("llama", "old") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_broken_cache_is_skipped():
+    """Test cache errors are treated as a miss and a skipped write"""
+    cache = MagicMock()
+    cache.get.side_effect = sqlite3.OperationalError("database is locked")
+    cache.put.side_effect = sqlite3.OperationalError("disk I/O error")
+    response = MagicMock(status_code=200)
+    response.content = json.dumps({"choices": [{"message": {"content": "0.4"}}]}).encode()
+    querier = LLMQuerier(endpoint="https://llm.test/broken-cache")
+
+    with patch("CustomObjects.LLMQuerier.get_llm_cache", return_value=cache), \
+            patch("utils.http_client.post", return_value=response):
+        assert querier.query("score") == "0.4"
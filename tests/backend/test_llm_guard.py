@@ -0,0 +1,73 @@
+"""Tests for LLM call deadlines, hedging and the circuit breaker"""
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+from CustomObjects.LLMQuerier import LLMQuerier
+from utils import llm_guard
+from utils.llm_guard import CircuitBreaker
+
+
+def completion(text):
+    response = MagicMock(status_code=200)
+    response.content = ('{"choices": [{"message": {"content": "%s"}}]}' % text).encode()
+    return response
+
+
+def test_breaker_opens_and_recovers():
+    """Test the breaker opens after repeated failures and closes after a good trial"""
+    breaker = CircuitBreaker(failures=2, cooldown=0.05)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    assert not breaker.allow()  # only one trial while half-open
+    breaker.record_success()
+    assert breaker.allow()
+
+
+def test_open_breaker_fails_fast():
+    """Test queries return the fallback without calling a degraded endpoint"""
+    querier = LLMQuerier(endpoint="https://llm.test/breaker")
+    for _ in range(llm_guard.LLM_BREAKER_FAILURES):
+        querier.guard.breaker.record_failure()
+    with patch("utils.http_client.post") as post:
+        assert querier.query("score") is None
+        post.assert_not_called()
+
+
+def test_deadline_bounds_slow_endpoint():
+    """Test a hung request is abandoned at the caller's deadline"""
+    release = threading.Event()
+    querier = LLMQuerier(endpoint="https://llm.test/slow")
+    with patch("utils.http_client.post", side_effect=lambda *a, **k: release.wait(5) and completion("1")):
+        start = time.monotonic()
+        assert querier.query("score", deadline=0.2) is None
+        assert time.monotonic() - start < 2
+    release.set()
+
+
+def test_hedged_request_wins(monkeypatch):
+    """Test a duplicate is sent once the first call outlives the observed p95"""
+    monkeypatch.setattr(llm_guard, "LLM_HEDGE_MIN_SECONDS", 0.05)
+    querier = LLMQuerier(endpoint="https://llm.test/hedge")
+    for _ in range(llm_guard.MIN_LATENCY_SAMPLES):
+        querier.guard.latency.record(0.01)
+
+    release = threading.Event()
+    calls = []
+
+    def post(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == 1:
+            release.wait(5)
+            return completion("slow")
+        return completion("fast")
+
+    with patch("utils.http_client.post", side_effect=post):
+        assert querier.query("score", deadline=3) == "fast"
+    release.set()
+    assert len(calls) == 2
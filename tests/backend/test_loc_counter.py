@@ -0,0 +1,44 @@
+"""Tests for the byte-level LOC counter"""
+import pytest
+
+from utils import loc_counter
+from utils.loc_counter import count_file_lines, count_lines, count_python_loc
+
+SAMPLES = [
+    b"",
+    b"x = 1",
+    b"x = 1\n",
+    b"a\r\nb\r\nc",
+    b"a\rb\rc\r",
+    b"a\r\n\r\n\n\r",
+    b"caf\xc3\xa9\n\xff\xfe bad bytes\n",
+]
+
+
+def text_mode_lines(path):
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        return sum(1 for _ in f)
+
+
+@pytest.mark.parametrize("data", SAMPLES)
+def test_matches_text_mode_iteration(data, tmp_path, monkeypatch):
+    """Test byte counts agree with universal-newline line iteration, across block boundaries"""
+    path = tmp_path / "f.py"
+    path.write_bytes(data)
+    assert count_lines(data) == text_mode_lines(path)
+    monkeypatch.setattr(loc_counter, "BLOCK_SIZE", 2)
+    assert count_file_lines(str(path)) == text_mode_lines(path)
+
+
+def test_tree_total_skips_vendored_dirs(tmp_path):
+    """Test vendored directories and non-Python files are not counted"""
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "a.py").write_bytes(b"1\n2\n")
+    (tmp_path / "b.py").write_bytes(b"1\r\n2\r\n3")
+    (tmp_path / "README.md").write_bytes(b"1\n2\n")
+    for vendored in ("node_modules", ".venv", "third_party"):
+        (tmp_path / vendored).mkdir()
+        (tmp_path / vendored / "dep.py").write_bytes(b"1\n" * 100)
+
+    assert count_python_loc(str(tmp_path), threads=1) == 5
+    assert count_python_loc(str(tmp_path), threads=4) == 5
@@ -0,0 +1,48 @@
+"""Tests for the shared, fair metric executor"""
+import pytest
+import threading
+import time
+
+from utils.metric_executor import MetricExecutor, _Batch
+
+
+def test_results_in_call_order():
+    """Test results come back in call order and errors are raised"""
+    executor = MetricExecutor(workers=4)
+    assert executor.run_all([lambda i=i: i * i for i in range(10)]) == [i * i for i in range(10)]
+    with pytest.raises(ZeroDivisionError):
+        executor.run_all([lambda: 1, lambda: 1 / 0])
+
+
+def test_thread_count_is_bounded():
+    """Test concurrent evaluations never start more threads than configured"""
+    executor = MetricExecutor(workers=3)
+    calls = [lambda: time.sleep(0.01) for _ in range(8)]
+    callers = [threading.Thread(target=executor.run_all, args=(calls,)) for _ in range(5)]
+    for t in callers:
+        t.start()
+    for t in callers:
+        t.join(10)
+    stats = executor.stats()
+    assert stats["threads"] <= 3 and stats["completed"] == 40 and stats["queue_depth"] == 0
+
+
+def test_nested_evaluations_do_not_deadlock():
+    """Test tasks that run their own batch finish on a single worker"""
+    executor = MetricExecutor(workers=1)
+    nested = lambda: sum(executor.run_all([lambda: 1, lambda: 2, lambda: 3]))  # noqa: E731
+    done = []
+    t = threading.Thread(target=lambda: done.append(executor.run_all([nested, nested, nested])))
+    t.start()
+    t.join(10)
+    assert done == [[6, 6, 6]]
+
+
+def test_workers_alternate_between_evaluations():
+    """Test queued tasks are taken round-robin across evaluations"""
+    executor = MetricExecutor(workers=1)
+    first = _Batch([lambda: "a1", lambda: "a2", lambda: "a3"])
+    second = _Batch([lambda: "b1"])
+    executor._batches.extend([first, second])
+    order = [executor._take()[0]() for _ in range(4)]
+    assert order == ["a1", "b1", "a2", "a3"]
@@ -17,3 +17,33 @@ def test_rate_artifact_not_found(client):
     response = client.get('/artifact/model/nonexistent-id/rate')
     # Should return 404 or error if artifact not found
     assert response.status_code in [200, 404, 400, 500]
+
+
+def test_rate_reports_sampled_reviewedness(registry_with_artifact):
+    """Test the sampled flag and bounds set by the reviewedness metric reach the response"""
+    from unittest.mock import patch
+    from CustomObjects.Model import Model
+    import CustomObjects.Model as model_module
+
+    class SampledModel(Model):
+        def get_reviewedness(self):
+            self.reviewedness_sampled = True
+            self.reviewedness_bounds = (0.4, 0.6)
+            return 0.5
+
+    metrics = ["get_size", "get_license", "get_bus_factor", "get_dataset_and_code_score",
+               "get_reproducibility", "get_treescore"]
+    client, _ = registry_with_artifact
+    with patch("routes.rate.ModelClass", SampledModel), \
+            patch("routes.rate.get_dataset_and_code", return_value=["", ""]), \
+            patch.object(model_module, "LLM_BATCH_SCORING", False), \
+            patch.multiple(SampledModel, **{m: lambda self: 0.0 for m in metrics},
+                           get_ramp_up_time=lambda self, api_key: 0.0,
+                           get_performance_claims=lambda self, api_key: 0.0), \
+            patch("CustomObjects.Dataset.Dataset.get_quality", lambda self, api_key: 0.0), \
+            patch("CustomObjects.Code.Code.get_quality", lambda self: 0.0):
+        response = client.get('/artifact/model/test-id-123/rate')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["reviewedness_sampled"] is True
+    assert data["reviewedness_bounds"] == [0.4, 0.6]
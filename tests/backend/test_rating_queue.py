@@ -0,0 +1,53 @@
+"""Tests for the in-process rating job queue"""
+import pytest
+import threading
+
+from utils.rating_queue import RatingQueue, RatingQueueFull, JOB_FAILED, JOB_SUCCEEDED
+
+
+def test_job_result_and_status():
+    """Test a job runs and reports its result"""
+    queue = RatingQueue(workers=1)
+    job = queue.submit("a", lambda: {"net_score": 0.5})
+    assert job.wait(5)
+    assert job.status == JOB_SUCCEEDED
+    assert queue.get(job.job_id).to_dict()["result"] == {"net_score": 0.5}
+
+
+def test_failed_job_reports_error():
+    """Test exceptions are captured on the job"""
+    queue = RatingQueue(workers=1)
+
+    def fail():
+        raise RuntimeError("boom")
+
+    job = queue.submit("a", fail)
+    assert job.wait(5)
+    assert job.status == JOB_FAILED
+    assert job.to_dict()["error"] == "boom"
+
+
+def test_duplicate_and_overflow():
+    """Test in-flight jobs are shared and the queue is bounded"""
+    queue = RatingQueue(workers=1, max_pending=1)
+    started, release = threading.Event(), threading.Event()
+
+    def block():
+        started.set()
+        release.wait()
+
+    running = queue.submit("a", block)
+    assert queue.submit("a", block) is running
+    assert started.wait(5)
+
+    queue.submit("b", lambda: None)
+    with pytest.raises(RatingQueueFull):
+        queue.submit("c", lambda: None)
+    release.set()
+    assert running.wait(5)
+
+
+def test_status_endpoint_unknown_job(client):
+    """Test the status endpoint 404s for unknown jobs"""
+    response = client.get('/rating/jobs/does-not-exist')
+    assert response.status_code == 404
@@ -0,0 +1,109 @@
+"""Tests for the shared README provider"""
+import threading
+import time
+
+from CustomObjects.ReadmeProvider import ParsedReadme, ReadmeProvider
+from CustomObjects.HFMetadata import HFMetadata
+from CustomObjects.Model import Model
+
+CARD = """# My model
+Intro.
+## Training data
+Trained on wikitext.
+### Details
+More.
+## License
+Released under the MIT license.
+## Usage
+```python
+>>> import torch
+```
+"""
+
+
+def test_section_index():
+    """Test headings are indexed with same-level and any-level ends"""
+    readme = ParsedReadme(CARD)
+    data = readme.find_section("data")
+    assert CARD[data.start:data.end].startswith("## Training data")
+    assert "More." in CARD[data.start:data.end]
+    lic = readme.find_section("license", exact=True)
+    assert CARD[lic.body_start:lic.next_heading].strip() == "Released under the MIT license."
+    assert len(readme.code_blocks("python")) == 1
+
+
+def test_provider_fetches_once():
+    """Test concurrent and repeated lookups share a single fetch"""
+    provider = ReadmeProvider()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.05)
+        return CARD
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(provider.get("h", "org/m", "main", fetch)))
+        for _ in range(5)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    assert provider.get("h", "org/m", "main", fetch) is results[0]
+    assert provider.get("h", "org/m", "other-rev", fetch).text == CARD
+    assert len(calls) == 2
+
+
+def test_failed_fetch_reaches_waiters():
+    """Test waiters get the leader's error and the next lookup fetches again"""
+    provider = ReadmeProvider()
+    started, release = threading.Event(), threading.Event()
+
+    def failing():
+        started.set()
+        release.wait(5)
+        raise RuntimeError("hub unavailable")
+
+    errors = []
+
+    def lookup():
+        try:
+            provider.get("h", "org/m", "main", failing)
+        except RuntimeError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=lookup)
+    leader.start()
+    started.wait(5)
+    waiter = threading.Thread(target=lookup)
+    waiter.start()
+    time.sleep(0.05)
+    release.set()
+    leader.join(5)
+    waiter.join(5)
+    assert len(errors) == 2
+    assert provider.get("h", "org/m", "main", lambda: CARD).text == CARD
+
+
+def test_empty_seed_is_not_cached():
+    """Test seeding empty text leaves the README to be fetched"""
+    provider = ReadmeProvider()
+    provider.seed("h", "org/m", "main", "")
+    assert provider.get("h", "org/m", "main", lambda: CARD).text == CARD
+
+
+def test_stored_readme_is_reused_for_rating():
+    """Test a README seeded from the registry is used without a download"""
+    class OfflineApi:
+        def model_info(self, repo_id, files_metadata=False):
+            raise RuntimeError("offline")
+
+        def hf_hub_download(self, **kwargs):
+            raise RuntimeError("offline")
+
+    model = Model("https://huggingface.co/org/seeded-model", dataset_url="", code_url="", readme_text=CARD)
+    model.hf_metadata = HFMetadata("org/seeded-model", api=OfflineApi())
+    assert model.get_license() == 1.0
@@ -0,0 +1,55 @@
+"""Tests for the time-bounded regex worker pool"""
+import pytest
+import re
+import threading
+import time
+
+from utils import regex_pool
+from utils.regex_pool import run_regex_search, shutdown_regex_pool
+
+FLAGS = re.IGNORECASE | re.DOTALL
+
+
+@pytest.fixture(autouse=True)
+def pool():
+    yield
+    shutdown_regex_pool()
+
+
+def test_matches_across_chunks(monkeypatch):
+    """Test a scan split over several tasks finds every match"""
+    monkeypatch.setattr(regex_pool, "MIN_CHUNK_BYTES", 10)
+    monkeypatch.setattr(regex_pool, "REGEX_CHUNK_BYTES", 10)
+    docs = [(str(i), f"model-{i}", "readme " * 5, None) for i in range(20)]
+    matched, complete = run_regex_search(r"model-1\d?$", FLAGS, docs, timeout=30)
+    assert complete
+    assert matched == {"1"} | {str(i) for i in range(10, 20)}
+
+
+def test_runaway_pattern_is_cut_off():
+    """Test catastrophic backtracking returns within the deadline"""
+    docs = [("1", "a" * 40 + "!", "", None)]
+    start = time.monotonic()
+    matched, complete = run_regex_search(r"(a+)+$", FLAGS, docs, timeout=2)
+    assert not complete
+    assert matched == set()
+    assert time.monotonic() - start < 10
+
+    # the pool is replaced and keeps working
+    matched, complete = run_regex_search("a", FLAGS, docs, timeout=30)
+    assert complete and matched == {"1"}
+
+
+def test_runaway_search_does_not_affect_others():
+    """Test a benign search succeeds while a catastrophic one times out alongside it"""
+    runaway = {}
+    thread = threading.Thread(target=lambda: runaway.update(
+        result=run_regex_search(r"(a+)+$", FLAGS, [("1", "a" * 40 + "!", "", None)], timeout=3)))
+    thread.start()
+    time.sleep(0.5)
+    start = time.monotonic()
+    matched, complete = run_regex_search("model", FLAGS, [("2", "my-model", "", None)], timeout=30)
+    assert complete and matched == {"2"}
+    assert time.monotonic() - start < 3
+    thread.join(30)
+    assert runaway["result"] == (set(), False)
@@ -24,3 +24,40 @@ def test_register_artifact_with_invalid_type(client):
     
     response = client.post('/artifact/invalid-type', json=artifact_data)
     assert response.status_code in [400, 422]
+
+
+def test_rating_write_keeps_concurrent_data_update(tmp_path):
+    """Test a data update landing while the rating job records its result is not lost"""
+    import threading
+    import time
+    from unittest.mock import patch
+    from routes import register
+    from utils import registry_utils
+
+    path = str(tmp_path / "registry.json")
+    registry_utils.put_artifact_entry(path, "m1", {
+        "metadata": {"id": "m1", "name": "m", "type": "model"}, "data": {"url": "https://example.com/m"}})
+
+    read_entry = registry_utils.get_artifact_entry
+    request_thread = []
+
+    def get_then_interleave(*args):
+        entry = read_entry(*args)
+        if not request_thread:
+            # the request thread's update arrives right after the rating job read the entry
+            new_data = {"url": "https://example.com/m", "s3_key": "artifacts/m.zip"}
+            t = threading.Thread(target=registry_utils.update_artifact_data, args=(path, "m1", new_data))
+            request_thread.append(t)
+            t.start()
+            time.sleep(0.2)
+        return entry
+
+    with patch.object(register, "compute_model_rating", return_value={"net_score": 0.5}), \
+            patch.object(register, "get_artifact_entry", get_then_interleave), \
+            patch.object(registry_utils, "get_artifact_entry", get_then_interleave):
+        register.rate_and_record(path, "m1", None)
+        request_thread[0].join(5)
+
+    entry = registry_utils.get_artifact_entry(path, "m1")
+    assert entry["data"]["s3_key"] == "artifacts/m.zip"
+    assert entry["metadata"]["rating"] == {"net_score": 0.5}
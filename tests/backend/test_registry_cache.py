@@ -0,0 +1,66 @@
+"""Tests for the in-process registry cache"""
+import pytest
+import json
+from unittest.mock import patch
+
+from utils import registry_utils
+from utils.registry_utils import load_registry, save_registry, clear_registry_cache
+
+
+@pytest.fixture
+def registry_file(tmp_path):
+    clear_registry_cache()
+    path = tmp_path / "registry.json"
+    path.write_text(json.dumps({"a": {"metadata": {"id": "a", "name": "first"}}}))
+    yield str(path)
+    clear_registry_cache()
+
+
+def test_unchanged_registry_is_not_reparsed(registry_file):
+    """Test a second load is served from the cache"""
+    assert "a" in load_registry(registry_file)
+
+    with patch.object(registry_utils.json, "load", side_effect=AssertionError("re-parsed")):
+        assert "a" in load_registry(registry_file)
+
+
+def test_external_change_is_detected(registry_file):
+    """Test the cache revalidates against the file on disk"""
+    load_registry(registry_file)
+
+    with open(registry_file, "w") as f:
+        json.dump({"b": {"metadata": {"id": "b", "name": "second-entry"}}}, f)
+
+    assert list(load_registry(registry_file)) == ["b"]
+
+
+def test_save_updates_cache(registry_file):
+    """Test save_registry refreshes the cache in place"""
+    registry = load_registry(registry_file)
+    registry["c"] = {"metadata": {"id": "c", "name": "third"}}
+    save_registry(registry_file, registry)
+
+    with patch.object(registry_utils.json, "load", side_effect=AssertionError("re-parsed")):
+        assert set(load_registry(registry_file)) == {"a", "c"}
+
+
+def test_callers_get_independent_copies(registry_file):
+    """Test mutating a loaded registry does not leak into the cache"""
+    registry = load_registry(registry_file)
+    registry.pop("a")
+
+    assert "a" in load_registry(registry_file)
+
+
+def test_returned_entries_are_copies(registry_file):
+    """Test editing a read or written entry does not change the next read"""
+    from utils.registry_utils import get_artifact_entry, put_artifact_entry
+
+    entry = get_artifact_entry(registry_file, "a")
+    entry["metadata"]["name"] = "changed"
+    assert get_artifact_entry(registry_file, "a")["metadata"] == {"id": "a", "name": "first"}
+
+    written = {"metadata": {"id": "b", "name": "second"}}
+    put_artifact_entry(registry_file, "b", written)
+    written["metadata"]["name"] = "changed"
+    assert load_registry(registry_file)["b"]["metadata"]["name"] == "second"
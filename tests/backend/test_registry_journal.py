@@ -0,0 +1,90 @@
+"""Tests for the journaled registry mode"""
+import pytest
+import json
+import os
+
+from utils.registry_journal import JournaledRegistry
+
+
+def make_entry(artifact_id, name):
+    return {
+        "metadata": {"id": artifact_id, "name": name, "type": "model", "version": "1.0.0"},
+        "data": {"url": f"https://example.com/{artifact_id}"},
+    }
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    path = tmp_path / "registry.json"
+    path.write_text(json.dumps({"a": make_entry("a", "Alpha")}))
+    return str(path)
+
+
+def test_mutations_append_to_journal(snapshot_path):
+    """Test writes append records instead of rewriting the snapshot"""
+    store = JournaledRegistry(snapshot_path)
+    before = open(snapshot_path).read()
+
+    store.put("b", make_entry("b", "Beta"))
+    store.update_data("a", {"url": "https://example.com/new"})
+    store.set_rating("a", {"net_score": 0.5})
+    assert store.delete("b") is True
+
+    assert open(snapshot_path).read() == before
+    with open(store.journal_path) as f:
+        assert [json.loads(line)["op"] for line in f] == ["create", "update_data", "set_rating", "delete"]
+
+
+def test_state_is_rebuilt_by_replay(snapshot_path):
+    """Test a fresh instance replays snapshot + journal"""
+    store = JournaledRegistry(snapshot_path)
+    store.put("b", make_entry("b", "Beta"))
+    store.set_rating("a", {"net_score": 0.5})
+
+    replayed = JournaledRegistry(snapshot_path).load_all()
+    assert set(replayed) == {"a", "b"}
+    assert replayed["a"]["rating"] == {"net_score": 0.5}
+
+
+def test_compaction_folds_journal_into_snapshot(snapshot_path):
+    """Test compaction rewrites the snapshot and empties the journal"""
+    store = JournaledRegistry(snapshot_path, compact_threshold=1)
+    store.put("b", make_entry("b", "Beta"))
+    store.compact()
+
+    with open(snapshot_path) as f:
+        assert set(json.load(f)) == {"a", "b"}
+    assert not os.path.exists(store.rotated_path)
+    assert set(JournaledRegistry(snapshot_path).load_all()) == {"a", "b"}
+
+
+def test_compaction_keeps_records_from_other_writers(snapshot_path):
+    """Test a record appended by another process survives compaction"""
+    store = JournaledRegistry(snapshot_path)
+    store.load_all()
+    JournaledRegistry(snapshot_path).put("c", make_entry("c", "Gamma"))
+    store.compact()
+
+    assert not os.path.exists(store.rotated_path)
+    assert set(JournaledRegistry(snapshot_path).load_all()) == {"a", "c"}
+
+
+def test_get_returns_copy(snapshot_path):
+    """Test mutating a returned entry leaves the registry unchanged"""
+    store = JournaledRegistry(snapshot_path)
+    store.get("a")["metadata"]["name"] = "changed"
+    assert store.get("a")["metadata"]["name"] == "Alpha"
+
+
+def test_leftover_rotated_journal_is_compacted(snapshot_path):
+    """Test a rotated journal left by a dead compaction is folded in"""
+    with open(snapshot_path + ".journal.compacting", "w") as f:
+        f.write(json.dumps({"op": "create", "id": "b", "entry": make_entry("b", "Beta")}) + "\n")
+    store = JournaledRegistry(snapshot_path, compact_threshold=1)
+    store.put("c", make_entry("c", "Gamma"))
+    store.compact()
+
+    with open(snapshot_path) as f:
+        assert set(json.load(f)) == {"a", "b", "c"}
+    assert not os.path.exists(store.rotated_path)
+    assert not os.path.exists(store.journal_path)
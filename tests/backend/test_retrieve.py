@@ -22,3 +22,26 @@ def test_get_artifacts_missing_name(client):
     assert response.status_code == 400
     data = response.get_json()
     assert 'error' in data
+
+
+def test_get_artifacts_batch_query(client):
+    """Test a list body with name and type filters"""
+    from app import app
+    registry = {
+        "m1": {"metadata": {"id": "m1", "name": "Shared", "type": "model", "version": "1.0.0"}, "data": {"url": "https://example.com/m1"}},
+        "d1": {"metadata": {"id": "d1", "name": "shared", "type": "dataset", "version": "1.0.0"}, "data": {"url": "https://example.com/d1"}},
+        "c1": {"metadata": {"id": "c1", "name": "other", "type": "code", "version": "1.0.0"}, "data": {"url": "https://example.com/c1"}},
+    }
+    with open(app.config['REGISTRY_PATH'], 'w') as f:
+        json.dump(registry, f)
+
+    response = client.post('/artifacts', json=[
+        {"name": "SHARED", "types": ["dataset"]},
+        {"name": "*", "types": ["code"]},
+        {"name": "shared", "types": ["dataset"]},
+    ])
+    assert response.status_code == 200
+    assert [a['id'] for a in response.get_json()] == ["d1", "c1"]
+
+    response = client.post('/artifacts', json={"name": "*"})
+    assert [a['id'] for a in response.get_json()] == ["m1", "d1", "c1"]
@@ -0,0 +1,51 @@
+"""Tests for the sampling estimator of reviewedness"""
+import random
+
+from utils.reviewedness_sampling import estimate_reviewedness, ratio_interval, use_sampling
+
+
+def population(size, seed=1):
+    rng = random.Random(seed)
+    prs = {}
+    for n in range(1, size + 1):
+        added = rng.randint(0, 500)
+        prs[n] = (added, added if rng.random() < 0.7 else 0)
+    return prs
+
+
+class Counter:
+    def __init__(self, prs):
+        self.prs = prs
+        self.requests = 0
+
+    def fetch(self, numbers):
+        self.requests += 1
+        return {n: self.prs[n] for n in numbers}
+
+
+def test_estimate_covers_truth_within_budget():
+    """Test a sampled estimate brackets the exact value using far fewer requests"""
+    prs = population(400)
+    truth = sum(r for _, r in prs.values()) / sum(a for a, _ in prs.values())
+    counter = Counter(prs)
+    estimate = estimate_reviewedness(list(prs), counter.fetch, lambda pr: pr, lambda: counter.requests,
+                                     tolerance=0.1, budget=30)
+    assert estimate.low <= truth <= estimate.high
+    assert estimate.sampled_prs < 400 and counter.requests <= 30
+
+
+def test_small_population_is_exact():
+    """Test sampling every PR gives the exact ratio with no interval"""
+    prs = population(15)
+    counter = Counter(prs)
+    estimate = estimate_reviewedness(list(prs), counter.fetch, lambda pr: pr, lambda: counter.requests)
+    assert estimate.low == estimate.value == estimate.high
+    assert estimate.sampled_prs == 15
+
+
+def test_interval_and_mode_selection():
+    """Test degenerate samples and the auto/exact/sample switch"""
+    assert ratio_interval([], 10) == (0.0, 0.0, 1.0)
+    assert ratio_interval([(10, 10)], 10) == (1.0, 0.0, 1.0)
+    assert use_sampling(500, "auto") and not use_sampling(50, "auto")
+    assert use_sampling(5, "sample") and not use_sampling(500, "exact")
@@ -0,0 +1,102 @@
+"""Tests for the per-artifact S3 registry layout (against moto's S3 stand-in)"""
+import pytest
+import json
+
+boto3 = pytest.importorskip("boto3")
+moto = pytest.importorskip("moto")
+
+from utils.s3_registry import S3ObjectRegistry
+
+BUCKET = "registry-test-bucket"
+
+
+def make_entry(artifact_id, name, artifact_type="model"):
+    return {
+        "metadata": {"id": artifact_id, "name": name, "type": artifact_type, "version": "1.0.0"},
+        "data": {"url": f"https://example.com/{artifact_id}"},
+    }
+
+
+@pytest.fixture
+def s3_client(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    with moto.mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=BUCKET)
+        yield client
+
+
+def keys(client):
+    return sorted(o["Key"] for o in client.list_objects_v2(Bucket=BUCKET).get("Contents", []))
+
+
+def test_each_artifact_is_its_own_object(s3_client):
+    """Test artifacts are stored under the prefix with a manifest"""
+    store = S3ObjectRegistry(s3_client, BUCKET)
+    store.put("a", make_entry("a", "Alpha"))
+    store.put("b", make_entry("b", "Beta", "dataset"))
+
+    assert keys(s3_client) == [
+        "registry/artifacts/a.json",
+        "registry/artifacts/b.json",
+        "registry/manifest.json",
+    ]
+    manifest = json.loads(s3_client.get_object(Bucket=BUCKET, Key="registry/manifest.json")["Body"].read())
+    assert manifest["b"] == {"name": "Beta", "type": "dataset", "url": "https://example.com/b"}
+
+
+def test_rating_touches_only_the_artifact_object(s3_client):
+    """Test set_rating writes a single key"""
+    store = S3ObjectRegistry(s3_client, BUCKET)
+    store.put("a", make_entry("a", "Alpha"))
+    manifest_etag = s3_client.head_object(Bucket=BUCKET, Key="registry/manifest.json")["ETag"]
+
+    store.set_rating("a", {"net_score": 0.7})
+
+    assert s3_client.head_object(Bucket=BUCKET, Key="registry/manifest.json")["ETag"] == manifest_etag
+    assert S3ObjectRegistry(s3_client, BUCKET).get("a")["rating"] == {"net_score": 0.7}
+
+
+def test_concurrent_writers_do_not_clobber_manifest(s3_client):
+    """Test two registry instances both land their creates"""
+    first = S3ObjectRegistry(s3_client, BUCKET)
+    second = S3ObjectRegistry(s3_client, BUCKET)
+    first.put("a", make_entry("a", "Alpha"))
+    second.load_all()
+    first.put("b", make_entry("b", "Beta"))
+    second.put("c", make_entry("c", "Gamma"))
+
+    assert set(S3ObjectRegistry(s3_client, BUCKET).load_all()) == {"a", "b", "c"}
+
+
+def test_lookups_and_delete(s3_client):
+    """Test manifest-driven lookups and deletes"""
+    store = S3ObjectRegistry(s3_client, BUCKET)
+    store.put("a", make_entry("a", "Alpha"))
+    store.put("b", make_entry("b", "alpha", "code"))
+
+    assert [aid for aid, _ in store.find_by_name("ALPHA")] == ["a", "b"]
+    assert [aid for aid, _ in store.find_by_type("code")] == ["b"]
+    assert store.find_by_url("https://example.com/a")[0] == "a"
+
+    assert store.delete("a") is True
+    assert store.get("a") is None
+    assert "registry/artifacts/a.json" not in keys(s3_client)
+
+
+def test_reads_fetch_only_matches_and_return_copies(s3_client):
+    """Test name/type lookups fetch just the matching objects and hand out copies"""
+    store = S3ObjectRegistry(s3_client, BUCKET)
+    for i in range(20):
+        store.put(str(i), make_entry(str(i), f"model-{i}", "model" if i % 2 else "code"))
+
+    fetched = []
+    get = store.get
+    store.get = lambda aid: fetched.append(aid) or get(aid)
+    assert [aid for aid, _ in store.find_by_type("model")] == [str(i) for i in range(1, 20, 2)]
+    assert sorted(fetched, key=int) == [str(i) for i in range(1, 20, 2)]
+    assert [aid for aid, _ in store.query([("model-4", None)])] == ["4"]
+
+    store.load_all()["3"]["metadata"]["name"] = "changed"
+    assert get("3")["metadata"]["name"] == "model-3"
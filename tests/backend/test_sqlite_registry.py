@@ -0,0 +1,79 @@
+"""Tests for the SQLite registry storage engine"""
+import pytest
+import json
+
+from utils.sqlite_registry import SQLiteRegistry
+
+
+def make_entry(artifact_id, name, artifact_type="model", url=None):
+    return {
+        "metadata": {"id": artifact_id, "name": name, "type": artifact_type, "version": "1.0.0"},
+        "data": {"url": url or f"https://example.com/{artifact_id}"},
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SQLiteRegistry(str(tmp_path / "registry.sqlite3"))
+
+
+def test_point_read_and_write(store):
+    """Test single-row put/get/delete"""
+    store.put("a", make_entry("a", "Alpha"))
+    assert store.get("a")["metadata"]["name"] == "Alpha"
+    assert store.get("missing") is None
+
+    assert store.delete("a") is True
+    assert store.delete("a") is False
+    assert store.get("a") is None
+
+
+def test_indexed_lookups(store):
+    """Test lookups by name, type and url"""
+    store.put("a", make_entry("a", "Alpha", "model", "https://huggingface.co/x/alpha"))
+    store.put("b", make_entry("b", "alpha ", "dataset"))
+    store.put("c", make_entry("c", "Gamma", "code"))
+
+    assert [aid for aid, _ in store.find_by_name("ALPHA")] == ["a", "b"]
+    assert [aid for aid, _ in store.find_by_type("code")] == ["c"]
+    assert store.find_by_url("https://huggingface.co/x/alpha")[0] == "a"
+    assert store.find_by_url("https://nowhere") is None
+
+
+def test_replace_all(store):
+    """Test bulk replacement used by reset"""
+    store.put("a", make_entry("a", "Alpha"))
+    store.replace_all({"b": make_entry("b", "Beta")})
+    assert list(store.load_all()) == ["b"]
+
+
+def test_seeds_from_existing_json(tmp_path):
+    """Test an existing registry.json is imported on first open"""
+    json_path = tmp_path / "registry.json"
+    json_path.write_text(json.dumps({"a": make_entry("a", "Alpha")}))
+
+    store = SQLiteRegistry(str(tmp_path / "registry.sqlite3"), seed_json_path=str(json_path))
+    assert store.get("a")["metadata"]["name"] == "Alpha"
+
+
+def test_batch_query(store):
+    """Test name/type queries are OR-ed together in registry order"""
+    store.put("a", make_entry("a", "Alpha", "model"))
+    store.put("b", make_entry("b", "alpha", "dataset"))
+    store.put("c", make_entry("c", "Gamma", "code"))
+
+    assert [aid for aid, _ in store.query([("ALPHA", {"dataset"}), ("*", {"code"})])] == ["b", "c"]
+    assert [aid for aid, _ in store.query([("alpha", None), ("*", None)])] == ["a", "b", "c"]
+
+
+def test_updates_keep_listing_order(store):
+    """Test rating, data and whole-entry updates do not move an artifact in listings"""
+    for aid in ("a", "b", "c"):
+        store.put(aid, make_entry(aid, aid.upper()))
+    store.set_rating("a", {"net_score": 0.5})
+    store.update_data("b", {"url": "https://example.com/new"})
+    store.put("a", {**store.get("a"), "data": {"url": "https://example.com/a2"}})
+
+    assert list(store.load_all()) == ["a", "b", "c"]
+    assert [aid for aid, _ in store.find_by_type("model")] == ["a", "b", "c"]
+    assert store.find_by_url("https://example.com/a2")[0] == "a"
@@ -0,0 +1,87 @@
+"""Tests for the memoized, registry-aware treescore engine"""
+import pytest
+import json
+import threading
+import time
+
+from utils.registry_utils import clear_registry_cache, find_model_ratings
+from utils.treescore import TreeScoreEngine, canonical_repo_id
+
+
+def test_canonical_repo_id_forms():
+    """Test bare ids and Hub URLs map to the same canonical id"""
+    for value in ("google/Gemma-2b", "https://huggingface.co/google/gemma-2b",
+                  "https://huggingface.co/google/gemma-2b/tree/main", "hf.co/models/google/gemma-2b"):
+        assert canonical_repo_id(value) == "google/gemma-2b"
+    assert canonical_repo_id("https://huggingface.co/bert-base-uncased") == "bert-base-uncased"
+    assert canonical_repo_id("https://huggingface.co/datasets/squad/v2") is None
+    assert canonical_repo_id("https://github.com/google/gemma") is None
+
+
+def test_stored_rating_skips_compute():
+    """Test a stored registry rating is used without computing"""
+    engine = TreeScoreEngine()
+    assert engine.parent_score("org/base", lambda: pytest.fail("computed"), stored=0.7) == 0.7
+
+
+def test_scores_are_memoized_until_ttl():
+    """Test a computed score is reused across calls until it expires"""
+    engine = TreeScoreEngine(ttl=0.05)
+    calls = []
+    compute = lambda: calls.append(1) or 0.4  # noqa: E731
+    assert engine.parent_score("org/base", compute) == 0.4
+    assert engine.parent_score("https://huggingface.co/org/base", compute) == 0.4
+    assert len(calls) == 1
+    time.sleep(0.06)
+    engine.parent_score("org/base", compute)
+    assert len(calls) == 2
+
+
+def test_concurrent_requests_share_computation():
+    """Test concurrent callers wait on the one computation in flight"""
+    engine = TreeScoreEngine()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 0.6
+
+    results = []
+    first = threading.Thread(target=lambda: results.append(engine.parent_score("org/base", compute)))
+    first.start()
+    started.wait(5)
+    others = [threading.Thread(target=lambda: results.append(engine.parent_score("org/base", compute))) for _ in range(3)]
+    for t in others:
+        t.start()
+    while engine.stats()["shared"] < 3:
+        time.sleep(0.01)
+    release.set()
+    for t in [first, *others]:
+        t.join(5)
+    assert results == [0.6] * 4 and len(calls) == 1
+
+
+def test_failed_compute_is_not_memoized():
+    """Test a failed parent is retried on the next request"""
+    engine = TreeScoreEngine()
+    assert engine.parent_score("org/base", lambda: 1 / 0) is None
+    assert engine.parent_score("org/base", lambda: 0.3) == 0.3
+
+
+def test_find_model_ratings_by_repo_id(tmp_path):
+    """Test stored ratings are found whatever URL form the model was registered with"""
+    clear_registry_cache()
+    path = tmp_path / "registry.json"
+    path.write_text(json.dumps({
+        "1": {"metadata": {"name": "gemma-2b", "type": "model"},
+              "data": {"url": "https://huggingface.co/google/gemma-2b/tree/main"},
+              "rating": {"net_score": 0.8}},
+        "2": {"metadata": {"name": "unrated", "type": "model"},
+              "data": {"url": "https://huggingface.co/org/unrated"}},
+    }))
+    found = find_model_ratings(str(path), ["Google/Gemma-2b", "org/unrated"])
+    assert found == {"google/gemma-2b": {"net_score": 0.8}}
+    clear_registry_cache()
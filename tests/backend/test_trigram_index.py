@@ -0,0 +1,64 @@
+"""Tests for the trigram index used by regex search"""
+import pytest
+import json
+import re
+
+from utils.trigram_index import TrigramIndex, literal_plan
+from utils.registry_utils import clear_registry_cache, regex_search_artifacts, put_artifact_entry
+
+
+def _entry(aid, name, readme=""):
+    return {"metadata": {"id": aid, "name": name, "type": "model"}, "_index": {"readme": readme}}
+
+
+@pytest.fixture
+def registry_file(tmp_path):
+    clear_registry_cache()
+    path = tmp_path / "registry.json"
+    path.write_text(json.dumps({
+        "1": _entry("1", "bert-base-uncased", "A transformer for masked language modeling."),
+        "2": _entry("2", "resnet-50", "Image classification backbone."),
+        "3": _entry("3", "whisper-tiny", "Speech recognition, trained like BERT."),
+    }))
+    yield str(path)
+    clear_registry_cache()
+
+
+def _search(path, pattern):
+    found, complete = regex_search_artifacts(path, pattern, re.IGNORECASE | re.DOTALL)
+    assert complete
+    return [aid for aid, _ in found]
+
+
+def test_literal_plan():
+    """Test required literals are pulled out of patterns"""
+    assert literal_plan("^bert.*base$") == [["bert", "base"]]
+    assert literal_plan("(resnet|whisper)") == [["resnet"], ["whisper"]]
+    assert literal_plan("x+(abc)?") is None
+    assert literal_plan(".*") is None
+
+
+def test_candidates_narrow_and_update():
+    """Test candidates require every trigram and follow add/remove"""
+    index = TrigramIndex()
+    index.add("a", None, "bert-base")
+    index.add("b", None, "roberta")
+    assert index.candidates([["bert"]]) == {"a", "b"}
+    assert index.candidates([["base"]]) == {"a"}
+    index.remove("a")
+    assert index.candidates([["base"]]) == set()
+
+
+def test_regex_search_matches_full_scan(registry_file):
+    """Test indexed search returns exactly what a full scan would"""
+    assert _search(registry_file, "BERT") == ["1", "3"]
+    assert _search(registry_file, "^resnet-\\d+$") == ["2"]
+    assert _search(registry_file, "speech|masked") == ["1", "3"]
+    assert _search(registry_file, ".*") == ["1", "2", "3"]
+
+
+def test_registered_artifact_is_searchable(registry_file):
+    """Test new entries are indexed when written"""
+    assert _search(registry_file, "llama") == []
+    put_artifact_entry(registry_file, "4", _entry("4", "tiny-llama"))
+    assert _search(registry_file, "llama") == ["4"]